@@ -3,20 +3,46 @@ from flask_cors import CORS
 from flasgger import Swagger
 from backend.config import Config
 from backend.routes.api import api_bp
+from backend.services.ats_service import get_skill_matcher
+from backend.services.components import warmup
+from backend.utils.http_utils import init_http_caching
+from backend.utils.tracing import init_tracing
+from backend.utils.profiling import init_profiling
+from backend.utils.logging_utils import setup_logging
 
 def create_app():
+    setup_logging()
+    
     app = Flask(__name__, 
                 static_folder='../frontend/static',
                 template_folder='../frontend/templates')
     
     app.config.from_object(Config)
+    Config.validate()
+    
+    # Cross-origin access only for configured origins; expose rate-limit headers to them
+    CORS(app, resources={r"/api/*": {"origins": Config.CORS_ORIGINS}},
+         expose_headers=["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset",
+                         "RateLimit-Policy", "Retry-After"])
+    
+    # One trace per request; service, LLM, agent and tool spans nest under it
+    init_tracing(app)
     
-    # Enable CORS for all routes
-    CORS(app)
+    # Opt-in cProfile of single requests (admin header or sampling)
+    init_profiling(app)
     
     # Register API blueprint
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # Fingerprinted static assets and gzip/brotli responses
+    init_http_caching(app)
+    
+    # Compile the ATS keyword automaton once, before the first request
+    get_skill_matcher()
+    
+    if Config.WARMUP_ON_START:
+        warmup()
+    
     # Initialize Swagger
     app.config['SWAGGER'] = {
         'title': 'Career AI Platform API',
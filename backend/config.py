@@ -5,14 +5,168 @@ from dotenv import load_dotenv
 # Define the base directory (root of the project)
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Load environment variables (try root first, then backend folder)
-load_dotenv(BASE_DIR / ".env")
-load_dotenv(BASE_DIR / "backend" / ".env")
+# Load environment variables (root first, then backend folder; earlier values win)
+for _env_file in (BASE_DIR / ".env", BASE_DIR / "backend" / ".env"):
+    if _env_file.is_file():
+        load_dotenv(_env_file)
 
 class Config:
     GOOGLE_API_KEY = os.getenv("GEMINI_API_KEY")
     SERPAPI_KEY = os.getenv("SERPAPI_API_KEY")
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
+
+    # Origins allowed to call /api cross-origin (comma-separated, "*" for any).
+    # The bundled frontend is same-origin and needs none.
+    CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:5000,http://127.0.0.1:5000").split(",") if o.strip()]
+
+    # Per-client token buckets: "<cost class>=<capacity>/<seconds>", shared by all workers via SQLite
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMITS = os.getenv("RATE_LIMITS", "catalog=300/60,llm=40/600,search=30/3600")
+    # Everyone behind one IP shares this many times a single session's budget
+    RATE_LIMIT_IP_MULTIPLIER = int(os.getenv("RATE_LIMIT_IP_MULTIPLIER", "5"))
+    RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", str(BASE_DIR / "instance" / "rate_limits.sqlite3"))
+    # Known client API keys (X-API-Key) that get their own budget instead of the caller's IP/session
+    API_KEYS = {k.strip() for k in os.getenv("API_KEYS", "").split(",") if k.strip()}
+
+    # Span tracing (OpenTelemetry JSON): appended to TRACE_EXPORT_PATH and/or POSTed to an OTLP/HTTP collector
+    SERVICE_NAME = os.getenv("SERVICE_NAME", "career-ai-platform")
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+    TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", str(BASE_DIR / "instance" / "traces.jsonl"))
+    TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT")  # e.g. http://localhost:4318/v1/traces
+    TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+    # User-derived text (chat input, tool inputs, search queries) is left out of spans unless enabled
+    TRACE_CAPTURE_INPUT = os.getenv("TRACE_CAPTURE_INPUT", "false").lower() == "true"
+
+    # Per-request cProfile: sent on demand with "X-Profile: <PROFILE_ADMIN_TOKEN>", or sampled
+    PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_MIN_INTERVAL = float(os.getenv("PROFILE_MIN_INTERVAL", "60"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR", str(BASE_DIR / "instance" / "profiles"))
+    PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+    # Logging: records go through a bounded queue to a background writer (never blocks requests)
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json | text
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "langchain=WARNING,langchain_core.callbacks.manager=ERROR,httpx=WARNING,urllib3=WARNING")  # per-logger overrides
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")  # opt-in, e.g. "backend.services.search_service=0.25": fraction of INFO/DEBUG kept
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_FILE = os.getenv("LOG_FILE")
+    LOG_FILE_MAX_BYTES = int(os.getenv("LOG_FILE_MAX_BYTES", str(20 * 1024 * 1024)))
+    # Print the agent's full ReAct reasoning to stdout (debugging only)
+    AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "false").lower() == "true"
+
+    # Upper bound for a client-requested X-Request-Timeout (seconds); per-endpoint defaults live on the routes
+    MAX_REQUEST_TIMEOUT = float(os.getenv("MAX_REQUEST_TIMEOUT", "300"))
+    SERPAPI_TIMEOUT = float(os.getenv("SERPAPI_TIMEOUT", "20"))
+
+    # Build the LLM/agent in a background thread at startup instead of on first use
+    WARMUP_ON_START = os.getenv("WARMUP_ON_START", "false").lower() == "true"
+
+    # Optional JSON career catalog; defaults to backend/data/career_data.py
+    CAREER_CATALOG_PATH = os.getenv("CAREER_CATALOG_PATH")
+
+    # Precomputed related-careers graph (rebuilt automatically when the catalog changes)
+    RELATED_CAREERS_PATH = os.getenv("RELATED_CAREERS_PATH", str(BASE_DIR / "instance" / "related_careers.json"))
+    RELATED_CAREERS_TOP_K = int(os.getenv("RELATED_CAREERS_TOP_K", "10"))
+
+    # Shared report cache
+    REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "512"))
+    REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", "3600"))
+
+    # Compressed, content-addressed storage for cached text of at least REPORT_STORE_MIN_BYTES:
+    # codec (auto = zstd when installed, else zlib), decompressed hot set size, dictionary training
+    REPORT_STORE_ENABLED = os.getenv("REPORT_STORE_ENABLED", "true").lower() == "true"
+    REPORT_STORE_CODEC = os.getenv("REPORT_STORE_CODEC", "auto")
+    REPORT_STORE_LEVEL = int(os.getenv("REPORT_STORE_LEVEL", "6"))
+    REPORT_STORE_MIN_BYTES = int(os.getenv("REPORT_STORE_MIN_BYTES", "1024"))
+    REPORT_STORE_HOT_BYTES = int(os.getenv("REPORT_STORE_HOT_BYTES", str(4 * 1024 * 1024)))
+    REPORT_STORE_TRAIN_SAMPLES = int(os.getenv("REPORT_STORE_TRAIN_SAMPLES", "24"))
+    REPORT_STORE_DICT_BYTES = int(os.getenv("REPORT_STORE_DICT_BYTES", str(32 * 1024)))
+
+    # Response compression (gzip, or brotli when installed) and static asset caching
+    COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+    STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", str(365 * 24 * 3600)))
+
+    # Resume data retention (seconds). RESUME_CACHE_ENABLED=false opts out entirely.
+    RESUME_CACHE_ENABLED = os.getenv("RESUME_CACHE_ENABLED", "true").lower() == "true"
+    RESUME_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL", "1800"))
+
+    # Approximate token budget for resume text embedded in the feedback prompt
+    RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "1500"))
+
+    # Concurrency: batch/background upstream LLM calls in flight, calls for waiting users
+    # (their own lane, so a batch job never delays them), and processes for file parsing
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    INTERACTIVE_MAX_CONCURRENCY = int(os.getenv("INTERACTIVE_MAX_CONCURRENCY", "16"))
+    EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+    # Model routing: tiers cheapest first as "model=<USD per 1M input>/<USD per 1M output>", the tier
+    # each task prefers, small requests that drop to the cheapest tier, and the decision log
+    LLM_ROUTING_ENABLED = os.getenv("LLM_ROUTING_ENABLED", "true").lower() == "true"
+    LLM_DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "gemini-2.5-flash")
+    LLM_MODEL_TIERS = os.getenv("LLM_MODEL_TIERS", "gemini-2.5-flash-lite=0.10/0.40,gemini-2.5-flash=0.30/2.50,gemini-2.5-pro=1.25/10.00")
+    LLM_ROUTES = os.getenv("LLM_ROUTES", "insights=gemini-2.5-flash,market=gemini-2.5-flash,colleges=gemini-2.5-flash,resume=gemini-2.5-flash,chat=gemini-2.5-flash")
+    LLM_SMALL_INPUT_TOKENS = int(os.getenv("LLM_SMALL_INPUT_TOKENS", "1000"))
+    LLM_SMALL_OUTPUT_TOKENS = int(os.getenv("LLM_SMALL_OUTPUT_TOKENS", "500"))
+    LLM_FALLBACK_ATTEMPTS = int(os.getenv("LLM_FALLBACK_ATTEMPTS", "1"))
+    LLM_TIER_COOLDOWN = float(os.getenv("LLM_TIER_COOLDOWN", "60"))
+    LLM_ROUTING_LOG = os.getenv("LLM_ROUTING_LOG", str(BASE_DIR / "instance" / "routing.jsonl"))
+    LLM_ROUTING_LOG_MAX_BYTES = int(os.getenv("LLM_ROUTING_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    # Web search (SerpAPI): parallel queries, cached results, and the context budget for grounded reports
+    SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "8"))
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600)))
+    MARKET_RESULTS_PER_QUERY = int(os.getenv("MARKET_RESULTS_PER_QUERY", "5"))
+    MARKET_CONTEXT_TOKENS = int(os.getenv("MARKET_CONTEXT_TOKENS", "1500"))
+
+    # Role comparison: most roles per request
+    COMPARE_MAX_ROLES = int(os.getenv("COMPARE_MAX_ROLES", "4"))
+
+    # Speculative report prefetch on role selection: reports per client per hour, queue size,
+    # and the interactive upstream load above which prefetch waits
+    PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+    PREFETCH_BUDGET = int(os.getenv("PREFETCH_BUDGET", "12"))
+    PREFETCH_QUEUE_SIZE = int(os.getenv("PREFETCH_QUEUE_SIZE", "32"))
+    PREFETCH_MAX_LOAD = int(os.getenv("PREFETCH_MAX_LOAD", "1"))
+    PREFETCH_TIMEOUT = int(os.getenv("PREFETCH_TIMEOUT", "120"))
+
+    # Stale-while-revalidate: how long past expiry reports and job results are still served while a
+    # background refresh runs, and the refresher that renews popular entries REFRESH_AHEAD seconds
+    # before they expire (at most REFRESH_BUDGET upstream refreshes per hour across all clients)
+    REPORT_STALE_TTL = int(os.getenv("REPORT_STALE_TTL", str(24 * 3600)))
+    JOBS_CACHE_TTL = int(os.getenv("JOBS_CACHE_TTL", str(3 * 3600)))
+    JOBS_STALE_TTL = int(os.getenv("JOBS_STALE_TTL", str(24 * 3600)))
+    REFRESH_ENABLED = os.getenv("REFRESH_ENABLED", "true").lower() == "true"
+    REFRESH_BUDGET = int(os.getenv("REFRESH_BUDGET", "60"))
+    REFRESH_AHEAD = int(os.getenv("REFRESH_AHEAD", "600"))
+    REFRESH_MIN_SCORE = float(os.getenv("REFRESH_MIN_SCORE", "3"))
+    REFRESH_HALF_LIFE = int(os.getenv("REFRESH_HALF_LIFE", str(6 * 3600)))
+    REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL", "60"))
+    REFRESH_MAX_LOAD = int(os.getenv("REFRESH_MAX_LOAD", "1"))
+    REFRESH_TIMEOUT = int(os.getenv("REFRESH_TIMEOUT", "120"))
+
+    # Streaming chat (SSE): heartbeat interval, how long an unwatched answer keeps running,
+    # idle conversation lifetime, and events kept for reconnecting clients. Each open stream
+    # holds a server thread: at most CHAT_MAX_STREAMS per process, recycled between answers
+    # after CHAT_STREAM_MAX_AGE seconds (the browser reconnects transparently)
+    CHAT_HEARTBEAT = float(os.getenv("CHAT_HEARTBEAT", "15"))
+    CHAT_RECONNECT_GRACE = float(os.getenv("CHAT_RECONNECT_GRACE", "10"))
+    CHAT_IDLE_TIMEOUT = int(os.getenv("CHAT_IDLE_TIMEOUT", "1800"))
+    CHAT_EVENT_BUFFER = int(os.getenv("CHAT_EVENT_BUFFER", "2000"))
+    CHAT_MAX_STREAMS = int(os.getenv("CHAT_MAX_STREAMS", "64"))
+    CHAT_STREAM_MAX_AGE = float(os.getenv("CHAT_STREAM_MAX_AGE", "300"))
+
+    # Salary statistics collected from job postings (LPA), and how many postings a role needs before reports use them
+    SALARY_DB_PATH = os.getenv("SALARY_DB_PATH", str(BASE_DIR / "instance" / "salaries.sqlite3"))
+    SALARY_MIN_SAMPLES = int(os.getenv("SALARY_MIN_SAMPLES", "5"))
+    SALARY_HISTOGRAM_BINS = int(os.getenv("SALARY_HISTOGRAM_BINS", "10"))
+
+    # Batch resume analysis limits
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+    BATCH_MAX_FILE_BYTES = int(os.getenv("BATCH_MAX_FILE_BYTES", str(5 * 1024 * 1024)))
     
     @staticmethod
     def validate():
@@ -21,6 +175,3 @@ class Config:
         if not Config.SERPAPI_KEY:
             print("⚠️ WARNING: SERPAPI_API_KEY not found in environment or .env")
 
-# Load and validate on import
-Config.validate()
-
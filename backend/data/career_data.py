@@ -48,3 +48,37 @@ CAREER_CATEGORIES = {
         "Content Marketing Strategist",
     ],
 }
+
+# Common alternative titles, used by catalog search and role resolution
+ROLE_ALIASES = {
+    "AI & Machine Learning Engineer": ["ML Engineer", "Machine Learning Engineer", "AI Engineer"],
+    "Data Scientist": ["Data Science", "Applied Scientist"],
+    "Cybersecurity Analyst": ["Security Analyst", "SOC Analyst", "Information Security Analyst"],
+    "Cloud Solutions Architect": ["Cloud Architect", "Solutions Architect"],
+    "Full Stack Developer": ["Web Developer", "Software Developer", "Full Stack Engineer"],
+    "DevOps Engineer": ["Site Reliability Engineer", "SRE", "Platform Engineer"],
+    "Blockchain Developer": ["Web3 Developer", "Smart Contract Developer"],
+    "Mobile App Developer": ["Android Developer", "iOS Developer", "Flutter Developer"],
+    "Data Engineer": ["Big Data Engineer", "ETL Developer"],
+    "Software Quality Assurance Engineer": ["QA Engineer", "Software Tester", "SDET", "Test Engineer"],
+    "Medical Data Analyst": ["Healthcare Data Analyst", "Clinical Data Analyst"],
+    "Clinical Research Associate": ["CRA", "Clinical Research Coordinator"],
+    "Healthcare Administrator": ["Hospital Administrator", "Hospital Manager"],
+    "Medical Laboratory Technologist": ["Lab Technician", "MLT"],
+    "Physiotherapist": ["Physical Therapist"],
+    "Pharmacy Manager": ["Pharmacist"],
+    "Business Analyst": ["BA", "Business Systems Analyst"],
+    "Digital Marketing Strategist": ["Digital Marketer", "Performance Marketer"],
+    "Financial Data Analyst": ["Financial Analyst", "FP&A Analyst"],
+    "Product Manager": ["PM", "Product Owner"],
+    "HR Analytics Specialist": ["People Analytics Analyst", "HR Analyst"],
+    "Management Consultant": ["Strategy Consultant", "Business Consultant"],
+    "Supply Chain Analyst": ["Logistics Analyst", "Procurement Analyst"],
+    "Investment Banker": ["IB Analyst", "Investment Banking Analyst"],
+    "Social Media Manager": ["Social Media Executive", "Community Manager"],
+    "Copywriter / Content Writer": ["Copywriter", "Content Writer", "Technical Writer"],
+    "Graphic Designer": ["Visual Designer"],
+    "SEO Specialist": ["SEO Analyst", "SEO Executive"],
+    "UX/UI Designer": ["UX Designer", "UI Designer", "Product Designer"],
+    "Video Editor": ["Film Editor"],
+}
@@ -0,0 +1,153 @@
+import json
+import re
+import hashlib
+import bisect
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+from backend.config import Config
+from backend.data.career_data import CAREER_CATEGORIES, ROLE_ALIASES
+from backend.data.skills_data import ROLE_SKILLS
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+def _normalize(text: str) -> str:
+    return " ".join(_TOKEN_RE.findall(text.casefold()))
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class CareerCatalog:
+    """
+    Career roles with a precomputed JSON payload, a strong ETag and an
+    in-memory prefix + trigram index for autocomplete.
+    """
+
+    def __init__(self, categories: Dict[str, list], aliases: Optional[Dict[str, List[str]]] = None):
+        aliases = aliases or {}
+        self.roles: List[dict] = []
+        self._by_name: Dict[str, int] = {}
+        for category, entries in categories.items():
+            for entry in entries:
+                # Entries are plain names or {"name", "aliases", "skills"} objects
+                if isinstance(entry, str):
+                    entry = {"name": entry}
+                name = entry["name"]
+                self._by_name[name.casefold()] = len(self.roles)
+                self.roles.append({
+                    "name": name,
+                    "category": category,
+                    "aliases": list(entry.get("aliases") or aliases.get(name, [])),
+                    "skills": list(entry.get("skills") or ROLE_SKILLS.get(name, [])),
+                })
+        for idx, role in enumerate(self.roles):
+            for alias in role["aliases"]:
+                self._by_name.setdefault(alias.casefold(), idx)
+
+        self.categories = {
+            category: [r["name"] for r in self.roles if r["category"] == category]
+            for category in categories
+        }
+        # Same bytes jsonify() produced, serialized once
+        self.payload = json.dumps(self.categories, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        self.etag = hashlib.sha256(self.payload).hexdigest()
+        self._build_index()
+
+    def _build_index(self) -> None:
+        prefix_keys = []
+        self._trigram_index = defaultdict(set)
+        self._search_terms: List[tuple] = []
+        for idx, role in enumerate(self.roles):
+            for term, kind in [(role["name"], "name")] + [(a, "alias") for a in role["aliases"]]:
+                norm = _normalize(term)
+                if not norm:
+                    continue
+                words = norm.split()
+                # Every word suffix, so "scien" finds "Data Scientist"
+                for i in range(len(words)):
+                    rank = 0 if kind == "name" and i == 0 else 1 if kind == "name" else 2
+                    prefix_keys.append((" ".join(words[i:]), rank, idx))
+                term_id = len(self._search_terms)
+                grams = _trigrams(norm)
+                self._search_terms.append((idx, len(grams)))
+                for gram in grams:
+                    self._trigram_index[gram].add(term_id)
+        prefix_keys.sort()
+        self._prefix_keys = prefix_keys
+
+    def get(self, name: str) -> Optional[dict]:
+        """Look up a role by exact name or alias (case-insensitive)."""
+        idx = self._by_name.get((name or "").strip().casefold())
+        return self.roles[idx] if idx is not None else None
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        q = _normalize(query)
+        if not q:
+            return []
+        scores: Dict[int, float] = {}
+
+        start = bisect.bisect_left(self._prefix_keys, (q,))
+        for key, rank, idx in self._prefix_keys[start:]:
+            if not key.startswith(q):
+                break
+            # Prefix hits always outrank fuzzy ones; earlier word and canonical name rank higher
+            score = 3.0 - rank * 0.5
+            if score > scores.get(idx, 0):
+                scores[idx] = score
+            if len(scores) >= limit * 4:
+                break
+
+        if len(scores) < limit and len(q) >= 3:
+            grams = _trigrams(q)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._trigram_index.get(gram, ()))
+            # Only the terms sharing the most trigrams can reach the threshold
+            for term_id, count in shared.most_common(limit * 5):
+                idx, term_grams = self._search_terms[term_id]
+                dice = 2 * count / (len(grams) + term_grams)
+                if dice >= 0.35 and dice > scores.get(idx, 0):
+                    scores[idx] = dice
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], len(self.roles[item[0]]["name"])))
+        return [
+            {"role": self.roles[idx]["name"], "category": self.roles[idx]["category"], "score": round(score, 3)}
+            for idx, score in ranked[:limit]
+        ]
+
+def load_catalog(path: Optional[str] = None) -> CareerCatalog:
+    """
+    Build the catalog from a JSON file ({"categories": {...}, "aliases": {...}})
+    or, by default, from the built-in career data.
+    """
+    path = path or Config.CAREER_CATALOG_PATH
+    if path:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        catalog = CareerCatalog(data["categories"], data.get("aliases"))
+    else:
+        catalog = CareerCatalog(CAREER_CATEGORIES, ROLE_ALIASES)
+    logger.info(f"Loaded career catalog: {len(catalog.roles)} roles, etag {catalog.etag[:12]}")
+    return catalog
+
+_catalog: Optional[CareerCatalog] = None
+_catalog_lock = threading.Lock()
+
+def get_catalog() -> CareerCatalog:
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
+
+def reload_catalog(path: Optional[str] = None) -> CareerCatalog:
+    global _catalog
+    catalog = load_catalog(path)
+    with _catalog_lock:
+        _catalog = catalog
+    return catalog
@@ -0,0 +1,214 @@
+# Core ATS keywords per role in CAREER_CATEGORIES
+ROLE_SKILLS = {
+    # 💻 Technology
+    "AI & Machine Learning Engineer": [
+        "Python", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Scikit-learn",
+        "NLP", "Computer Vision", "MLOps", "Docker", "SQL", "Statistics", "LLM", "Git",
+    ],
+    "Data Scientist": [
+        "Python", "R", "SQL", "Statistics", "Machine Learning", "Pandas", "NumPy", "Scikit-learn",
+        "Data Visualization", "Tableau", "A/B Testing", "Deep Learning", "Feature Engineering",
+    ],
+    "Cybersecurity Analyst": [
+        "Network Security", "SIEM", "Splunk", "Firewalls", "Incident Response", "Vulnerability Assessment",
+        "Penetration Testing", "Linux", "Wireshark", "ISO 27001", "Threat Intelligence", "CEH", "CISSP",
+    ],
+    "Cloud Solutions Architect": [
+        "AWS", "Azure", "GCP", "Terraform", "Kubernetes", "Docker", "Microservices", "Networking",
+        "Serverless", "IAM", "CI/CD", "Solution Architecture", "Cost Optimization",
+    ],
+    "Full Stack Developer": [
+        "JavaScript", "TypeScript", "React", "Node.js", "HTML", "CSS", "REST API", "SQL", "MongoDB",
+        "Git", "Docker", "Express.js", "Python",
+    ],
+    "DevOps Engineer": [
+        "Linux", "Docker", "Kubernetes", "Jenkins", "CI/CD", "Terraform", "Ansible", "AWS",
+        "Bash", "Prometheus", "Grafana", "Git", "Python",
+    ],
+    "Blockchain Developer": [
+        "Solidity", "Ethereum", "Smart Contracts", "Web3", "JavaScript", "Rust", "Cryptography",
+        "Hardhat", "DeFi", "Go", "Node.js", "Hyperledger",
+    ],
+    "Mobile App Developer": [
+        "Android", "iOS", "Kotlin", "Swift", "Flutter", "React Native", "Dart", "Java",
+        "REST API", "Firebase", "Git", "UI Design",
+    ],
+    "Data Engineer": [
+        "Python", "SQL", "Spark", "Hadoop", "Kafka", "Airflow", "ETL", "Data Warehousing",
+        "Snowflake", "AWS", "Scala", "Data Modeling", "dbt",
+    ],
+    "Software Quality Assurance Engineer": [
+        "Manual Testing", "Automation Testing", "Selenium", "Java", "Python", "JIRA", "TestNG",
+        "API Testing", "Postman", "Regression Testing", "Agile", "Cypress", "SQL",
+    ],
+    # 🩺 Healthcare
+    "Medical Data Analyst": [
+        "SQL", "Excel", "Python", "R", "Statistics", "EHR", "Data Visualization", "Tableau",
+        "Power BI", "HIPAA", "Clinical Data", "ICD-10",
+    ],
+    "Telehealth Specialist": [
+        "Telemedicine", "Patient Care", "EHR", "HIPAA", "Communication", "Remote Monitoring",
+        "Triage", "Healthcare IT", "Patient Education", "Scheduling",
+    ],
+    "Biomedical Engineer": [
+        "Medical Devices", "MATLAB", "CAD", "Biomechanics", "Signal Processing", "ISO 13485",
+        "FDA Regulations", "Biomaterials", "Quality Assurance", "Python", "Instrumentation",
+    ],
+    "Clinical Research Associate": [
+        "Clinical Trials", "Good Clinical Practice", "ICH Guidelines", "Site Monitoring", "Regulatory Compliance",
+        "Protocol", "Pharmacovigilance", "CRF", "Data Management", "Informed Consent", "CDSCO",
+    ],
+    "Healthcare Administrator": [
+        "Hospital Management", "Healthcare Operations", "Budgeting", "Compliance", "EHR",
+        "Leadership", "Patient Experience", "NABH", "Staff Management", "Healthcare Policy",
+    ],
+    "Public Health Specialist": [
+        "Epidemiology", "Biostatistics", "Program Management", "Health Policy", "Research",
+        "Data Analysis", "Community Health", "SPSS", "Stata", "Monitoring and Evaluation",
+    ],
+    "Medical Laboratory Technologist": [
+        "Hematology", "Microbiology", "Biochemistry", "Phlebotomy", "Quality Control", "NABL",
+        "Laboratory Safety", "Pathology", "Specimen Processing", "LIS",
+    ],
+    "Physiotherapist": [
+        "Rehabilitation", "Manual Therapy", "Exercise Therapy", "Orthopedics", "Neurology",
+        "Sports Injury", "Electrotherapy", "Patient Assessment", "BPT", "MPT",
+    ],
+    "Pharmacy Manager": [
+        "Pharmacy Operations", "Inventory Management", "Drug Regulations", "Pharmacology",
+        "Team Leadership", "Customer Service", "Compliance", "B.Pharm", "D.Pharm", "Retail Pharmacy",
+    ],
+    "Healthcare IT Consultant": [
+        "EHR", "HL7", "FHIR", "HIPAA", "Healthcare IT", "Project Management", "SQL",
+        "Systems Integration", "Business Analysis", "Epic", "Cloud",
+    ],
+    # 💼 Business
+    "Business Analyst": [
+        "Requirements Gathering", "SQL", "Excel", "Power BI", "Tableau", "Stakeholder Management",
+        "JIRA", "Agile", "Process Mapping", "Data Analysis", "BRD", "UML",
+    ],
+    "Digital Marketing Strategist": [
+        "SEO", "SEM", "Google Ads", "Google Analytics", "Social Media Marketing", "Content Marketing",
+        "Email Marketing", "Meta Ads", "Marketing Automation", "Conversion Rate Optimization", "CRM",
+    ],
+    "Financial Data Analyst": [
+        "Excel", "SQL", "Financial Modeling", "Python", "Power BI", "Tableau", "Forecasting",
+        "Valuation", "Accounting", "VBA", "Statistics", "CFA",
+    ],
+    "Product Manager": [
+        "Product Strategy", "Roadmapping", "User Research", "Agile", "Scrum", "JIRA",
+        "Stakeholder Management", "A/B Testing", "Analytics", "Go-to-Market", "PRD", "SQL",
+    ],
+    "HR Analytics Specialist": [
+        "HR Analytics", "Excel", "SQL", "Power BI", "Workforce Planning", "HRIS", "Statistics",
+        "Talent Acquisition", "Employee Engagement", "Python", "Attrition Analysis",
+    ],
+    "Management Consultant": [
+        "Strategy", "Problem Solving", "Market Research", "Financial Analysis", "PowerPoint", "Excel",
+        "Stakeholder Management", "Business Transformation", "Project Management", "MBA",
+    ],
+    "Supply Chain Analyst": [
+        "Supply Chain Management", "Inventory Management", "Demand Forecasting", "SAP", "Excel",
+        "SQL", "Logistics", "Procurement", "Power BI", "Six Sigma", "ERP",
+    ],
+    "Investment Banker": [
+        "Financial Modeling", "Valuation", "M&A", "DCF", "Excel", "Due Diligence", "Pitch Books",
+        "Capital Markets", "Equity Research", "CFA", "MBA",
+    ],
+    "Brand Manager": [
+        "Brand Strategy", "Marketing", "Consumer Insights", "Market Research", "Campaign Management",
+        "Budgeting", "Digital Marketing", "Product Launch", "Advertising", "MBA",
+    ],
+    "Operations Manager": [
+        "Operations Management", "Process Improvement", "Lean", "Six Sigma", "Budgeting",
+        "Team Leadership", "KPI", "Supply Chain Management", "ERP", "Vendor Management",
+    ],
+    # 🎥 Content Creation
+    "Video Content Strategist": [
+        "Video Strategy", "YouTube", "Storytelling", "Analytics", "Scriptwriting", "Video Editing",
+        "Content Calendar", "SEO", "Social Media Marketing", "Premiere Pro",
+    ],
+    "Social Media Manager": [
+        "Social Media Marketing", "Content Calendar", "Instagram", "LinkedIn", "Meta Ads", "Canva",
+        "Community Management", "Analytics", "Copywriting", "Influencer Marketing",
+    ],
+    "Copywriter / Content Writer": [
+        "Copywriting", "Content Writing", "SEO", "Editing", "Proofreading", "Storytelling",
+        "WordPress", "Research", "Content Strategy", "Blogging",
+    ],
+    "Graphic Designer": [
+        "Photoshop", "Illustrator", "InDesign", "Figma", "Canva", "Typography", "Branding",
+        "Layout Design", "Adobe Creative Suite", "Color Theory",
+    ],
+    "SEO Specialist": [
+        "SEO", "Keyword Research", "Google Analytics", "Google Search Console", "Link Building",
+        "Technical SEO", "On-Page SEO", "Ahrefs", "SEMrush", "Content Optimization", "HTML",
+    ],
+    "Podcast Producer": [
+        "Audio Editing", "Audacity", "Adobe Audition", "Storytelling", "Scriptwriting", "Interviewing",
+        "Sound Design", "Podcast Distribution", "Project Management", "Research",
+    ],
+    "UX/UI Designer": [
+        "Figma", "User Research", "Wireframing", "Prototyping", "Usability Testing", "Adobe XD",
+        "Design Systems", "Interaction Design", "Information Architecture", "HTML", "CSS",
+    ],
+    "Video Editor": [
+        "Premiere Pro", "Final Cut Pro", "After Effects", "DaVinci Resolve", "Color Grading",
+        "Motion Graphics", "Sound Design", "Storytelling", "Video Editing",
+    ],
+    "Influencer Marketing Manager": [
+        "Influencer Marketing", "Campaign Management", "Social Media Marketing", "Negotiation",
+        "Brand Partnerships", "Analytics", "Instagram", "YouTube", "Budgeting", "Content Strategy",
+    ],
+    "Content Marketing Strategist": [
+        "Content Strategy", "Content Marketing", "SEO", "Copywriting", "Email Marketing",
+        "Google Analytics", "Content Calendar", "HubSpot", "Storytelling", "Lead Generation",
+    ],
+}
+
+# Alternative spellings that should count as the canonical skill
+SKILL_ALIASES = {
+    "Machine Learning": ["ML"],
+    "Deep Learning": ["DL", "Neural Networks"],
+    "NLP": ["Natural Language Processing"],
+    "Computer Vision": ["OpenCV"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "LLM": ["LLMs", "Large Language Models", "Generative AI", "GenAI"],
+    "TensorFlow": ["Keras"],
+    "JavaScript": ["JS"],
+    "React": ["React.js", "ReactJS"],
+    "Node.js": ["NodeJS", "Node"],
+    "Express.js": ["ExpressJS"],
+    "REST API": ["REST APIs", "RESTful", "RESTful APIs"],
+    "Kubernetes": ["K8s"],
+    "CI/CD": ["CICD", "Continuous Integration", "Continuous Deployment"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "AWS": ["Amazon Web Services"],
+    "Azure": ["Microsoft Azure"],
+    "Data Visualization": ["Data Visualisation"],
+    "ETL": ["ELT"],
+    "Spark": ["PySpark", "Apache Spark"],
+    "Kafka": ["Apache Kafka"],
+    "Airflow": ["Apache Airflow"],
+    "Power BI": ["PowerBI"],
+    "A/B Testing": ["AB Testing", "Split Testing", "Experimentation"],
+    "EHR": ["EMR", "Electronic Health Records", "Electronic Medical Records"],
+    "M&A": ["Mergers and Acquisitions", "Mergers & Acquisitions"],
+    "DCF": ["Discounted Cash Flow"],
+    "SEM": ["Search Engine Marketing", "PPC"],
+    "SEO": ["Search Engine Optimization", "Search Engine Optimisation"],
+    "Meta Ads": ["Facebook Ads", "Instagram Ads"],
+    "Premiere Pro": ["Adobe Premiere", "Premiere"],
+    "Photoshop": ["Adobe Photoshop"],
+    "Illustrator": ["Adobe Illustrator"],
+    "After Effects": ["Adobe After Effects"],
+    "Adobe XD": ["XD"],
+    "Monitoring and Evaluation": ["M&E", "Monitoring & Evaluation"],
+    "Good Clinical Practice": ["ICH-GCP", "ICH GCP"],
+    "Supply Chain Management": ["SCM"],
+    "KPI": ["KPIs"],
+    "Penetration Testing": ["Pen Testing", "Pentesting", "Ethical Hacking"],
+    "Automation Testing": ["Test Automation"],
+    "User Research": ["UX Research"],
+    "Usability Testing": ["User Testing"],
+}
@@ -1,16 +1,29 @@
-from flask import Blueprint, request, jsonify
-from backend.services.ai_service import (
-    initialize_llm_and_tools,
-    generate_career_insights,
-    generate_market_analysis,
-    generate_college_recommendations,
-    generate_resume_feedback,
-    create_agent_with_tools,
-    search_jobs
+import json
+from collections import Counter
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from backend.services.ai_service import generate_resume_feedback, run_agent
+from backend.services.jobs_service import get_jobs
+from backend.services.components import get_ai_components, warmup, is_ready, status as ai_status
+from backend.services.ats_service import match_resume
+from backend.services.compare_service import compare_roles, resolve_roles, uncached_reports
+from backend.services.chat_service import (
+    create_conversation, get_conversation, close_conversation, open_streams, stream_events,
 )
-from backend.data.career_data import CAREER_CATEGORIES
+from backend.services.batch_service import analyze_resume_batch
+from backend.services.related_service import get_related_careers
+from backend.services.salary_service import salary_stats
+from backend.services.search_service import MARKET_QUERIES
+from backend.services.report_service import REPORT_TYPES, get_report, stream_role_report
+from backend.services.prefetch_service import prefetch_reports, prefetch_stats
+from backend.services.refresh_service import refresh_stats
+from backend.services.model_router import routing_stats
+from backend.services.cache_service import report_cache
+from backend.services.rate_limit_service import charge, rate_limit
+from backend.data.catalog import get_catalog
 from backend.utils.text_utils import as_markdown
-from backend.utils.file_utils import extract_text_from_file
+from backend.utils.file_utils import extract_text_from_file, read_batch_uploads
+from backend.utils.http_utils import conditional_json
+from backend.utils.deadline import with_deadline
 from backend.config import Config
 import logging
 
@@ -19,24 +32,52 @@ logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__)
 
-# Cache for LLM and Agent (Global for simplicity in this prototype)
-_llm = None
-_agent = None
-
-def get_ai_components():
-    global _llm, _agent
-    if _llm is None:
-        if not Config.GOOGLE_API_KEY:
-            logger.error("GOOGLE_API_KEY is missing in Config")
-        if not Config.SERPAPI_KEY:
-            logger.error("SERPAPI_KEY is missing in Config")
-            
-        _llm, tools = initialize_llm_and_tools(Config.GOOGLE_API_KEY, Config.SERPAPI_KEY)
-        if _llm and tools:
-            _agent = create_agent_with_tools(_llm, tools)
-    return _llm, _agent
+# llm tokens one resume's AI feedback costs, single or in a batch
+RESUME_LLM_COST = 3
+
+# Rate-limit cost of generating one report of each kind
+REPORT_COSTS = {
+    "insights": {"llm": 2},
+    "market": {"llm": 3, "search": len(MARKET_QUERIES)},
+    "colleges": {"llm": 2},
+}
+
+def _allows_storage():
+    """Per-request opt-out of personal-data retention."""
+    if 'no-store' in request.headers.get('Cache-Control', '').lower():
+        return False
+    return request.form.get('store', 'true').lower() not in ('false', '0', 'no')
+
+@api_bp.route('/health', methods=['GET'])
+def health():
+    """
+    Liveness: the process is up and serving requests
+    ---
+    responses:
+      200:
+        description: Process is up
+    """
+    return jsonify({"status": "up"})
+
+@api_bp.route('/ready', methods=['GET'])
+def ready():
+    """
+    Readiness: AI components are loaded and warmed. Starts warmup if it has not begun.
+    ---
+    responses:
+      200:
+        description: LLM and agent are ready
+      503:
+        description: Still warming (or failed); retry later
+    """
+    current = ai_status()
+    if is_ready():
+        return jsonify(current)
+    warmup()
+    return jsonify(current), 503
 
 @api_bp.route('/careers', methods=['GET'])
+@rate_limit(catalog=1)
 def get_careers():
     """
     Get all career categories and roles
@@ -44,10 +85,104 @@ def get_careers():
     responses:
       200:
         description: A dictionary of career categories and their transition roles
+      304:
+        description: Catalog unchanged since the ETag sent in If-None-Match
+    """
+    catalog = get_catalog()
+    response = Response(catalog.payload, mimetype='application/json')
+    response.set_etag(catalog.etag)
+    # Clients may keep a copy but must revalidate; unchanged catalogs cost a 304
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@api_bp.route('/careers/search', methods=['GET'])
+@rate_limit(catalog=1)
+def search_careers():
+    """
+    Autocomplete search over career roles and their aliases
+    ---
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+      - name: limit
+        in: query
+        type: integer
+        default: 10
+    responses:
+      200:
+        description: Matching roles ranked by prefix and fuzzy similarity
+    """
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', 10, type=int) or 10, 50)
+    return jsonify({"query": query, "results": get_catalog().search(query, limit)})
+
+@api_bp.route('/careers/related', methods=['GET'])
+@rate_limit(catalog=1)
+def related_careers():
+    """
+    Roles with the most similar skill profiles (precomputed)
+    ---
+    parameters:
+      - name: role
+        in: query
+        type: string
+        required: true
+      - name: limit
+        in: query
+        type: integer
+        default: 5
+    responses:
+      200:
+        description: Nearest roles with similarity score and shared skills
+      404:
+        description: Role not in the catalog
+    """
+    role = request.args.get('role', '')
+    limit = request.args.get('limit', 5, type=int) or 5
+    related = get_related_careers(role, limit)
+    if related is None:
+        return jsonify({"error": f"Unknown role: {role}"}), 404
+    return jsonify({"role": get_catalog().get(role)["name"], "related": related})
+
+@api_bp.route('/salaries', methods=['GET'])
+@rate_limit(catalog=1)
+def salaries():
+    """
+    Salary distribution for a role, from collected job postings
+    ---
+    parameters:
+      - name: role
+        in: query
+        type: string
+        required: true
+      - name: city
+        in: query
+        type: string
+        required: false
+      - name: bins
+        in: query
+        type: integer
+        default: 10
+    responses:
+      200:
+        description: Posting count, percentiles, histogram and per-city medians in LPA
+      404:
+        description: No salary data collected for this role/city yet
     """
-    return jsonify(CAREER_CATEGORIES)
+    role = request.args.get('role', '').strip()
+    if not role:
+        return jsonify({"error": "Role is required"}), 400
+    bins = min(max(request.args.get('bins', Config.SALARY_HISTOGRAM_BINS, type=int) or 1, 1), 50)
+    stats = salary_stats(role, request.args.get('city'), bins)
+    if stats is None:
+        return jsonify({"error": f"No salary data for {role} yet"}), 404
+    return conditional_json(stats, stats["updated_at"])
 
 @api_bp.route('/chat', methods=['POST'])
+@rate_limit(llm=5, search=2)
+@with_deadline(60)
 def chat():
     """
     Interactive AI Career Advisor Chat
@@ -81,21 +216,187 @@ def chat():
         return jsonify({"error": "AI components not initialized. Check API keys."}), 500
     
     try:
-        response = agent.invoke({"input": message})
-        answer = response.get("output", "I'm sorry, I couldn't process that.")
+        answer = run_agent(agent, message)
         return jsonify({"answer": as_markdown(answer)})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@api_bp.route('/career-insights', methods=['POST'])
+@api_bp.route('/chat/conversations', methods=['POST'])
+@rate_limit(catalog=1)
+def chat_conversation_create():
+    """
+    Start a streaming chat conversation
+    ---
+    description: >
+      Open GET /api/chat/conversations/{id}/events as an EventSource, then
+      post messages to /api/chat/conversations/{id}/messages. The server
+      keeps the conversation history in the process that created it, so
+      chat needs a single worker process (with threads) or sticky sessions.
+      A client whose conversation was lost can pass the turns it still shows
+      as history to continue where it left off.
+    parameters:
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            history:
+              type: array
+              items:
+                type: object
+                properties:
+                  role:
+                    type: string
+                    example: "user"
+                  content:
+                    type: string
+    responses:
+      201:
+        description: Conversation id
+    """
+    history = []
+    for turn in (request.get_json(silent=True) or {}).get('history') or []:
+        if isinstance(turn, dict) and isinstance(turn.get('content'), str) and turn['content'].strip():
+            history.append(("user" if turn.get('role') == 'user' else "assistant", turn['content']))
+    conv = create_conversation(history)
+    return jsonify({"conversation_id": conv.id}), 201
+
+@api_bp.route('/chat/conversations/<conversation_id>/events', methods=['GET'])
+def chat_conversation_events(conversation_id):
+    """
+    Server-sent events for a chat conversation
+    ---
+    description: >
+      Events: ready, status, step ({tool, input}), observation ({chars, preview}),
+      token ({text}), done ({answer}) and error ({error}). Events carry ids, so a
+      reconnecting EventSource resumes where it left off. If no client is
+      connected for CHAT_RECONNECT_GRACE seconds the running answer is cancelled.
+    parameters:
+      - name: conversation_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: text/event-stream
+      404:
+        description: Unknown or expired conversation
+      503:
+        description: Too many open event streams in this process
+    """
+    conv = get_conversation(conversation_id)
+    if conv is None:
+        return jsonify({"error": "Unknown conversation"}), 404
+    if open_streams() >= Config.CHAT_MAX_STREAMS:
+        response = jsonify({"error": "Too many open chat streams; try again shortly"})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    events = stream_events(conv, int(last_event_id) if last_event_id.isdigit() else None)
+    return Response(events, mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@api_bp.route('/chat/conversations/<conversation_id>/messages', methods=['POST'])
+@rate_limit(llm=5, search=2)
+@with_deadline(60)
+def chat_conversation_message(conversation_id):
+    """
+    Ask a question in a streaming chat conversation
+    ---
+    description: The answer arrives on the conversation's event stream.
+    parameters:
+      - name: conversation_id
+        in: path
+        type: string
+        required: true
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "How do I become a Data Scientist in India?"
+    responses:
+      202:
+        description: Message accepted
+      400:
+        description: Missing message
+      404:
+        description: Unknown or expired conversation
+      409:
+        description: The previous message is still being answered
+      500:
+        description: API keys or AI component error
+    """
+    conv = get_conversation(conversation_id)
+    if conv is None:
+        return jsonify({"error": "Unknown conversation"}), 404
+    message = ((request.get_json(silent=True) or {}).get('message') or '').strip()
+    if not message:
+        return jsonify({"error": "message is required"}), 400
+
+    llm, agent = get_ai_components()
+    if not agent:
+        return jsonify({"error": "AI components not initialized. Check API keys."}), 500
+    if not conv.send(agent, message):
+        return jsonify({"error": "Previous message is still being answered"}), 409
+    return jsonify({"conversation_id": conv.id, "status": "accepted"}), 202
+
+@api_bp.route('/chat/conversations/<conversation_id>', methods=['DELETE'])
+def chat_conversation_delete(conversation_id):
+    """
+    End a chat conversation, cancelling any answer in progress
+    ---
+    parameters:
+      - name: conversation_id
+        in: path
+        type: string
+        required: true
+    responses:
+      204:
+        description: Conversation closed
+      404:
+        description: Unknown or expired conversation
+    """
+    if not close_conversation(conversation_id):
+        return jsonify({"error": "Unknown conversation"}), 404
+    return '', 204
+
+def _request_params():
+    """Query args for GET (revalidatable), JSON body for POST."""
+    if request.method == 'GET':
+        return request.args
+    return request.get_json(silent=True) or {}
+
+def _report_response(kind, subcareer, category=''):
+    llm, _ = get_ai_components()
+    if not llm:
+        return jsonify({"error": "LLM not initialized"}), 500
+
+    report = get_report(kind, llm, subcareer, category)
+    if report["error"]:
+        response = jsonify({"result": report["result"]})
+        response.cache_control.no_store = True
+        return response
+    return conditional_json({"result": report["result"]}, report["created_at"])
+
+@api_bp.route('/career-insights', methods=['GET', 'POST'])
+@rate_limit(**REPORT_COSTS["insights"])
+@with_deadline(45)
 def career_insights():
     """
     Generate professional career insights and learning roadmap
     ---
+    description: >
+      GET with query parameters returns ETag/Last-Modified validators so
+      clients can revalidate a cached report with If-None-Match.
     parameters:
       - name: body
         in: body
-        required: true
+        required: false
         schema:
           type: object
           properties:
@@ -103,22 +404,24 @@ def career_insights():
               type: string
             subcareer:
               type: string
+      - name: category
+        in: query
+        type: string
+      - name: subcareer
+        in: query
+        type: string
     responses:
       200:
         description: Detailed career analysis in markdown
+      304:
+        description: Cached report is still current
     """
-    data = request.json
-    category = data.get('category')
-    subcareer = data.get('subcareer')
-    
-    llm, _ = get_ai_components()
-    if not llm:
-        return jsonify({"error": "LLM not initialized"}), 500
-    
-    result = generate_career_insights(category, subcareer, llm)
-    return jsonify({"result": as_markdown(result)})
+    data = _request_params()
+    return _report_response('insights', data.get('subcareer'), data.get('category'))
 
-@api_bp.route('/market-analysis', methods=['POST'])
+@api_bp.route('/market-analysis', methods=['GET', 'POST'])
+@rate_limit(**REPORT_COSTS["market"])
+@with_deadline(60)
 def market_analysis():
     """
     Analyze the current job market in India for a specific role
@@ -126,27 +429,27 @@ def market_analysis():
     parameters:
       - name: body
         in: body
-        required: true
+        required: false
         schema:
           type: object
           properties:
             subcareer:
               type: string
+      - name: subcareer
+        in: query
+        type: string
     responses:
       200:
         description: Market analysis summary with salaries and trends
+      304:
+        description: Cached report is still current
     """
-    data = request.json
-    subcareer = data.get('subcareer')
-    
-    llm, _ = get_ai_components()
-    if not llm:
-        return jsonify({"error": "LLM not initialized"}), 500
-    
-    result = generate_market_analysis(subcareer, llm)
-    return jsonify({"result": as_markdown(result)})
+    data = _request_params()
+    return _report_response('market', data.get('subcareer'))
 
-@api_bp.route('/college-recommendations', methods=['POST'])
+@api_bp.route('/college-recommendations', methods=['GET', 'POST'])
+@rate_limit(**REPORT_COSTS["colleges"])
+@with_deadline(45)
 def college_recommendations():
     """
     Get personalized recommendations for Indian colleges and entrance exams
@@ -154,27 +457,263 @@ def college_recommendations():
     parameters:
       - name: body
         in: body
-        required: true
+        required: false
         schema:
           type: object
           properties:
             subcareer:
               type: string
+      - name: subcareer
+        in: query
+        type: string
     responses:
       200:
         description: List of colleges, paths, and exams
+      304:
+        description: Cached report is still current
     """
-    data = request.json
-    subcareer = data.get('subcareer')
-    
+    data = _request_params()
+    return _report_response('colleges', data.get('subcareer'))
+
+@api_bp.route('/role-report', methods=['GET', 'POST'])
+@rate_limit(llm=6, search=len(MARKET_QUERIES))
+@with_deadline(75)
+def role_report():
+    """
+    Insights, market analysis and college recommendations for one role, generated concurrently
+    ---
+    parameters:
+      - name: role
+        in: query
+        type: string
+        required: true
+      - name: category
+        in: query
+        type: string
+        description: Defaults to the role's catalog category
+      - name: types
+        in: query
+        type: string
+        description: Comma-separated subset of insights,market,colleges (default all)
+      - name: stream
+        in: query
+        type: string
+        description: Set to "false" to get one JSON object once every part is done
+    produces:
+      - application/x-ndjson
+      - application/json
+    responses:
+      200:
+        description: One {"event":"report"} line per part as it completes, then a summary
+      400:
+        description: Missing role or unknown report type
+    """
+    data = _request_params()
+    role = (data.get('role') or data.get('subcareer') or '').strip()
+    types = data.get('types') or ','.join(REPORT_TYPES)
+    if isinstance(types, str):
+        types = [t.strip() for t in types.split(',') if t.strip()]
+    kinds = list(dict.fromkeys(types))
+    if not role:
+        return jsonify({"error": "role is required"}), 400
+    unknown = [k for k in kinds if k not in REPORT_TYPES]
+    if unknown or not kinds:
+        return jsonify({"error": f"Unknown report types: {unknown}. Use {list(REPORT_TYPES)}"}), 400
+
+    entry = get_catalog().get(role)
+    category = data.get('category') or (entry["category"] if entry else '')
+    role = entry["name"] if entry else role
+
     llm, _ = get_ai_components()
     if not llm:
         return jsonify({"error": "LLM not initialized"}), 500
-    
-    result = generate_college_recommendations(subcareer, llm)
-    return jsonify({"result": as_markdown(result)})
+
+    events = stream_role_report(kinds, llm, role, category)
+    if str(data.get('stream', 'true')).lower() in ('false', '0', 'no'):
+        reports = {}
+        for event in events:
+            if event["event"] == "report":
+                reports[event.pop("type")] = event
+            else:
+                summary = event
+        return jsonify({"role": role, "category": category, "reports": reports, "elapsed_ms": summary["elapsed_ms"]})
+    lines = (json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+@api_bp.route('/compare', methods=['GET', 'POST'])
+@rate_limit(catalog=1)
+@with_deadline(90)
+def compare():
+    """
+    Compare several roles side by side
+    ---
+    description: >
+      Built from each role's insights and market reports (cached ones are reused,
+      missing ones generated concurrently): a comparison table, merged radar and
+      salary chart data, observed salary stats, and an optional short summary
+      from one small LLM call. Roles that are all cached return in milliseconds.
+      Each report that has to be generated is charged like its own endpoint,
+      up front; a comparison that does not fit the client's budget gets a 429.
+    parameters:
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            roles:
+              type: array
+              items:
+                type: string
+              example: ["Data Scientist", "Data Engineer"]
+            summary:
+              type: boolean
+      - name: roles
+        in: query
+        type: string
+        description: Comma-separated role names
+      - name: summary
+        in: query
+        type: boolean
+        default: true
+    responses:
+      200:
+        description: Table (plus markdown), charts, salaries and summary
+      400:
+        description: Fewer than two or more than COMPARE_MAX_ROLES roles
+      429:
+        description: The uncached reports would exceed the client's rate limit
+      500:
+        description: LLM not initialized
+    """
+    data = _request_params()
+    roles = data.get('roles') or []
+    if isinstance(roles, str):
+        roles = roles.split(',')
+    roles = [r.strip() for r in roles if isinstance(r, str) and r.strip()]
+    if not 2 <= len(roles) <= Config.COMPARE_MAX_ROLES:
+        return jsonify({"error": f"Give between 2 and {Config.COMPARE_MAX_ROLES} roles to compare"}), 400
+
+    llm, _ = get_ai_components()
+    if not llm:
+        return jsonify({"error": "LLM not initialized"}), 500
+
+    summary = str(data.get('summary', 'true')).lower() not in ('false', '0', 'no')
+    try:
+        resolved = resolve_roles(roles)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    costs = Counter(llm=1 if summary else 0)
+    for _, kind in uncached_reports(resolved):
+        costs.update(REPORT_COSTS[kind])
+    limited = charge(**costs)
+    if limited:
+        return limited
+    return jsonify(compare_roles(resolved, llm, summary=summary))
+
+@api_bp.route('/prefetch', methods=['POST'])
+@rate_limit(catalog=1)
+def prefetch():
+    """
+    Warm the report cache for a role the user just selected (background, best effort)
+    ---
+    description: >
+      Queues the role's reports behind interactive traffic, within a
+      per-client hourly budget (PREFETCH_BUDGET reports).
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            role:
+              type: string
+            category:
+              type: string
+            types:
+              type: string
+              description: Comma-separated subset of insights,market,colleges
+    responses:
+      202:
+        description: Status per report type (queued, cached, pending, over_budget, dropped)
+      400:
+        description: Missing role or unknown report type
+    """
+    data = request.get_json(silent=True) or {}
+    role = (data.get('role') or data.get('subcareer') or '').strip()
+    if not role:
+        return jsonify({"error": "role is required"}), 400
+    if not Config.PREFETCH_ENABLED:
+        return jsonify({"role": role, "reports": {}, "enabled": False}), 202
+    kinds = [t.strip() for t in (data.get('types') or ','.join(REPORT_TYPES)).split(',') if t.strip()]
+    unknown = [k for k in kinds if k not in REPORT_TYPES]
+    if unknown:
+        return jsonify({"error": f"Unknown report types: {unknown}. Use {list(REPORT_TYPES)}"}), 400
+
+    entry = get_catalog().get(role)
+    category = data.get('category') or (entry["category"] if entry else '')
+    role = entry["name"] if entry else role
+    return jsonify({"role": role, "reports": prefetch_reports(role, category, kinds), "enabled": True}), 202
+
+@api_bp.route('/prefetch/stats', methods=['GET'])
+@rate_limit(catalog=1)
+def prefetch_statistics():
+    """
+    Prefetch outcomes: how many prefetched reports were used (hit rate) or expired unread (waste rate)
+    ---
+    responses:
+      200:
+        description: Counters, hit_rate and waste_rate
+    """
+    return jsonify(prefetch_stats())
+
+@api_bp.route('/cache/stats', methods=['GET'])
+@rate_limit(catalog=1)
+def cache_statistics():
+    """
+    Report cache and compressed report store statistics
+    ---
+    description: >
+      Cache hits and misses, plus the store's dedup and compression ratios
+      and the hit rate of its decompressed hot set.
+    responses:
+      200:
+        description: Cache counters and store stats
+    """
+    return jsonify(report_cache.stats())
+
+@api_bp.route('/refresh/stats', methods=['GET'])
+@rate_limit(catalog=1)
+def refresh_statistics():
+    """
+    Stale-while-revalidate refresher: stale serves, refreshes, hourly budget use and the most popular entries
+    ---
+    responses:
+      200:
+        description: Counters, budget and the popularity scores (with entry type only) of the top entries
+    """
+    return jsonify(refresh_stats())
+
+@api_bp.route('/routing/stats', methods=['GET'])
+@rate_limit(catalog=1)
+def model_routing_statistics():
+    """
+    Model routing outcomes per tier: calls, errors, fallbacks, latency, tokens and estimated cost
+    ---
+    description: >
+      Latency estimates are EWMAs of time to first token and tokens per second.
+      Every attempt is also appended to LLM_ROUTING_LOG (JSON lines) for offline review.
+    responses:
+      200:
+        description: Routes, per-model stats and the most recent decisions
+    """
+    return jsonify(routing_stats())
 
 @api_bp.route('/resume-analysis', methods=['POST'])
+@rate_limit(llm=RESUME_LLM_COST)
+@with_deadline(60)
 def resume_analysis():
     """
     AI-powered resume coach and feedback analysis
@@ -191,6 +730,10 @@ def resume_analysis():
         in: formData
         type: file
         description: Resume file (PDF, DOCX, TXT)
+      - name: store
+        in: formData
+        type: string
+        description: Set to "false" (or send Cache-Control no-store) to opt out of caching the resume and its analysis
     responses:
       200:
         description: Constructive feedback and ATS optimization tips
@@ -198,11 +741,12 @@ def resume_analysis():
     # Handle both text and file upload
     resume_text = request.form.get('resume_text', '')
     target_role = request.form.get('target_role', '')
+    use_cache = _allows_storage()
     
     if 'file' in request.files:
         file = request.files['file']
         if file.filename != '':
-            resume_text = extract_text_from_file(file)
+            resume_text = extract_text_from_file(file, use_cache=use_cache)
     
     if not resume_text:
         return jsonify({"error": "No resume content provided"}), 400
@@ -211,10 +755,107 @@ def resume_analysis():
     if not llm:
         return jsonify({"error": "LLM not initialized"}), 500
     
-    result = generate_resume_feedback(resume_text, target_role, llm)
+    result = generate_resume_feedback(resume_text, target_role, llm, use_cache=use_cache)
     return jsonify({"result": as_markdown(result)})
 
+@api_bp.route('/resume-analysis/batch', methods=['POST'])
+@rate_limit(catalog=5)
+@with_deadline(900)
+def resume_analysis_batch():
+    """
+    Analyze many resumes at once (multi-file upload or a zip archive)
+    ---
+    description: >
+      Each file's LLM feedback is charged like one /resume-analysis call. Files
+      past the client's llm budget get their local checks and an error result.
+    parameters:
+      - name: files
+        in: formData
+        type: file
+        description: Resume files (PDF, DOCX, TXT) and/or zip archives of them; repeat the field for multiple files
+      - name: target_role
+        in: formData
+        type: string
+      - name: include_feedback
+        in: formData
+        type: string
+        description: Set to "false" to run only the local pre-checks (no LLM calls)
+      - name: store
+        in: formData
+        type: string
+        description: Set to "false" to opt out of caching resume text and analyses
+    produces:
+      - application/x-ndjson
+    responses:
+      200:
+        description: Newline-delimited JSON, one result per resume as it completes, then a summary
+      400:
+        description: No usable files or batch limits exceeded
+    """
+    target_role = request.form.get('target_role', '')
+    include_feedback = request.form.get('include_feedback', 'true').lower() not in ('false', '0', 'no')
+    use_cache = _allows_storage()
+    
+    try:
+        entries = read_batch_uploads(request.files.getlist('files') + request.files.getlist('file'))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    if not entries:
+        return jsonify({"error": "No supported resume files provided"}), 400
+    
+    llm = None
+    if include_feedback:
+        llm, _ = get_ai_components()
+        if not llm:
+            return jsonify({"error": "LLM not initialized"}), 500
+    
+    logger.info(f"Batch resume analysis: {len(entries)} files for '{target_role}'")
+    events = analyze_resume_batch(entries, target_role, llm, include_feedback=include_feedback, use_cache=use_cache,
+                                  charge_feedback=lambda: charge(llm=RESUME_LLM_COST) is None)
+    lines = (json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+@api_bp.route('/ats-match', methods=['POST'])
+@rate_limit(catalog=2)
+def ats_match():
+    """
+    Fast local ATS keyword match against the target role's skill vocabulary
+    ---
+    parameters:
+      - name: resume_text
+        in: formData
+        type: string
+        description: Full text of the resume
+      - name: target_role
+        in: formData
+        type: string
+      - name: file
+        in: formData
+        type: file
+        description: Resume file (PDF, DOCX, TXT)
+    responses:
+      200:
+        description: Matched and missing keywords with a coverage score
+      400:
+        description: No resume content provided
+    """
+    data = request.get_json(silent=True) or request.form
+    resume_text = data.get('resume_text', '')
+    target_role = data.get('target_role', '')
+    
+    if 'file' in request.files:
+        file = request.files['file']
+        if file.filename != '':
+            resume_text = extract_text_from_file(file, use_cache=_allows_storage())
+    
+    if not resume_text:
+        return jsonify({"error": "No resume content provided"}), 400
+    
+    return jsonify(match_resume(resume_text, target_role))
+
 @api_bp.route('/jobs', methods=['POST'])
+@rate_limit(search=1)
+@with_deadline(30)
 def find_jobs():
     data = request.json
     role = data.get('role')
@@ -227,7 +868,7 @@ def find_jobs():
         return jsonify({"error": "Role is required"}), 400
 
     try:
-        jobs = search_jobs(role, location, Config.SERPAPI_KEY)
+        jobs = get_jobs(role, location)
         logger.info(f"find_jobs: Found {len(jobs)} jobs for '{role}'")
         return jsonify(jobs)
     except Exception as e:
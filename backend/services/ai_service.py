@@ -1,24 +1,46 @@
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Iterator, List, Tuple, Optional, TYPE_CHECKING
+import time
+import queue
 import logging
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.utilities import SerpAPIWrapper
-from langchain_community.tools import Tool
-from langchain.agents import initialize_agent, AgentType
-from serpapi import GoogleSearch # Direct import for structured job search
-
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+import contextvars
+from contextlib import contextmanager
+from backend.config import Config
+from backend.services.cache_service import report_cache, make_key
+from backend.utils.text_utils import normalize_whitespace
+from backend.utils.resume_utils import estimate_tokens, preprocess_resume
+from backend.services.ats_service import match_resume, format_ats_report
+from backend.services.related_service import get_related_careers
+from backend.services.search_service import build_market_context
+from backend.services.salary_service import record_postings, salary_context
+from backend.services.scheduler import call_with_deadline, submit_interactive
+from backend.services.model_router import agent_prompt, agent_variant, get_router, model_variant
+from backend.utils import deadline
+from backend.utils.tracing import current_span, llm_config, span, traced, user_input
+
+# LangChain, Gemini and SerpAPI SDKs take seconds to import; they are loaded on
+# first use inside the functions below so the app boots without them.
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langchain_community.tools import Tool
+
 logger = logging.getLogger(__name__)
 
-def initialize_llm_and_tools(google_api_key: str, serpapi_key: str) -> Tuple[Optional[ChatGoogleGenerativeAI], Optional[List[Tool]]]:
+# Bump whenever the resume prompt changes so cached analyses are not reused
+RESUME_PROMPT_VERSION = "4"
+
+def initialize_llm_and_tools(google_api_key: str, serpapi_key: str) -> Tuple[Optional["ChatGoogleGenerativeAI"], Optional[List["Tool"]]]:
     try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from langchain_community.utilities import SerpAPIWrapper
+        from langchain_community.tools import Tool
+
         if not google_api_key:
             raise ValueError("Google API key is required.")
         if not serpapi_key:
             raise ValueError("SerpAPI key is required.")
 
         llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
+            model=Config.LLM_DEFAULT_MODEL,
             google_api_key=google_api_key,
             temperature=0.1,
         )
@@ -34,18 +56,201 @@ def initialize_llm_and_tools(google_api_key: str, serpapi_key: str) -> Tuple[Opt
             func=search.run,
         )
 
-        return llm, [search_tool]
+        related_tool = Tool(
+            name="related_careers",
+            description="Use first for questions like 'what roles are similar to X'. Input: a role name. Returns similar roles from the catalog with shared skills.",
+            func=_related_careers_tool,
+        )
+
+        return llm, [search_tool, related_tool]
     except Exception as e:
         logger.error(f"Error initializing LLM/tools: {e}")
         return None, None
 
-def create_agent_with_tools(llm, tools: List[Tool]):
+def _related_careers_tool(role: str) -> str:
+    related = get_related_careers(role.strip().strip('"'), limit=5)
+    if related is None:
+        return f"'{role}' is not in the career catalog; use web_search instead."
+    if not related:
+        return f"No closely related roles found for '{role}'."
+    return "\n".join(
+        f"- {r['role']} ({r['category']}), similarity {r['score']}, shared skills: {', '.join(r['shared_skills'])}"
+        for r in related
+    )
+
+# Appended when the request deadline cuts a streamed answer short
+TRUNCATED_NOTE = "\n\n---\n*⏱️ Response truncated: the request time limit was reached.*"
+
+# Receiver for live output while a call runs under stream_call(): emit(kind, payload)
+_live_output: contextvars.ContextVar[Optional[Callable[[str, Any], None]]] = contextvars.ContextVar("live_output", default=None)
+
+def _content(message) -> str:
+    return message.content if hasattr(message, 'content') else str(message)
+
+@contextmanager
+def live_output(emit: Callable[[str, Any], None]):
+    """Send live tokens and agent steps of LLM calls in this block to emit(kind, payload)."""
+    token = _live_output.set(emit)
     try:
+        yield
+    finally:
+        _live_output.reset(token)
+
+def stream_call(fn, *args, **kwargs) -> Iterator[Tuple[str, Any]]:
+    """
+    Run fn on the interactive lane and relay its live output: ("token", text)
+    from invoke_llm, ("step"/"observation", dict) from run_agent, and finally
+    ("result", fn's return value). If the consumer stops early, fn still runs
+    to completion, so whatever it caches is kept.
+    """
+    events: "queue.Queue" = queue.Queue()
+
+    def _run():
+        with live_output(lambda kind, payload: events.put((kind, payload))):
+            return fn(*args, **kwargs)
+
+    future = submit_interactive(_run)
+    future.add_done_callback(lambda _: events.put(None))
+    while True:
+        event = events.get()
+        if event is None:
+            break
+        yield event
+    yield "result", future.result()
+
+def _stream_llm(llm: "ChatGoogleGenerativeAI", prompt: str, progress: dict) -> str:
+    emit = _live_output.get()
+    if deadline.remaining() is None and emit is None:
+        return _content(llm.invoke(prompt, config=llm_config()))
+
+    parts = []
+    started = time.perf_counter()
+    truncated = False
+
+    def _stream():
+        nonlocal truncated
+        remaining = deadline.remaining()
+        options = {"timeout": max(remaining, 0.1)} if remaining is not None else {}
+        for chunk in llm.stream(prompt, config=llm_config(), **options):
+            # Checked as each chunk arrives, so a stream that ends by itself is never marked truncated
+            if deadline.expired():
+                truncated = True
+                break
+            text = _content(chunk)
+            if not parts:
+                progress["ttft"] = time.perf_counter() - started
+            parts.append(text)
+            if emit:
+                progress["emitted"] = True
+                emit("token", text)
+
+    try:
+        call_with_deadline(_stream)
+    except Exception:
+        if not parts or not deadline.expired():
+            raise
+        truncated = True
+    if truncated:
+        return "".join(parts) + TRUNCATED_NOTE
+    return "".join(parts)
+
+def invoke_llm(llm: "ChatGoogleGenerativeAI", prompt: str, task: str = "default") -> str:
+    """
+    llm.invoke that honours the request deadline: the answer is streamed,
+    each upstream attempt gets the remaining time as its timeout, and once
+    time is up whatever has arrived is returned with a truncation note.
+    Under stream_call() the tokens are also emitted as they arrive.
+    With routing enabled the model tier is picked per task, and a failed
+    call falls back to another tier if nothing has been streamed yet.
+    """
+    if not Config.LLM_ROUTING_ENABLED:
+        return _stream_llm(llm, prompt, {})
+
+    router = get_router()
+    decision = router.choose(task, prompt)
+    if current_span() is not None:
+        current_span().set_attributes({"llm.route.model": decision.model, "llm.route.reason": decision.reason})
+    models = [decision.model, *decision.fallbacks]
+    for attempt, model in enumerate(models):
+        progress = {}
+        started = time.perf_counter()
+        try:
+            text = _stream_llm(model_variant(llm, model), prompt, progress)
+        except Exception as e:
+            if deadline.expired():
+                raise
+            router.record(decision, model, attempt, False, time.perf_counter() - started, progress.get("ttft"), 0, str(e))
+            if progress.get("emitted") or attempt == len(models) - 1:
+                raise
+            logger.warning(f"{model} failed for {task} ({e}); falling back to {models[attempt + 1]}")
+            continue
+        router.record(decision, model, attempt, True, time.perf_counter() - started, progress.get("ttft"), estimate_tokens(text))
+        return text
+
+def run_agent(agent, message: str, *handlers) -> str:
+    """
+    Run the ReAct agent within the request deadline. If time runs out between
+    steps (or while waiting on one), return what the tools found so far.
+    Extra callback handlers are passed through; under stream_call() tool
+    steps and final-answer tokens are emitted live. With routing enabled the
+    agent runs on the model picked for "chat", falling back to another tier
+    if the model fails before any tool was called or anything was streamed.
+    """
+    from backend.utils.llm_tracing import AgentEventStreamer, DeadlineGuard
+
+    guard = DeadlineGuard()
+    emit = _live_output.get()
+    progress = {}
+    if emit:
+        def _emit(kind, payload):
+            progress["emitted"] = True
+            emit(kind, payload)
+        handlers = (*handlers, AgentEventStreamer(_emit))
+
+    router = get_router() if Config.LLM_ROUTING_ENABLED else None
+    decision = router.choose("chat", agent_prompt(agent, message)) if router else None
+    models = [decision.model, *decision.fallbacks] if decision else [None]
+    try:
+        for attempt, model in enumerate(models):
+            started = time.perf_counter()
+            runner = agent_variant(agent, model) if model else agent
+            try:
+                response = call_with_deadline(runner.invoke, {"input": message}, config=llm_config(guard, *handlers))
+            except deadline.DeadlineExceeded:
+                raise
+            except Exception as e:
+                if not router:
+                    raise
+                router.record(decision, model, attempt, False, time.perf_counter() - started, None, 0, str(e),
+                              single_call=False)
+                if progress or guard.observations or attempt == len(models) - 1:
+                    raise
+                logger.warning(f"Agent on {model} failed ({e}); falling back to {models[attempt + 1]}")
+                continue
+            answer = response.get("output", "I'm sorry, I couldn't process that.")
+            if router:
+                router.record(decision, model, attempt, True, time.perf_counter() - started, None,
+                              estimate_tokens(answer), single_call=False)
+            return answer
+    except deadline.DeadlineExceeded:
+        logger.warning(f"Agent stopped at the deadline after {len(guard.observations)} tool calls")
+        if not guard.observations:
+            return "❌ The advisor ran out of time before it could answer. Please try a narrower question."
+        findings = "\n\n".join(
+            f"**{tool}** (`{tool_input}`):\n{observation[:1500]}"
+            for tool, tool_input, observation in guard.observations
+        )
+        return f"⏱️ I ran out of time before finishing, but here is what I found so far:\n\n{findings}"
+
+def create_agent_with_tools(llm, tools: List["Tool"]):
+    try:
+        from langchain.agents import initialize_agent, AgentType
+
         agent_executor = initialize_agent(
             tools,
             llm,
             agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-            verbose=True,
+            verbose=Config.AGENT_VERBOSE,
             handle_parsing_errors=True,
         )
         return agent_executor
@@ -53,7 +258,8 @@ def create_agent_with_tools(llm, tools: List[Tool]):
         logger.error(f"Error creating agent: {e}")
         return None
 
-def generate_career_insights(category: str, subcareer: str, llm: ChatGoogleGenerativeAI) -> str:
+@traced()
+def generate_career_insights(category: str, subcareer: str, llm: "ChatGoogleGenerativeAI") -> str:
     try:
         if llm is None:
             raise RuntimeError("LLM not initialized")
@@ -88,21 +294,43 @@ Replace the data values (0-100) based on the importance for this role: "{subcare
 """
 
         logger.info(f"Generating career insights for {subcareer}...")
-        output = llm.invoke(career_prompt)
-        return output.content if hasattr(output, 'content') else str(output)
+        return invoke_llm(llm, career_prompt, task="insights")
 
     except Exception as e:
         logger.error(f"Error generating career insights: {e}")
         return f"❌ Unable to generate career insights. Error: {e}"
 
-def generate_market_analysis(subcareer: str, llm: ChatGoogleGenerativeAI) -> str:
+@traced()
+def generate_market_analysis(subcareer: str, llm: "ChatGoogleGenerativeAI") -> str:
     try:
         if llm is None:
             raise RuntimeError("LLM not initialized")
 
+        # Retrieval first (parallel, cached searches), then exactly one generation call
+        context, sources = build_market_context(subcareer)
+        if context:
+            grounding = f"""Use ONLY the numbered search results below as evidence. Cite them inline as [n].
+If the results don't cover a point, say the data is unavailable rather than guessing.
+
+**Search results**:
+{context}
+"""
+        else:
+            logger.warning(f"No live search results for {subcareer}; generating without grounding")
+            grounding = "Live search results are unavailable right now. Give general, clearly-labelled estimates and say that they are not based on live data.\n"
+
+        # Measured salary distribution from collected postings beats model guesses
+        salaries = salary_context(subcareer)
+        if salaries:
+            grounding += f"""
+**Salary data**: {salaries}
+Base the salary ranges and the CHART_DATA values on these numbers (Entry ≈ p10, Mid ≈ median, Senior ≈ p75, Lead/Architect ≈ p90).
+"""
+
         market_prompt = f"""
-Search the web (live) and analyze the current job market in India for the role: "{subcareer}".
+Analyze the current job market in India for the role: "{subcareer}".
 
+{grounding}
 Please include:
 - Current job demand and hiring trends in India (last 12 months)
 - Typical salary ranges in INR (entry / mid / senior level)
@@ -110,10 +338,9 @@ Please include:
 - Major hiring cities in India (Bangalore, Mumbai, Delhi, Hyderabad, Pune, etc.)
 - Skills in highest demand for this role in India
 - Remote work availability and trends in India
-- Short list of sources (urls or site names) used
 
 Return a concise, well-structured markdown analysis with bullet points and a small summary table.
-Focus specifically on the Indian job market.
+Focus specifically on the Indian job market. Do not write a sources section; it is appended for you.
 
 CRITICAL: At the very end of your response, include a hidden JSON block (wrapped in <!-- CHART_DATA and -->) with precisely this structure for salary mapping:
 <!-- CHART_DATA
@@ -125,18 +352,23 @@ CRITICAL: At the very end of your response, include a hidden JSON block (wrapped
     "label": "Avg Salary Range (LPA)"
 }}
 -->
-Replace the values with realistic numbers (integers) based on your research.
+Replace the values with realistic numbers (integers) based on the search results.
 """
 
-        logger.info(f"Fetching live market data for {subcareer}...")
-        output = llm.invoke(market_prompt)
-        return output.content if hasattr(output, 'content') else str(output)
+        logger.info(f"Generating grounded market analysis for {subcareer} from {len(sources)} sources...")
+        report = invoke_llm(llm, market_prompt, task="market")
+        if sources:
+            report += "\n\n**Sources**\n" + "\n".join(
+                f"{src['n']}. [{src['title'] or src['link']}]({src['link']})" for src in sources if src["link"]
+            )
+        return report
 
     except Exception as e:
         logger.error(f"Error generating market analysis: {e}")
         return f"❌ Unable to fetch market analysis. Error: {e}"
 
-def generate_college_recommendations(subcareer: str, llm: ChatGoogleGenerativeAI) -> str:
+@traced()
+def generate_college_recommendations(subcareer: str, llm: "ChatGoogleGenerativeAI") -> str:
     try:
         if llm is None:
             raise RuntimeError("LLM not initialized")
@@ -192,24 +424,45 @@ Replace the data values with realistic average placement figures (in LPA) for th
 """
 
         logger.info(f"Generating college recommendations for {subcareer}...")
-        output = llm.invoke(college_prompt)
-        return output.content if hasattr(output, 'content') else str(output)
+        return invoke_llm(llm, college_prompt, task="colleges")
 
     except Exception as e:
         logger.error(f"Error generating college recommendations: {e}")
         return f"❌ Unable to generate college recommendations. Error: {e}"
 
-def generate_resume_feedback(resume_text: str, target_role: str, llm: ChatGoogleGenerativeAI) -> str:
+@traced()
+def generate_resume_feedback(resume_text: str, target_role: str, llm: "ChatGoogleGenerativeAI", use_cache: bool = True) -> str:
     try:
         if llm is None:
             raise RuntimeError("LLM not initialized")
 
+        use_cache = use_cache and Config.RESUME_CACHE_ENABLED
+        cache_key = make_key(
+            "resume_feedback",
+            normalize_whitespace(resume_text).casefold(),
+            (target_role or "").strip().casefold(),
+            RESUME_PROMPT_VERSION,
+        )
+        if use_cache:
+            cached = report_cache.get(cache_key)
+            current_span().set_attribute("cache.hit", cached is not None)
+            if cached is not None:
+                logger.info(f"Resume analysis cache hit for {target_role}")
+                return cached
+
+        # Keyword scan runs on the full text so trimmed sections still count
+        ats_report = match_resume(resume_text, target_role)
+        resume_text, _ = preprocess_resume(resume_text, Config.RESUME_TOKEN_BUDGET)
+
         resume_prompt = f"""
 As an expert resume coach, analyze the following resume for the target role: "{target_role}"
 
 **Resume Content**:
 {resume_text}
 
+**Deterministic ATS Keyword Scan** (computed locally; use these lists as-is for the ATS and skills-gap points instead of re-deriving them):
+{format_ats_report(ats_report)}
+
 Provide comprehensive feedback in the following structure:
 
 1) **Overall Assessment** (Score: X/10):
@@ -257,15 +510,21 @@ Be constructive, specific, and actionable. Use markdown formatting with clear se
 """
 
         logger.info(f"Analyzing resume for {target_role}...")
-        output = llm.invoke(resume_prompt)
-        return output.content if hasattr(output, 'content') else str(output)
+        result = invoke_llm(llm, resume_prompt, task="resume")
+        # A result cut short by the deadline is returned but never cached
+        if use_cache and not deadline.expired():
+            report_cache.set(cache_key, result, ttl=Config.RESUME_CACHE_TTL)
+        return result
 
     except Exception as e:
         logger.error(f"Error generating resume feedback: {e}")
         return f"❌ Unable to analyze resume. Error: {e}"
 
+@traced()
 def search_jobs(role: str, location: str = "India", api_key: str = None) -> List[dict]:
     try:
+        from serpapi import GoogleSearch # Direct import for structured job search
+
         if not api_key:
             logger.error("SerpAPI key is missing in search_jobs")
             return []
@@ -282,6 +541,9 @@ def search_jobs(role: str, location: str = "India", api_key: str = None) -> List
         for query_text in search_terms:
             if len(all_jobs) >= 10:
                 break
+            if deadline.expired():
+                logger.warning(f"Job search for {role} stopped at the deadline with {len(all_jobs)} results")
+                break
                 
             params = {
                 "engine": "google_jobs",
@@ -293,8 +555,12 @@ def search_jobs(role: str, location: str = "India", api_key: str = None) -> List
 
             logger.info(f"Attempting job search with query: {query_text}")
             try:
-                search = GoogleSearch(params)
-                results = search.get_dict()
+                with span("serpapi.search", "CLIENT", **{"serpapi.engine": "google_jobs", **user_input(**{"serpapi.query": query_text})}) as search_span:
+                    search = GoogleSearch(params)
+                    remaining = deadline.remaining()
+                    search.timeout = min(Config.SERPAPI_TIMEOUT, remaining) if remaining is not None else Config.SERPAPI_TIMEOUT
+                    results = search.get_dict()
+                    search_span.set_attribute("serpapi.results", len(results.get("jobs_results", [])))
                 
                 if "error" in results:
                     logger.error(f"SerpAPI Error for query '{query_text}': {results['error']}")
@@ -303,6 +569,7 @@ def search_jobs(role: str, location: str = "India", api_key: str = None) -> List
                 if "jobs_results" in results:
                     page_results = results["jobs_results"]
                     logger.info(f"Found {len(page_results)} results for query '{query_text}'")
+                    record_postings(role, page_results)
                     
                     for job in page_results:
                         # Deduplicate by title and company
@@ -0,0 +1,143 @@
+import re
+import time
+import threading
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+from backend.data.catalog import get_catalog
+from backend.data.skills_data import SKILL_ALIASES
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill keyword and alias.
+    Built once; each scan is a single pass over the resume text.
+    """
+
+    def __init__(self, terms: Dict[str, str]):
+        # Per state: transitions, failure link and (term_length, canonical, exact_case_term) outputs
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[list] = [[]]
+        for term, canonical in terms.items():
+            self._add(term, canonical)
+        self._build()
+
+    def _add(self, term: str, canonical: str) -> None:
+        state = 0
+        for ch in term.lower():
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        # Very short terms ("R", "Go", "ML") only count with their exact casing
+        exact = term if len(term) <= 2 else None
+        self._out[state].append((len(term), canonical, exact))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set:
+        lowered = text.lower()
+        # lower() can change length for a few scripts; exact-case checks need aligned indexes
+        aligned = len(lowered) == len(text)
+        size = len(lowered)
+        found = set()
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, canonical, exact in self._out[state]:
+                start = i - length + 1
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if i + 1 < size and lowered[i + 1].isalnum():
+                    continue
+                if exact and aligned and text[start:i + 1] != exact:
+                    continue
+                found.add(canonical)
+        return found
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+def get_skill_matcher() -> SkillMatcher:
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                start = time.perf_counter()
+                terms = {}
+                for role in get_catalog().roles:
+                    for skill in role["skills"]:
+                        terms[skill] = skill
+                for canonical, aliases in SKILL_ALIASES.items():
+                    for alias in aliases:
+                        terms.setdefault(alias, canonical)
+                _matcher = SkillMatcher(terms)
+                logger.info(f"Compiled ATS matcher: {len(terms)} keywords in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return _matcher
+
+def resolve_role(target_role: str) -> Optional[str]:
+    """Map a free-text target role onto the closest catalog role."""
+    if not target_role:
+        return None
+    catalog = get_catalog()
+    exact = catalog.get(target_role)
+    if exact:
+        return exact["name"]
+    wanted = target_role.strip().casefold()
+    roles = [role["name"] for role in catalog.roles]
+    wanted_words = set(_WORD_RE.findall(wanted))
+    best, best_score = None, 0.0
+    for role in roles:
+        words = set(_WORD_RE.findall(role.casefold()))
+        score = len(words & wanted_words) / len(words | wanted_words) if words else 0.0
+        if score > best_score:
+            best, best_score = role, score
+    return best if best_score >= 0.5 else None
+
+def match_resume(resume_text: str, target_role: str) -> dict:
+    start = time.perf_counter()
+    role = resolve_role(target_role)
+    found = get_skill_matcher().find(resume_text or "")
+    expected = get_catalog().get(role)["skills"] if role else []
+    matched = [skill for skill in expected if skill in found]
+    missing = [skill for skill in expected if skill not in found]
+    return {
+        "role": role,
+        "matched": matched,
+        "missing": missing,
+        "other_skills": sorted(found - set(expected)),
+        "coverage": round(100 * len(matched) / len(expected), 1) if expected else None,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+def format_ats_report(report: dict) -> str:
+    """Render a match_resume result as prompt context."""
+    if not report.get("role"):
+        found = ", ".join(report.get("other_skills", [])) or "none detected"
+        return f"- Skills detected: {found}\n- No catalog keyword list for this role; judge keyword fit yourself."
+    return (
+        f"- Reference role: {report['role']}\n"
+        f"- Matched keywords: {', '.join(report['matched']) or 'none'}\n"
+        f"- Missing keywords: {', '.join(report['missing']) or 'none'}\n"
+        f"- Keyword coverage: {report['coverage']}%"
+    )
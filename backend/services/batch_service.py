@@ -0,0 +1,133 @@
+import time
+import logging
+from collections import Counter
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Callable, Iterator, List, Optional, Tuple
+from backend.config import Config
+from backend.services import scheduler
+from backend.services.cache_service import report_cache
+from backend.services.ats_service import match_resume
+from backend.services.ai_service import generate_resume_feedback
+from backend.utils import deadline
+from backend.utils.file_utils import extract_text_from_bytes, text_cache_key
+from backend.utils.resume_utils import estimate_tokens
+from backend.utils.text_utils import as_markdown
+
+logger = logging.getLogger(__name__)
+
+# Anything shorter is almost certainly a failed extraction (scanned PDF, empty file)
+MIN_RESUME_CHARS = 100
+
+BUDGET_SPENT_ERROR = "Rate limit reached before this file's feedback; its local checks are included. Please retry later."
+
+def analyze_resume_batch(entries: List[Tuple[str, bytes]], target_role: str, llm,
+                         include_feedback: bool = True, use_cache: bool = True,
+                         charge_feedback: Optional[Callable[[], bool]] = None) -> Iterator[dict]:
+    """
+    Analyze many resumes. Text extraction runs in the process pool, LLM feedback
+    on the shared bounded upstream pool. Yields one event per resume in completion
+    order, then a summary event. charge_feedback() is called before each file's
+    LLM feedback is scheduled; once it returns False (the client's budget is
+    spent) the remaining files get their local checks and an error instead.
+    """
+    start = time.perf_counter()
+    use_cache = use_cache and Config.RESUME_CACHE_ENABLED
+    pending = {}
+    results = []
+
+    for index, (name, data) in enumerate(entries):
+        cached = report_cache.get(text_cache_key(name, data)) if use_cache else None
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+        else:
+            future = scheduler.submit_cpu(extract_text_from_bytes, name, data)
+        pending[future] = ("extract", index, name, data)
+
+    try:
+        yield from _drain(pending, results, target_role, llm, include_feedback, use_cache, charge_feedback)
+    finally:
+        # Deadline hit or client gone: don't start work nobody will read
+        for future in pending:
+            future.cancel()
+
+    yield _summarize(results, time.perf_counter() - start)
+
+def _drain(pending, results, target_role, llm, include_feedback, use_cache, charge_feedback):
+    budget_spent = False
+    while pending:
+        done, _ = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+        if not done:
+            logger.warning(f"Batch deadline reached with {len(pending)} resumes unfinished")
+            for future, (stage, index, name, payload) in list(pending.items()):
+                future.cancel()
+                event = payload if stage == "feedback" else {"event": "result", "index": index, "file": name}
+                event.pop("_text", None)
+                event.update(status="error", error="Not finished before the request deadline")
+                results.append(event)
+                yield event
+            pending.clear()
+            return
+        for future in done:
+            stage, index, name, payload = pending.pop(future)
+            if stage == "extract":
+                event = _after_extract(future, index, name, payload, target_role, use_cache)
+                if event["status"] == "ok" and include_feedback:
+                    if not budget_spent and charge_feedback is not None:
+                        budget_spent = not charge_feedback()
+                    if budget_spent:
+                        event.update(status="error", error=BUDGET_SPENT_ERROR)
+                    else:
+                        feedback = scheduler.submit(generate_resume_feedback, event.pop("_text"), target_role, llm, use_cache)
+                        pending[feedback] = ("feedback", index, name, event)
+                        continue
+                event.pop("_text", None)
+            else:
+                event = payload
+                try:
+                    event["feedback"] = as_markdown(future.result())
+                    if event["feedback"].startswith("❌"):
+                        event["status"] = "error"
+                        event["error"] = event.pop("feedback")
+                except Exception as e:
+                    logger.error(f"Batch feedback failed for {name}: {e}")
+                    event["status"] = "error"
+                    event["error"] = str(e)
+            results.append(event)
+            yield event
+
+def _after_extract(future, index, name, data, target_role, use_cache):
+    event = {"event": "result", "index": index, "file": name}
+    try:
+        text = future.result()
+    except Exception as e:
+        logger.warning(f"Batch extraction failed for {name}: {e}")
+        return {**event, "status": "error", "error": f"Could not read file: {e}"}
+
+    if use_cache and text:
+        report_cache.set(text_cache_key(name, data), text, ttl=Config.RESUME_CACHE_TTL)
+    if len(text) < MIN_RESUME_CHARS:
+        return {**event, "status": "rejected", "error": "Too little text extracted (scanned or empty file?)"}
+
+    return {
+        **event,
+        "status": "ok",
+        "tokens": estimate_tokens(text),
+        "ats": match_resume(text, target_role),
+        "_text": text,
+    }
+
+def _summarize(results, elapsed):
+    statuses = Counter(r["status"] for r in results)
+    coverages = [r["ats"]["coverage"] for r in results if r.get("ats") and r["ats"]["coverage"] is not None]
+    missing = Counter(kw for r in results if r.get("ats") for kw in r["ats"]["missing"])
+    return {
+        "event": "summary",
+        "total": len(results),
+        "ok": statuses.get("ok", 0),
+        "rejected": statuses.get("rejected", 0),
+        "errors": statuses.get("error", 0),
+        "average_coverage": round(sum(coverages) / len(coverages), 1) if coverages else None,
+        "top_missing_keywords": missing.most_common(10),
+        "elapsed_ms": round(elapsed * 1000, 1),
+    }
@@ -0,0 +1,149 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from backend.config import Config
+from backend.services.report_store import create_report_store
+
+
+def make_key(namespace: str, *parts) -> str:
+    """
+    Build a stable cache key from a namespace and any number of parts.
+    Parts are hashed so keys never carry raw (possibly personal) content.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f"{namespace}:{digest.hexdigest()}"
+
+
+class _Stored:
+    """Placeholder for a text value kept in the report store."""
+    __slots__ = ("digest",)
+
+    def __init__(self, digest: str):
+        self.digest = digest
+
+
+class ReportCache:
+    """
+    Thread-safe in-process cache with per-entry TTL and LRU eviction.
+    With a ReportStore, large text values are kept deduplicated and
+    compressed there instead of in the entries themselves.
+    """
+
+    def __init__(self, max_entries: int = 512, default_ttl: int = 3600, store=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.store = store
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _release(self, entry) -> None:
+        if isinstance(entry[0], _Stored):
+            self.store.release(entry[0].digest)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, created_at) for a live entry, or None."""
+        entry = self.lookup(key, allow_stale=False)
+        return entry[:2] if entry else None
+
+    def lookup(self, key: str, allow_stale: bool = True) -> Optional[Tuple[Any, float, bool]]:
+        """
+        Return (value, created_at, stale). An expired entry set with a stale_ttl
+        is still returned (stale=True) until that window passes, so callers can
+        serve it while they refresh it.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, created_at, stale_until = entry
+            stale = expires_at <= now
+            if stale and stale_until <= now:
+                del self._entries[key]
+                self._release(entry)
+            if stale and (stale_until <= now or not allow_stale):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        if isinstance(value, _Stored):
+            value = self.store.get(value.digest)
+            if value is None:
+                # Released by a concurrent overwrite or eviction
+                return None
+        return value, created_at, stale
+
+    def contains(self, key: str) -> bool:
+        """Whether a live entry exists, without counting a hit/miss or refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.time()
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until the entry expires (negative while stale), or None if it is gone."""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.time()
+            if entry is None or entry[3] <= now:
+                return None
+            return entry[1] - now
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, stale_ttl: int = 0) -> float:
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        if ttl <= 0:
+            return now
+        if self.store is not None and isinstance(value, str) and len(value) >= Config.REPORT_STORE_MIN_BYTES:
+            # Compress outside the cache lock
+            value = _Stored(self.store.put(value))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._release(old)
+            self._entries[key] = (value, now + ttl, now, now + ttl + max(stale_ttl, 0))
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._release(evicted)
+        return now
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._release(entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                self._release(entry)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+        if self.store is not None:
+            stats["store"] = self.store.stats()
+        return stats
+
+
+# Shared cache for generated reports and derived inputs
+report_cache = ReportCache(
+    max_entries=Config.REPORT_CACHE_MAX_ENTRIES,
+    default_ttl=Config.REPORT_CACHE_TTL,
+    store=create_report_store(),
+)
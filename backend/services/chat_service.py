@@ -0,0 +1,185 @@
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Tuple
+from backend.config import Config
+from backend.services import scheduler
+from backend.services.ai_service import live_output, run_agent
+from backend.utils import deadline
+from backend.utils.text_utils import as_markdown
+
+logger = logging.getLogger(__name__)
+
+# Turns of earlier conversation handed to the agent with each new message
+CONTEXT_TURNS = 6
+
+class Conversation:
+    """
+    One chat channel: the browser keeps an event stream open for it and
+    posts messages separately. Events are numbered and buffered, so a
+    reconnecting EventSource resumes from Last-Event-ID without gaps.
+    Conversations live in the process that created them.
+    """
+
+    def __init__(self, history: Optional[List[Tuple[str, str]]] = None):
+        self.id = uuid.uuid4().hex
+        self.history: List[Tuple[str, str]] = list(history or [])[-2 * CONTEXT_TURNS:]
+        self.subscribers = 0
+        self.closed = False
+        self.last_seen = time.monotonic()
+        self._events = deque(maxlen=Config.CHAT_EVENT_BUFFER)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._task: Optional[Future] = None
+        self._deadline: Optional[deadline.Deadline] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def publish(self, event: str, data: dict) -> None:
+        with self._cond:
+            self._seq += 1
+            self._events.append((self._seq, event, data))
+            self._cond.notify_all()
+
+    def wait(self, after: int, timeout: float) -> list:
+        """Events newer than `after`, waiting up to `timeout` seconds for one."""
+        with self._cond:
+            if self._seq <= after:
+                self._cond.wait(timeout)
+            return [e for e in self._events if e[0] > after]
+
+    def send(self, agent, message: str) -> bool:
+        """Start answering a message on the upstream pool; False if one is already running."""
+        with self._cond:
+            if self.busy:
+                return False
+            self._deadline = deadline.current()
+            self._task = scheduler.submit_interactive(self._answer, agent, message)
+        self.last_seen = time.monotonic()
+        return True
+
+    def cancel(self) -> None:
+        if self.busy and self._deadline is not None:
+            logger.info(f"Cancelling chat answer in conversation {self.id}")
+            self._deadline.cancel()
+
+    def close(self) -> None:
+        """Cancel any answer in progress and end the conversation's event streams."""
+        self.cancel()
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def _relay(self, kind: str, payload) -> None:
+        if kind == "token":
+            self.publish("token", {"text": payload})
+        else:
+            self.publish(kind, payload)
+
+    def _answer(self, agent, message: str) -> None:
+        self.publish("status", {"state": "thinking"})
+        prompt = message
+        if self.history:
+            context = "\n".join(f"{role}: {text[:500]}" for role, text in self.history[-CONTEXT_TURNS:])
+            prompt = f"Conversation so far:\n{context}\n\nUser question: {message}"
+        try:
+            with live_output(self._relay):
+                answer = as_markdown(run_agent(agent, prompt))
+        except Exception as e:
+            logger.error(f"Chat answer failed in conversation {self.id}: {e}")
+            self.publish("error", {"error": str(e)})
+            return
+        if self._deadline is not None and self._deadline.cancelled:
+            logger.info(f"Chat answer in conversation {self.id} abandoned by the client")
+            return
+        self.history.extend((("user", message), ("assistant", answer)))
+        del self.history[:-2 * CONTEXT_TURNS]
+        self.publish("done", {"answer": answer})
+
+_conversations: Dict[str, Conversation] = {}
+_streams = 0
+_lock = threading.Lock()
+
+def _sweep_idle() -> None:
+    now = time.monotonic()
+    for cid, conv in list(_conversations.items()):
+        if conv.subscribers == 0 and not conv.busy and now - conv.last_seen > Config.CHAT_IDLE_TIMEOUT:
+            del _conversations[cid]
+            conv.close()
+
+def create_conversation(history: Optional[List[Tuple[str, str]]] = None) -> Conversation:
+    """A new conversation, optionally continuing earlier (role, text) turns the client still shows."""
+    conv = Conversation(history)
+    with _lock:
+        _sweep_idle()
+        _conversations[conv.id] = conv
+    return conv
+
+def get_conversation(conversation_id: str) -> Optional[Conversation]:
+    return _conversations.get(conversation_id)
+
+def close_conversation(conversation_id: str) -> bool:
+    with _lock:
+        conv = _conversations.pop(conversation_id, None)
+    if conv is None:
+        return False
+    conv.close()
+    return True
+
+def open_streams() -> int:
+    """Event streams open in this process; each one holds a server thread."""
+    return _streams
+
+def _format(seq: Optional[int], event: str, data: dict) -> str:
+    head = f"id: {seq}\n" if seq is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _orphan_check(conv: Conversation) -> None:
+    # No client came back within the grace period: stop paying for the answer
+    if conv.subscribers == 0:
+        conv.cancel()
+
+def stream_events(conv: Conversation, last_event_id: Optional[int] = None) -> Iterator[str]:
+    """
+    Server-sent events for a conversation: "ready", then "status", "step",
+    "observation", "token", "done" or "error" as the agent works, with
+    comment heartbeats in between. When the client goes away (the server
+    closes this generator) the running answer is cancelled unless the client
+    reconnects within CHAT_RECONNECT_GRACE seconds. The stream ends when the
+    conversation is closed, and between answers once it is CHAT_STREAM_MAX_AGE
+    seconds old, so threads held by vanished clients are freed; a live
+    EventSource reconnects and resumes from Last-Event-ID.
+    """
+    global _streams
+    with _lock:
+        conv.subscribers += 1
+        _streams += 1
+    cursor = last_event_id or 0
+    opened = time.monotonic()
+    try:
+        yield "retry: 2000\n" + _format(None, "ready", {"conversation_id": conv.id, "busy": conv.busy})
+        while not conv.closed:
+            events = conv.wait(cursor, Config.CHAT_HEARTBEAT)
+            conv.last_seen = time.monotonic()
+            if not events:
+                if not conv.busy and conv.last_seen - opened > Config.CHAT_STREAM_MAX_AGE:
+                    break
+                yield ": ping\n\n"
+                continue
+            for seq, event, data in events:
+                cursor = seq
+                yield _format(seq, event, data)
+    finally:
+        with _lock:
+            conv.subscribers -= 1
+            _streams -= 1
+        if conv.subscribers == 0 and conv.busy:
+            timer = threading.Timer(Config.CHAT_RECONNECT_GRACE, _orphan_check, args=(conv,))
+            timer.daemon = True
+            timer.start()
@@ -0,0 +1,201 @@
+import re
+import json
+import time
+import logging
+from concurrent.futures import TimeoutError, wait
+from typing import Dict, List, Optional
+from backend.config import Config
+from backend.data.catalog import get_catalog
+from backend.services import scheduler
+from backend.services.ai_service import invoke_llm
+from backend.services.cache_service import report_cache, make_key
+from backend.services.report_service import get_report, report_key
+from backend.services.salary_service import salary_stats
+from backend.utils import deadline
+from backend.utils.text_utils import as_markdown
+from backend.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the summary prompt changes so cached verdicts are not reused
+COMPARE_PROMPT_VERSION = "1"
+
+# Reports a comparison is built from
+COMPARE_KINDS = ("insights", "market")
+
+SALARY_LEVELS = ["Entry Level", "Mid Level", "Senior Level", "Lead/Architect"]
+
+_CHART_RE = re.compile(r"<!--\s*CHART_DATA\s*(\{.*?\})\s*-->", re.DOTALL)
+
+def parse_chart(report: str) -> Optional[dict]:
+    """The CHART_DATA block of a report as {"labels", "data", ...}, or None if absent or malformed."""
+    match = _CHART_RE.search(report or "")
+    if not match:
+        return None
+    try:
+        chart = json.loads(match.group(1))
+        labels, data = chart["labels"], [float(v) for v in chart["data"]]
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(labels, list) or len(labels) != len(data):
+        return None
+    return {**chart, "labels": [str(l) for l in labels], "data": data}
+
+def _resolve(role: str) -> dict:
+    entry = get_catalog().get(role)
+    if entry:
+        return {"name": entry["name"], "category": entry["category"], "skills": entry.get("skills", [])}
+    return {"name": " ".join(role.split()), "category": "", "skills": []}
+
+def resolve_roles(roles: List[str]) -> List[dict]:
+    """Catalog entries for the requested roles, deduplicated; ValueError if fewer than two remain."""
+    resolved, seen = [], set()
+    for role in roles:
+        r = _resolve(role)
+        if r["name"].casefold() not in seen:
+            seen.add(r["name"].casefold())
+            resolved.append(r)
+    if len(resolved) < 2:
+        raise ValueError("Give at least two different roles to compare")
+    return resolved
+
+def uncached_reports(roles: List[dict]) -> List[tuple]:
+    """(role name, kind) pairs a comparison of these resolved roles would have to generate."""
+    return [(role["name"], kind) for role in roles for kind in COMPARE_KINDS
+            if not report_cache.contains(report_key(kind, role["name"], role["category"]))]
+
+def _gather(roles: List[dict], llm) -> Dict[tuple, dict]:
+    """Every (role, kind) report: cache hits read inline, the rest generated concurrently."""
+    reports, futures = {}, {}
+    for role in roles:
+        for kind in COMPARE_KINDS:
+            if report_cache.contains(report_key(kind, role["name"], role["category"])):
+                reports[(role["name"], kind)] = get_report(kind, llm, role["name"], role["category"])
+            else:
+                futures[scheduler.submit_interactive(get_report, kind, llm, role["name"], role["category"])] = (role["name"], kind)
+    if futures:
+        logger.info(f"Comparison needs {len(futures)} uncached reports")
+        done, not_done = wait(futures, timeout=deadline.remaining())
+        for future in not_done:
+            future.cancel()
+        for future, slot in futures.items():
+            try:
+                if future not in done:
+                    raise TimeoutError("not finished before the request deadline")
+                reports[slot] = future.result()
+            except Exception as e:
+                logger.error(f"Comparison report {slot[1]} failed for {slot[0]}: {e}")
+                reports[slot] = {"result": f"❌ {e}", "created_at": time.time(), "cached": False, "error": True}
+    return reports
+
+def _merge(charts: List[Optional[dict]], names: List[str], labels: Optional[List[str]] = None) -> Optional[dict]:
+    """One multi-dataset chart from per-role charts, aligned by label (None where a role has no value)."""
+    present = [c for c in charts if c]
+    if not present:
+        return None
+    if labels is None:
+        labels = []
+        for chart in present:
+            labels += [l for l in chart["labels"] if l not in labels]
+    datasets = []
+    for name, chart in zip(names, charts):
+        values = dict(zip((l.casefold() for l in chart["labels"]), chart["data"])) if chart else {}
+        datasets.append({"label": name, "data": [values.get(l.casefold()) for l in labels]})
+    return {"type": present[0].get("type", "bar"), "labels": labels, "datasets": datasets,
+            "label": present[0].get("label", ""), "unit": present[0].get("unit")}
+
+def _table(roles: List[dict], radar: Optional[dict], salary: Optional[dict], observed: List[Optional[dict]]) -> dict:
+    names = [r["name"] for r in roles]
+    skill_sets = [set(s.casefold() for s in r["skills"]) for r in roles]
+    shared = set.intersection(*skill_sets) if all(skill_sets) else set()
+
+    rows = [{"label": "Category", "values": [r["category"] or None for r in roles]}]
+    if salary:
+        for i, level in enumerate(salary["labels"]):
+            rows.append({"label": f"{level} salary (LPA)", "values": [d["data"][i] for d in salary["datasets"]]})
+    rows.append({"label": "Observed median salary (LPA)",
+                 "values": [f"{s['percentiles']['p50']} (n={s['count']})" if s else None for s in observed]})
+    if radar:
+        for i, dimension in enumerate(radar["labels"]):
+            rows.append({"label": f"{dimension} (0-100)", "values": [d["data"][i] for d in radar["datasets"]]})
+    rows.append({"label": "Distinctive skills",
+                 "values": [", ".join(s for s in r["skills"] if s.casefold() not in shared) or None for r in roles]})
+    return {"columns": names, "rows": rows,
+            "shared_skills": [s for s in roles[0]["skills"] if s.casefold() in shared]}
+
+def table_markdown(table: dict) -> str:
+    def cell(value):
+        if value is None:
+            return "—"
+        return f"{value:g}" if isinstance(value, float) else str(value)
+
+    lines = ["| | " + " | ".join(table["columns"]) + " |", "|---" * (len(table["columns"]) + 1) + "|"]
+    lines += ["| " + row["label"] + " | " + " | ".join(cell(v) for v in row["values"]) + " |" for row in table["rows"]]
+    if table["shared_skills"]:
+        lines.append(f"\n**Shared skills**: {', '.join(table['shared_skills'])}")
+    return "\n".join(lines)
+
+def _summarize(llm, names: List[str], markdown: str, sources_at: List[float]) -> Optional[str]:
+    """One short LLM verdict over the table, cached until any underlying report is regenerated."""
+    key = make_key("compare", COMPARE_PROMPT_VERSION, [n.casefold() for n in names], [round(t) for t in sources_at])
+    cached = report_cache.get(key)
+    if cached is not None:
+        return cached
+    prompt = f"""
+Compare these careers for a student or professional in India: {", ".join(names)}.
+
+{markdown}
+
+Using only the table above, write at most 150 words of markdown: one line on who each role suits,
+the key trade-off (pay, skills, entry difficulty), and a one-sentence verdict. No tables, no headings.
+"""
+    summary = as_markdown(invoke_llm(llm, prompt, task="compare"))
+    if summary.startswith("❌") or deadline.expired():
+        return summary
+    report_cache.set(key, summary)
+    return summary
+
+def compare_roles(roles: List[dict], llm, summary: bool = True) -> dict:
+    """
+    Side-by-side comparison of N roles (from resolve_roles) built from their
+    cached insights and market reports (generating missing ones concurrently):
+    a table, merged radar and salary charts, measured salary stats, and
+    optionally a short LLM verdict.
+    """
+    start = time.perf_counter()
+    names = [r["name"] for r in roles]
+
+    with span("compare.gather", **{"compare.roles": len(names)}) as s:
+        reports = _gather(roles, llm)
+        s.set_attribute("compare.cached", sum(1 for rep in reports.values() if rep["cached"]))
+
+    radar = _merge([parse_chart(reports[(n, "insights")]["result"]) for n in names], names)
+    salary = _merge([parse_chart(reports[(n, "market")]["result"]) for n in names], names, SALARY_LEVELS)
+    observed = []
+    for name in names:
+        stats = salary_stats(name)
+        observed.append(stats if stats and stats["count"] >= Config.SALARY_MIN_SAMPLES else None)
+    table = _table(roles, radar, salary, observed)
+    markdown = table_markdown(table)
+
+    errors = [f"{kind} report for {name}" for (name, kind), rep in reports.items() if rep["error"]]
+    sources_at = [reports[(n, kind)]["created_at"] for n in names for kind in COMPARE_KINDS]
+    verdict = None
+    if summary and not errors and llm is not None:
+        try:
+            verdict = _summarize(llm, names, markdown, sources_at)
+        except Exception as e:
+            logger.error(f"Comparison summary failed for {names}: {e}")
+
+    return {
+        "roles": [{"name": r["name"], "category": r["category"],
+                   "cached": all(reports[(r["name"], kind)]["cached"] for kind in COMPARE_KINDS)} for r in roles],
+        "table": table,
+        "markdown": markdown,
+        "charts": {"radar": radar, "salary": salary},
+        "salaries": {name: stats for name, stats in zip(names, observed)},
+        "summary": verdict,
+        "errors": errors,
+        "created_at": max(sources_at),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1,52 @@
+import time
+import logging
+import threading
+from backend.config import Config
+from backend.services.ai_service import initialize_llm_and_tools, create_agent_with_tools
+
+logger = logging.getLogger(__name__)
+
+# Built once per process on first use (or by warmup()), then shared by all requests
+_llm = None
+_agent = None
+_lock = threading.Lock()
+_state = {"status": "cold", "started_at": None, "ready_at": None, "error": None}
+
+def get_ai_components():
+    global _llm, _agent
+    if _llm is None:
+        with _lock:
+            if _llm is None:
+                if _state["status"] != "warming":
+                    _state.update(status="warming", started_at=time.time())
+                if not Config.GOOGLE_API_KEY:
+                    logger.error("GOOGLE_API_KEY is missing in Config")
+                if not Config.SERPAPI_KEY:
+                    logger.error("SERPAPI_KEY is missing in Config")
+
+                start = time.perf_counter()
+                llm, tools = initialize_llm_and_tools(Config.GOOGLE_API_KEY, Config.SERPAPI_KEY)
+                agent = create_agent_with_tools(llm, tools) if llm and tools else None
+                if llm and agent:
+                    _llm, _agent = llm, agent
+                    _state.update(status="ready", ready_at=time.time(), error=None)
+                    logger.info(f"AI components ready in {time.perf_counter() - start:.2f}s")
+                else:
+                    _state.update(status="failed", error="Could not initialize LLM/agent; check API keys")
+    return _llm, _agent
+
+def warmup(background: bool = True):
+    """Load the heavy SDKs and build the LLM/agent ahead of the first request."""
+    if _llm is not None or _state["status"] == "warming":
+        return
+    if background:
+        _state.update(status="warming", started_at=time.time())
+        threading.Thread(target=get_ai_components, name="ai-warmup", daemon=True).start()
+    else:
+        get_ai_components()
+
+def is_ready() -> bool:
+    return _llm is not None and _agent is not None
+
+def status() -> dict:
+    return dict(_state)
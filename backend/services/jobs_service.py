@@ -0,0 +1,34 @@
+import logging
+from typing import List
+from backend.config import Config
+from backend.services import refresh_service
+from backend.services.ai_service import search_jobs
+from backend.services.cache_service import report_cache, make_key
+from backend.utils import deadline
+
+logger = logging.getLogger(__name__)
+
+def jobs_key(role: str, location: str) -> str:
+    return make_key("jobs", " ".join(role.split()).casefold(), " ".join(location.split()).casefold())
+
+def get_jobs(role: str, location: str = "India", refresh: bool = False) -> List[dict]:
+    """
+    Job postings for a role, cached for JOBS_CACHE_TTL. Past that they are
+    still served for JOBS_STALE_TTL while a background refresh fetches new
+    ones. refresh=True (the refresher itself) always searches.
+    """
+    key = jobs_key(role, location)
+    if not refresh:
+        refresh_service.record_access(key, ("jobs", role, location))
+        entry = report_cache.lookup(key)
+        if entry is not None:
+            jobs, _, stale = entry
+            if stale:
+                refresh_service.schedule_refresh(key, ("jobs", role, location))
+            return jobs
+
+    jobs = search_jobs(role, location, Config.SERPAPI_KEY)
+    # Empty results are usually a failed search; a search cut short by the deadline is incomplete
+    if jobs and not deadline.expired():
+        report_cache.set(key, jobs, ttl=Config.JOBS_CACHE_TTL, stale_ttl=Config.JOBS_STALE_TTL)
+    return jobs
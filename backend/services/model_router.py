@@ -0,0 +1,245 @@
+import os
+import copy
+import json
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Tuple
+from backend.config import Config
+from backend.utils import deadline
+from backend.utils.resume_utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Expected answer length per task, in tokens (reports run long; a chat turn is an agent run,
+# whose thoughts and tool calls over several steps come on top of the answer)
+TASK_OUTPUT_TOKENS = {"insights": 1800, "market": 1400, "colleges": 2200, "resume": 1800, "chat": 1200, "compare": 300}
+DEFAULT_OUTPUT_TOKENS = 800
+
+# Latency priors for a model with no observations yet
+DEFAULT_TTFT, DEFAULT_TPS = 1.5, 60.0
+EWMA_ALPHA = 0.3
+
+@dataclass
+class Tier:
+    model: str
+    input_price: float   # USD per 1M input tokens
+    output_price: float  # USD per 1M output tokens
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1e6
+
+@dataclass
+class Decision:
+    task: str
+    model: str
+    reason: str
+    input_tokens: int
+    output_tokens: int
+    estimated_s: float
+    remaining_s: Optional[float]
+    fallbacks: List[str] = field(default_factory=list)
+
+def parse_tiers(spec: str) -> List[Tier]:
+    """"model=<in>/<out>,..." (USD per 1M tokens), cheapest first."""
+    tiers = []
+    for item in spec.split(","):
+        name, _, prices = item.strip().partition("=")
+        if not name:
+            continue
+        try:
+            input_price, output_price = (float(p) for p in prices.split("/"))
+        except ValueError:
+            input_price = output_price = 0.0
+        tiers.append(Tier(name.strip(), input_price, output_price))
+    return tiers
+
+def _empty_stats() -> dict:
+    return {"calls": 0, "errors": 0, "fallbacks": 0, "latency_s": 0.0,
+            "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "tasks": {}}
+
+class ModelRouter:
+    """
+    Picks a model tier per LLM call from the task, the estimated input and
+    output size, and each model's observed latency (EWMA of time to first
+    token and tokens per second). Failed models cool down and calls fall
+    back to a neighbouring tier. Every attempt is recorded for review.
+    """
+
+    def __init__(self, tiers: List[Tier], routes: Dict[str, str], default_model: str, log_path: Optional[str] = None):
+        self.tiers = tiers
+        self.routes = routes
+        self.default_model = default_model
+        self.log_path = log_path
+        self._index = {t.model: i for i, t in enumerate(tiers)}
+        self._latency: Dict[str, Tuple[float, float]] = {}  # model -> (ttft, tokens/s)
+        self._cooldown: Dict[str, float] = {}               # model -> monotonic time it is usable again
+        self._stats: Dict[str, dict] = {}
+        self._recent = deque(maxlen=50)
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def estimate(self, model: str, output_tokens: int) -> float:
+        ttft, tps = self._latency.get(model, (DEFAULT_TTFT, DEFAULT_TPS))
+        return ttft + output_tokens / tps
+
+    def _available(self, model: str) -> bool:
+        return self._cooldown.get(model, 0.0) <= time.monotonic()
+
+    def choose(self, task: str, prompt: str, output_tokens: Optional[int] = None) -> Decision:
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = output_tokens or TASK_OUTPUT_TOKENS.get(task, DEFAULT_OUTPUT_TOKENS)
+        remaining = deadline.remaining()
+        preferred = self.routes.get(task, self.default_model)
+        if preferred not in self._index:
+            preferred = self.default_model if self.default_model in self._index else self.tiers[0].model
+        model, reason = preferred, "route"
+
+        # Short question, short answer: the cheapest tier is good enough
+        if output_tokens <= Config.LLM_SMALL_OUTPUT_TOKENS and input_tokens <= Config.LLM_SMALL_INPUT_TOKENS:
+            model, reason = self.tiers[0].model, "small"
+
+        if not self._available(model):
+            ready = [m for m in self._neighbours(model) if self._available(m)]
+            if ready:
+                model, reason = ready[0], "cooldown"
+
+        # Not enough time left for this model: cheapest tier expected to finish, else the fastest.
+        # Only once the model has been observed; the shared prior says nothing about a tier's speed.
+        budget = remaining * 0.8 if remaining is not None else None
+        if budget is not None and model in self._latency and self.estimate(model, output_tokens) > budget:
+            candidates = [t.model for t in self.tiers if self._available(t.model)] or [model]
+            fitting = [m for m in candidates if self.estimate(m, output_tokens) <= budget]
+            model = fitting[0] if fitting else min(candidates, key=lambda m: self.estimate(m, output_tokens))
+            reason = "deadline"
+
+        fallbacks = [m for m in self._neighbours(model) if self._available(m)][:Config.LLM_FALLBACK_ATTEMPTS]
+        return Decision(task, model, reason, input_tokens, output_tokens,
+                        round(self.estimate(model, output_tokens), 2),
+                        round(remaining, 2) if remaining is not None else None, fallbacks)
+
+    def _neighbours(self, model: str) -> List[str]:
+        """Other tiers, nearest first; the cheaper one wins a tie."""
+        i = self._index.get(model, 0)
+        others = [t.model for t in self.tiers if t.model != model]
+        return sorted(others, key=lambda m: (abs(self._index[m] - i), self._index[m] > i))
+
+    def record(self, decision: Decision, model: str, attempt: int, ok: bool, latency: float,
+               ttft: Optional[float], output_tokens: int, error: Optional[str] = None,
+               single_call: bool = True) -> None:
+        """
+        Feed an attempt's outcome back into the latency model, stats and decision
+        log. single_call=False (an agent run: several LLM calls plus tool time)
+        is counted in the stats but kept out of the latency model.
+        """
+        tier = self.tiers[self._index[model]] if model in self._index else Tier(model, 0.0, 0.0)
+        cost = tier.cost(decision.input_tokens, output_tokens)
+        with self._lock:
+            if ok and single_call:
+                prev_ttft, prev_tps = self._latency.get(model, (DEFAULT_TTFT, DEFAULT_TPS))
+                first = ttft if ttft is not None else min(prev_ttft, latency)
+                tps = output_tokens / max(latency - first, 0.05) if output_tokens else prev_tps
+                self._latency[model] = (prev_ttft + EWMA_ALPHA * (first - prev_ttft),
+                                        prev_tps + EWMA_ALPHA * (tps - prev_tps))
+            elif not ok:
+                self._cooldown[model] = time.monotonic() + Config.LLM_TIER_COOLDOWN
+            stats = self._stats.setdefault(model, _empty_stats())
+            stats["calls"] += 1
+            stats["errors"] += 0 if ok else 1
+            stats["fallbacks"] += 1 if attempt else 0
+            stats["latency_s"] += latency
+            stats["input_tokens"] += decision.input_tokens
+            stats["output_tokens"] += output_tokens
+            stats["cost_usd"] += cost
+            stats["tasks"][decision.task] = stats["tasks"].get(decision.task, 0) + 1
+            entry = {**asdict(decision), "ts": time.time(), "used": model, "attempt": attempt, "ok": ok,
+                     "latency_s": round(latency, 3), "ttft_s": round(ttft, 3) if ttft is not None else None,
+                     "actual_output_tokens": output_tokens, "cost_usd": round(cost, 6), "error": error}
+            self._recent.append(entry)
+        if self.log_path:
+            self._write_log(entry)
+
+    def _write_log(self, entry: dict) -> None:
+        """Append one decision to the log, rotating it to .1 past LLM_ROUTING_LOG_MAX_BYTES."""
+        line = json.dumps(entry) + "\n"
+        with self._log_lock:
+            try:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > Config.LLM_ROUTING_LOG_MAX_BYTES:
+                    os.replace(self.log_path, f"{self.log_path}.1")
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                logger.warning(f"Could not write routing log {self.log_path}: {e}")
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            models = {}
+            for tier in self.tiers:
+                s = dict(self._stats.get(tier.model) or _empty_stats())
+                ttft, tps = self._latency.get(tier.model, (DEFAULT_TTFT, DEFAULT_TPS))
+                calls = s["calls"]
+                s.update(
+                    cost_usd=round(s["cost_usd"], 6),
+                    latency_s=round(s["latency_s"] / calls, 3) if calls else None,
+                    error_rate=round(s["errors"] / calls, 3) if calls else None,
+                    price_per_1m={"input": tier.input_price, "output": tier.output_price},
+                    ttft_ewma_s=round(ttft, 3), tokens_per_s_ewma=round(tps, 1),
+                    cooling_down_s=round(max(0.0, self._cooldown.get(tier.model, 0.0) - now), 1),
+                )
+                models[tier.model] = s
+            return {"enabled": Config.LLM_ROUTING_ENABLED, "default_model": self.default_model,
+                    "routes": self.routes, "models": models, "recent": list(self._recent)[-20:]}
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+def get_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                routes = dict(item.strip().split("=", 1) for item in Config.LLM_ROUTES.split(",") if "=" in item)
+                _router = ModelRouter(parse_tiers(Config.LLM_MODEL_TIERS), routes,
+                                      Config.LLM_DEFAULT_MODEL, Config.LLM_ROUTING_LOG)
+    return _router
+
+_variants: Dict[Tuple[int, str], object] = {}
+
+def model_variant(llm, model: str):
+    """The same chat model client pointed at another model name (the Gemini client is model-agnostic)."""
+    current = getattr(llm, "model", None)
+    if current is None or not hasattr(llm, "copy") or current.split("/")[-1] == model:
+        return llm
+    key = (id(llm), model)
+    if key not in _variants:
+        # Shallow copy with its own field dict: pydantic's copy() would drop the excluded client/callbacks
+        variant = copy.copy(llm)
+        object.__setattr__(variant, "__dict__", {**llm.__dict__, "model": f"models/{model}"})
+        _variants[key] = variant
+    return _variants[key]
+
+def agent_variant(agent, model: str):
+    """The ReAct agent running on another model; the original when it has no LLM chain to swap."""
+    chain = getattr(getattr(agent, "agent", None), "llm_chain", None)
+    llm = model_variant(chain.llm, model) if chain is not None else None
+    if llm is None or llm is chain.llm:
+        return agent
+    key = (id(agent), model)
+    if key not in _variants:
+        _variants[key] = agent.copy(update={"agent": agent.agent.copy(update={"llm_chain": chain.copy(update={"llm": llm})})})
+    return _variants[key]
+
+def agent_prompt(agent, message: str) -> str:
+    """The prompt the agent's first LLM call sees (instructions and tool descriptions included)."""
+    prompt = getattr(getattr(getattr(agent, "agent", None), "llm_chain", None), "prompt", None)
+    try:
+        return prompt.format(input=message, agent_scratchpad="")
+    except Exception:
+        return message
+
+def routing_stats() -> dict:
+    return get_router().stats()
@@ -0,0 +1,161 @@
+import time
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+from backend.config import Config
+from backend.services import scheduler
+from backend.services.cache_service import report_cache
+from backend.services.components import get_ai_components
+from backend.services.rate_limit_service import within_budget
+from backend.utils.deadline import deadline_scope
+from backend.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Outcome counters. A prefetched report is a hit when a request reads it (or
+# joins its generation) and wasted when it expires or is evicted unread.
+_stats: Dict[str, int] = {
+    "requested": 0, "queued": 0, "already_cached": 0, "over_budget": 0, "dropped": 0,
+    "generated": 0, "failed": 0, "hits": 0, "joined": 0, "wasted": 0,
+}
+_unused: "OrderedDict[str, float]" = OrderedDict()  # prefetched, unread report key -> expires_at
+_pending: Set[str] = set()   # queued or running
+_running: Set[str] = set()
+_claimed: Set[str] = set()   # running prefetches a request is already waiting on
+_lock = threading.Lock()
+
+_queue: Optional[queue.Queue] = None
+_queue_lock = threading.Lock()
+
+def _get_queue() -> queue.Queue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = queue.Queue(maxsize=Config.PREFETCH_QUEUE_SIZE)
+                threading.Thread(target=_worker, name="prefetch", daemon=True).start()
+    return _queue
+
+def prefetch_reports(role: str, category: str, kinds: Iterable[str]) -> Dict[str, str]:
+    """
+    Queue background generation of a role's reports for the current client.
+    Returns a status per report type: queued, cached, pending, over_budget or dropped.
+    Must be called inside a request (the budget is per client).
+    """
+    from backend.services.report_service import report_key
+
+    statuses = {}
+    for kind in kinds:
+        key = report_key(kind, role, category)
+        with _lock:
+            _stats["requested"] += 1
+            if report_cache.contains(key):
+                _stats["already_cached"] += 1
+                statuses[kind] = "cached"
+                continue
+            if key in _pending:
+                statuses[kind] = "pending"
+                continue
+        if not within_budget("prefetch", Config.PREFETCH_BUDGET, 3600):
+            with _lock:
+                _stats["over_budget"] += 1
+            statuses[kind] = "over_budget"
+            continue
+        try:
+            with _lock:
+                _pending.add(key)
+            _get_queue().put_nowait((key, kind, role, category, time.monotonic()))
+            status = "queued"
+        except queue.Full:
+            with _lock:
+                _pending.discard(key)
+            status = "dropped"
+        with _lock:
+            _stats[status] += 1
+        statuses[kind] = status
+    return statuses
+
+def _worker() -> None:
+    while True:
+        job = _queue.get()
+        try:
+            _wait_for_idle(job[0])
+            _run(*job)
+        except Exception as e:
+            logger.warning(f"Prefetch of {job[1]} for {job[2]} failed: {e}")
+            with _lock:
+                _stats["failed"] += 1
+        finally:
+            with _lock:
+                _pending.discard(job[0])
+                _running.discard(job[0])
+                _claimed.discard(job[0])
+
+def _wait_for_idle(key: str) -> None:
+    # Interactive traffic first: hold the job while requests are using the upstream pool
+    while scheduler.upstream_load() >= Config.PREFETCH_MAX_LOAD and not report_cache.contains(key):
+        time.sleep(0.25)
+
+def _run(key: str, kind: str, role: str, category: str, queued_at: float) -> None:
+    from backend.services.report_service import get_report, in_flight
+
+    # Built (or being built) by a request in the meantime
+    if report_cache.contains(key) or in_flight(key):
+        with _lock:
+            _stats["already_cached"] += 1
+        return
+    llm, _ = get_ai_components()
+    if not llm:
+        raise RuntimeError("LLM not initialized")
+
+    with _lock:
+        _running.add(key)
+    waited_ms = round((time.monotonic() - queued_at) * 1000, 1)
+    with scheduler.background(), deadline_scope(Config.PREFETCH_TIMEOUT), \
+            span("prefetch", **{"report.kind": kind, "prefetch.role": role, "prefetch.wait_ms": waited_ms}):
+        report = get_report(kind, llm, role, category, prefetch=True)
+
+    with _lock:
+        if report["error"]:
+            _stats["failed"] += 1
+        elif not report["cached"]:
+            _stats["generated"] += 1
+            if key not in _claimed:
+                _unused[key] = report["created_at"] + Config.REPORT_CACHE_TTL
+        else:
+            _stats["already_cached"] += 1
+    logger.info(f"Prefetched {kind} report for {role} after waiting {waited_ms} ms")
+
+def record_use(key: str) -> None:
+    """Called when a request is served a cached (or in-flight) report."""
+    if not _unused and not _running:
+        return
+    with _lock:
+        if _unused.pop(key, None) is not None:
+            _stats["hits"] += 1
+        elif key in _running and key not in _claimed:
+            _claimed.add(key)
+            _stats["hits"] += 1
+            _stats["joined"] += 1
+
+def _sweep() -> None:
+    now = time.time()
+    for key, expires_at in list(_unused.items()):
+        if expires_at <= now or not report_cache.contains(key):
+            del _unused[key]
+            _stats["wasted"] += 1
+
+def prefetch_stats() -> dict:
+    """Counters plus hit and waste rates over finished prefetches, for tuning the budget."""
+    with _lock:
+        _sweep()
+        stats = dict(_stats)
+        stats["unused"] = len(_unused)
+        stats["pending"] = len(_pending)
+    generated = stats["generated"]
+    stats["hit_rate"] = round(stats["hits"] / generated, 3) if generated else None
+    stats["waste_rate"] = round(stats["wasted"] / generated, 3) if generated else None
+    stats["upstream_load"] = scheduler.upstream_load()
+    return stats
@@ -0,0 +1,220 @@
+import os
+import math
+import time
+import uuid
+import random
+import sqlite3
+import hashlib
+import logging
+import threading
+from functools import wraps
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from flask import jsonify, make_response, request, session
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+class BucketState(NamedTuple):
+    cost_class: str
+    capacity: int
+    period: int
+    remaining: float
+    retry_after: float
+    reset: float
+
+def parse_limits(spec: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "catalog=300/60,llm=30/600" into {"catalog": (300, 60), "llm": (30, 600)}."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rule = item.partition("=")
+        capacity, _, period = rule.partition("/")
+        limits[name.strip()] = (int(capacity), int(period))
+    return limits
+
+class TokenBucketStore:
+    """
+    Token buckets persisted in SQLite so every worker process on the host
+    draws from the same budget. Buckets refill continuously at capacity/period.
+    """
+
+    # Buckets untouched for this long are full again and can be dropped
+    STALE_AFTER = 24 * 3600
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def consume(self, identities: List[Tuple[str, int]], charges: Dict[str, int],
+                limits: Dict[str, Tuple[int, int]]) -> Tuple[bool, List[BucketState]]:
+        """
+        Charge every (identity, cost class) bucket at once: either all have
+        enough tokens and all are debited, or nothing is taken. Each identity
+        carries a capacity multiplier.
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            buckets = []
+            for client, scale in identities:
+                for cost_class, cost in charges.items():
+                    capacity, period = limits[cost_class]
+                    capacity *= scale
+                    key = f"{client}|{cost_class}"
+                    row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                    tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * capacity / period)
+                    name = cost_class if scale == 1 else f"{cost_class}.{client.partition(':')[0]}"
+                    buckets.append((key, name, capacity, period, cost, tokens))
+
+            allowed = all(tokens >= cost for *_, cost, tokens in buckets)
+            states = []
+            for key, cost_class, capacity, period, cost, tokens in buckets:
+                rate = capacity / period
+                if allowed:
+                    tokens -= cost
+                    conn.execute(
+                        "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                        (key, tokens, now),
+                    )
+                if tokens >= cost:
+                    retry_after = 0.0
+                elif cost > capacity:
+                    # Can never fit this bucket; point at a full window rather than 0
+                    retry_after = float(period)
+                else:
+                    retry_after = (cost - tokens) / rate
+                states.append(BucketState(cost_class, capacity, period, tokens, retry_after, (capacity - tokens) / rate))
+
+            if random.random() < 0.001:
+                conn.execute("DELETE FROM buckets WHERE updated < ?", (now - self.STALE_AFTER,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, states
+
+_store: Optional[TokenBucketStore] = None
+_store_lock = threading.Lock()
+_limits: Optional[Dict[str, Tuple[int, int]]] = None
+
+def get_store() -> TokenBucketStore:
+    global _store, _limits
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _limits = parse_limits(Config.RATE_LIMITS)
+                _store = TokenBucketStore(Config.RATE_LIMIT_DB)
+    return _store
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+def client_identities() -> List[Tuple[str, int]]:
+    """
+    Buckets to charge as (identity, capacity multiplier). A configured API key
+    gets its own budget. Browser sessions get one each, backed by a larger
+    per-IP bucket so dropping cookies can't mint fresh budgets.
+    """
+    api_key = request.headers.get("X-API-Key")
+    if api_key and api_key in Config.API_KEYS:
+        return [(f"key:{_digest(api_key)}", 1)]
+    ip = (f"ip:{request.remote_addr or 'unknown'}", Config.RATE_LIMIT_IP_MULTIPLIER)
+    session_id = session.get("rl_id")
+    if not session_id:
+        session["rl_id"] = uuid.uuid4().hex
+        return [ip]
+    return [(f"session:{session_id}", 1), ip]
+
+def within_budget(cost_class: str, capacity: int, period: int, cost: int = 1) -> bool:
+    """
+    Charge a soft per-client budget for optional work (no headers, no 429).
+    Returns False when it is spent, or when the store can't be reached.
+    """
+    try:
+        allowed, _ = get_store().consume(client_identities(), {cost_class: cost}, {cost_class: (capacity, period)})
+        return allowed
+    except Exception as e:
+        logger.warning(f"Budget check for {cost_class} failed: {e}")
+        return False
+
+def _tightest(states: List[BucketState]) -> BucketState:
+    return min(states, key=lambda s: (s.remaining / s.capacity, -s.retry_after))
+
+def _apply_headers(response, states: List[BucketState]) -> None:
+    state = _tightest(states)
+    response.headers["RateLimit-Limit"] = str(state.capacity)
+    response.headers["RateLimit-Remaining"] = str(max(0, math.floor(state.remaining)))
+    response.headers["RateLimit-Reset"] = str(math.ceil(state.reset))
+    response.headers["RateLimit-Policy"] = ", ".join(
+        f'{s.capacity};w={s.period};name="{s.cost_class}"' for s in states
+    )
+
+def _limited_response(states: List[BucketState]):
+    blocked = [s for s in states if s.retry_after > 0]
+    retry_after = math.ceil(max(s.retry_after for s in blocked))
+    response = jsonify({
+        "error": "Rate limit exceeded. Please retry later.",
+        "limits": [s.cost_class for s in blocked],
+        "retry_after": retry_after,
+    })
+    response.status_code = 429
+    response.headers["Retry-After"] = str(retry_after)
+    _apply_headers(response, blocked)
+    return response
+
+def charge(**charges: int):
+    """
+    Charge further costs from inside a view once the real price of the request
+    is known (e.g. per file or per uncached report). Returns the 429 response
+    to send back, or None when the charge fits (or limiting is off).
+    """
+    charges = {name: cost for name, cost in charges.items() if cost > 0}
+    if not Config.RATE_LIMIT_ENABLED or not charges:
+        return None
+    try:
+        allowed, states = get_store().consume(client_identities(), charges, _limits)
+    except Exception as e:
+        logger.warning(f"Rate limiter unavailable: {e}")
+        return None
+    return None if allowed else _limited_response(states)
+
+def rate_limit(**charges: int):
+    """
+    Route decorator charging weighted costs against per-client buckets, e.g.
+    @rate_limit(llm=5, search=1) for an agent turn that may also search.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not Config.RATE_LIMIT_ENABLED:
+                return view(*args, **kwargs)
+            try:
+                store = get_store()
+                allowed, states = store.consume(client_identities(), charges, _limits)
+            except Exception as e:
+                # Fail open: a broken limiter store shouldn't take the API down
+                logger.warning(f"Rate limiter unavailable: {e}")
+                return view(*args, **kwargs)
+
+            if not allowed:
+                return _limited_response(states)
+
+            response = make_response(view(*args, **kwargs))
+            _apply_headers(response, states)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,186 @@
+import time
+import queue
+import logging
+import itertools
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+from backend.config import Config
+from backend.services import scheduler
+from backend.services.cache_service import report_cache
+from backend.utils.deadline import deadline_scope
+from backend.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Refresh priorities: a user was just served stale data, or a popular entry is about to expire
+STALE, AHEAD = 0, 1
+
+# Most keys whose popularity is tracked; the least popular are forgotten first
+MAX_TRACKED = 2000
+
+_stats: Dict[str, int] = {
+    "stale_served": 0, "queued": 0, "ahead_of_expiry": 0, "refreshed": 0,
+    "failed": 0, "over_budget": 0, "skipped_fresh": 0,
+}
+_popular: Dict[str, list] = {}  # cache key -> [decayed access count, last access, spec]
+_pending = set()
+_spent = deque()                # monotonic times of refreshes in the last hour
+_lock = threading.Lock()
+_seq = itertools.count()
+
+_queue: Optional[queue.PriorityQueue] = None
+_queue_lock = threading.Lock()
+
+def _get_queue() -> queue.PriorityQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = queue.PriorityQueue()
+                threading.Thread(target=_worker, name="refresh", daemon=True).start()
+    return _queue
+
+def _score(entry: list, now: float) -> float:
+    return entry[0] * 0.5 ** ((now - entry[1]) / Config.REFRESH_HALF_LIFE)
+
+def record_access(key: str, spec: Tuple) -> None:
+    """
+    Count a read of a cached entry. spec says how to rebuild it:
+    ("report", kind, role, category) or ("jobs", role, location).
+    """
+    if not Config.REFRESH_ENABLED:
+        return
+    now = time.time()
+    with _lock:
+        entry = _popular.get(key)
+        if entry is None:
+            if len(_popular) >= MAX_TRACKED:
+                del _popular[min(_popular, key=lambda k: _score(_popular[k], now))]
+            entry = _popular[key] = [0.0, now, spec]
+        entry[0] = _score(entry, now) + 1
+        entry[1] = now
+    _get_queue()
+
+def schedule_refresh(key: str, spec: Tuple, priority: int = STALE) -> bool:
+    """Queue a background rebuild of a cache entry; False if one is already queued."""
+    if not Config.REFRESH_ENABLED:
+        return False
+    with _lock:
+        if key in _pending:
+            return False
+        _pending.add(key)
+        score = _score(_popular[key], time.time()) if key in _popular else 0.0
+        _stats["stale_served" if priority == STALE else "ahead_of_expiry"] += 1
+        _stats["queued"] += 1
+    _get_queue().put((priority, -score, next(_seq), key, spec))
+    return True
+
+def _sweep() -> None:
+    """Queue popular entries that expire within REFRESH_AHEAD seconds, most popular first."""
+    now = time.time()
+    with _lock:
+        if _budget_used() >= Config.REFRESH_BUDGET:
+            # Refreshing ahead is optional; leave what budget frees up for stale serves
+            return
+        candidates = [(key, entry[2]) for key, entry in _popular.items()
+                      if _score(entry, now) >= Config.REFRESH_MIN_SCORE and key not in _pending]
+    for key, spec in candidates:
+        left = report_cache.expires_in(key)
+        if left is not None and left <= Config.REFRESH_AHEAD:
+            schedule_refresh(key, spec, AHEAD)
+
+def _budget_used() -> int:
+    # Caller holds _lock
+    now = time.monotonic()
+    while _spent and now - _spent[0] > 3600:
+        _spent.popleft()
+    return len(_spent)
+
+def _within_budget() -> bool:
+    now = time.monotonic()
+    with _lock:
+        if _budget_used() >= Config.REFRESH_BUDGET:
+            return False
+        _spent.append(now)
+        return True
+
+def _worker() -> None:
+    last_sweep = time.monotonic()
+    while True:
+        try:
+            _, _, _, key, spec = _queue.get(timeout=Config.REFRESH_INTERVAL)
+        except queue.Empty:
+            key = None
+        if time.monotonic() - last_sweep >= Config.REFRESH_INTERVAL:
+            last_sweep = time.monotonic()
+            try:
+                _sweep()
+            except Exception as e:
+                logger.warning(f"Refresh sweep failed: {e}")
+        if key is None:
+            continue
+        try:
+            _run(key, spec)
+        except Exception as e:
+            logger.warning(f"Refresh of {spec} failed: {e}")
+            with _lock:
+                _stats["failed"] += 1
+        finally:
+            with _lock:
+                _pending.discard(key)
+
+def _run(key: str, spec: Tuple) -> None:
+    left = report_cache.expires_in(key)
+    if left is not None and left > Config.REFRESH_AHEAD:
+        # Renewed by a request in the meantime
+        with _lock:
+            _stats["skipped_fresh"] += 1
+        return
+    # Interactive traffic first
+    while scheduler.upstream_load() >= Config.REFRESH_MAX_LOAD:
+        time.sleep(0.25)
+    if not _within_budget():
+        with _lock:
+            _stats["over_budget"] += 1
+        logger.info(f"Refresh budget of {Config.REFRESH_BUDGET}/hour spent; {spec} stays stale")
+        return
+
+    kind, role = ("jobs", spec[1]) if spec[0] == "jobs" else (spec[1], spec[2])
+    with scheduler.background(), deadline_scope(Config.REFRESH_TIMEOUT), \
+            span("refresh", **{"refresh.kind": kind, "refresh.role": role}):
+        ok = _rebuild(spec)
+    with _lock:
+        _stats["refreshed" if ok else "failed"] += 1
+    logger.info(f"Refreshed {spec} ({'ok' if ok else 'failed'})")
+
+def _rebuild(spec: Tuple) -> bool:
+    if spec[0] == "jobs":
+        from backend.services.jobs_service import get_jobs
+
+        return bool(get_jobs(spec[1], spec[2], refresh=True))
+
+    from backend.services.components import get_ai_components
+    from backend.services.report_service import get_report
+
+    llm, _ = get_ai_components()
+    if not llm:
+        raise RuntimeError("LLM not initialized")
+    _, kind, role, category = spec
+    return not get_report(kind, llm, role, category, refresh=True)["error"]
+
+def refresh_stats() -> dict:
+    """
+    Counters, hourly budget use and the scores of the most popular tracked
+    entries. Only each entry's type is shown: specs hold users' roles and locations.
+    """
+    now = time.time()
+    with _lock:
+        stats = dict(_stats)
+        stats["pending"] = len(_pending)
+        stats["tracked"] = len(_popular)
+        stats["budget_used"] = _budget_used()
+        top = sorted(((round(_score(e, now), 2), e[2]) for e in _popular.values()), key=lambda x: -x[0])[:10]
+    stats["budget"] = Config.REFRESH_BUDGET
+    stats["popular"] = [{"score": score, "type": spec[0]} for score, spec in top]
+    return stats
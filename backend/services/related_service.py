@@ -0,0 +1,121 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Optional
+from backend.config import Config
+from backend.data.catalog import CareerCatalog, get_catalog
+
+logger = logging.getLogger(__name__)
+
+# Small nudge so equally-similar roles from the same field rank first
+SAME_CATEGORY_BONUS = 0.05
+
+def index_key(catalog: CareerCatalog, top_k: int) -> str:
+    """Hash of everything the index is built from: each role's name, category and skills, top_k and the bonus."""
+    roles = [[role["name"], role["category"], role["skills"]] for role in catalog.roles]
+    raw = json.dumps({"roles": roles, "top_k": top_k, "bonus": SAME_CATEGORY_BONUS}, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def build_related_index(catalog: CareerCatalog, top_k: int = 5) -> dict:
+    """
+    Cosine similarity between role skill vectors, keeping the top-k neighbours per role.
+    """
+    import numpy as np
+
+    roles = catalog.roles
+    skills = sorted({skill for role in roles for skill in role["skills"]})
+    column = {skill: i for i, skill in enumerate(skills)}
+
+    vectors = np.zeros((len(roles), len(skills)), dtype=np.float32)
+    for i, role in enumerate(roles):
+        vectors[i, [column[s] for s in role["skills"]]] = 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1.0, norms)
+
+    cosine = vectors @ vectors.T
+    similarity = cosine.copy()
+    categories = np.array([role["category"] for role in roles])
+    similarity += SAME_CATEGORY_BONUS * (categories[:, None] == categories[None, :])
+    np.fill_diagonal(similarity, -np.inf)
+
+    k = min(top_k, len(roles) - 1)
+    related = {}
+    if k > 0:
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        for i, role in enumerate(roles):
+            own = set(role["skills"])
+            related[role["name"]] = [
+                {
+                    "role": roles[j]["name"],
+                    "category": roles[j]["category"],
+                    "score": round(float(similarity[i, j]), 3),
+                    "shared_skills": [s for s in roles[j]["skills"] if s in own],
+                }
+                for j in top[i]
+                # Roles with no skill in common are not related, whatever their category
+                if cosine[i, j] > 0
+            ]
+
+    return {"key": index_key(catalog, top_k), "top_k": top_k, "related": related}
+
+def save_related_index(index: dict, path: Optional[str] = None) -> str:
+    path = path or Config.RELATED_CAREERS_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+def _load_or_build(catalog: CareerCatalog) -> dict:
+    path = Config.RELATED_CAREERS_PATH
+    key = index_key(catalog, Config.RELATED_CAREERS_TOP_K)
+    try:
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("key") == key:
+            return index
+        logger.info("Related-careers index is stale for the current catalog or settings; rebuilding")
+    except FileNotFoundError:
+        logger.info("No related-careers index on disk; building")
+    except Exception as e:
+        logger.warning(f"Could not read related-careers index: {e}")
+
+    index = build_related_index(catalog, Config.RELATED_CAREERS_TOP_K)
+    try:
+        save_related_index(index, path)
+    except OSError as e:
+        logger.warning(f"Could not persist related-careers index: {e}")
+    return index
+
+_index: Optional[dict] = None
+_index_catalog: Optional[CareerCatalog] = None
+_index_lock = threading.Lock()
+
+def get_related_index() -> dict:
+    global _index, _index_catalog
+    catalog = get_catalog()
+    if _index is None or _index_catalog is not catalog:
+        with _index_lock:
+            if _index is None or _index_catalog is not catalog:
+                _index = _load_or_build(catalog)
+                _index_catalog = catalog
+    return _index
+
+def get_related_careers(role: str, limit: int = 5) -> Optional[list]:
+    """Precomputed neighbours for a role name or alias; None if the role is unknown."""
+    entry = get_catalog().get(role)
+    if entry is None:
+        return None
+    return get_related_index()["related"].get(entry["name"], [])[:limit]
+
+if __name__ == "__main__":
+    # Rebuild after changing the catalog: python -m backend.services.related_service
+    logging.basicConfig(level=logging.INFO)
+    written = save_related_index(build_related_index(get_catalog(), Config.RELATED_CAREERS_TOP_K))
+    print(f"Wrote related-careers index to {written}")
@@ -0,0 +1,151 @@
+import time
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError, as_completed
+from typing import Dict, Iterator, List
+from backend.data.catalog import get_catalog
+from backend.config import Config
+from backend.services import prefetch_service, refresh_service, scheduler
+from backend.services.cache_service import report_cache, make_key
+from backend.services.ai_service import (
+    generate_career_insights,
+    generate_market_analysis,
+    generate_college_recommendations,
+)
+from backend.utils import deadline
+from backend.utils.text_utils import as_markdown
+from backend.utils.tracing import traced, current_span
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a report prompt changes so cached reports are not reused
+REPORT_PROMPT_VERSION = "2"
+
+REPORT_TYPES = ("insights", "market", "colleges")
+
+def is_error_result(text: str) -> bool:
+    # generate_* functions report failures as a "❌ ..." message instead of raising
+    return text.startswith("❌")
+
+def report_key(kind: str, subcareer: str, category: str = "") -> str:
+    role = get_catalog().get(subcareer)
+    name = role["name"] if role else (subcareer or "").strip()
+    # Only the insights prompt mentions the category
+    category = (category or "").strip() if kind == "insights" else ""
+    return make_key("report", kind, REPORT_PROMPT_VERSION, name.casefold(), category.casefold())
+
+def _generate(kind: str, llm, subcareer: str, category: str) -> str:
+    if kind == "insights":
+        return generate_career_insights(category, subcareer, llm)
+    if kind == "market":
+        return generate_market_analysis(subcareer, llm)
+    if kind == "colleges":
+        return generate_college_recommendations(subcareer, llm)
+    raise ValueError(f"Unknown report type: {kind}")
+
+# Single-flight: concurrent requests for the same uncached report share one generation
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+def in_flight(key: str) -> bool:
+    return key in _inflight
+
+@traced()
+def get_report(kind: str, llm, subcareer: str, category: str = "", prefetch: bool = False,
+               refresh: bool = False) -> dict:
+    """
+    Cached report lookup. Returns {"result", "created_at", "cached", "error", "stale"}
+    where result is already cleaned markdown. prefetch=True marks speculative
+    generation, which doesn't count as a use of a prefetched report.
+    Expired reports are still served (stale=True) for REPORT_STALE_TTL while
+    a background refresh regenerates them; refresh=True (the refresher) skips the cache.
+    """
+    key = report_key(kind, subcareer, category)
+    spec = ("report", kind, subcareer, category)
+    if not (prefetch or refresh):
+        refresh_service.record_access(key, spec)
+    entry = None if refresh else report_cache.lookup(key)
+    current_span().set_attributes({"report.kind": kind, "cache.hit": entry is not None,
+                                   "cache.stale": bool(entry and entry[2])})
+    if entry is not None:
+        result, created_at, stale = entry
+        logger.info(f"Report cache hit: {kind} for {subcareer}{' (stale)' if stale else ''}")
+        if stale:
+            refresh_service.schedule_refresh(key, spec)
+        if not prefetch:
+            prefetch_service.record_use(key)
+        return {"result": result, "created_at": created_at, "cached": True, "error": False, "stale": stale}
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        current_span().set_attribute("singleflight.shared", True)
+        if not prefetch:
+            prefetch_service.record_use(key)
+        try:
+            return dict(future.result(timeout=deadline.remaining()))
+        except TimeoutError:
+            raise deadline.DeadlineExceeded()
+
+    try:
+        report = _build_report(key, kind, llm, subcareer, category)
+        future.set_result(report)
+        return report
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+def _build_report(key: str, kind: str, llm, subcareer: str, category: str) -> dict:
+    result = as_markdown(_generate(kind, llm, subcareer, category))
+    if is_error_result(result):
+        return {"result": result, "created_at": time.time(), "cached": False, "error": True, "stale": False}
+    if deadline.expired():
+        # Cut short by the request deadline: serve it, but don't cache or validate it
+        return {"result": result, "created_at": time.time(), "cached": False, "error": True, "stale": False}
+    created_at = report_cache.set(key, result, stale_ttl=Config.REPORT_STALE_TTL)
+    return {"result": result, "created_at": created_at, "cached": False, "error": False, "stale": False}
+
+def stream_role_report(kinds: List[str], llm, subcareer: str, category: str = "") -> Iterator[dict]:
+    """
+    Run several report types for one role concurrently on the interactive lane
+    (each through the cache and single-flight). Yields one event per report
+    as it completes, then a summary, so the total time tracks the slowest part.
+    """
+    start = time.perf_counter()
+    futures = {scheduler.submit_interactive(get_report, kind, llm, subcareer, category): kind for kind in kinds}
+    finished = set()
+    try:
+        for future in as_completed(futures, timeout=deadline.remaining()):
+            kind = futures[future]
+            finished.add(kind)
+            try:
+                report = future.result()
+            except Exception as e:
+                logger.error(f"Role report part {kind} failed for {subcareer}: {e}")
+                report = {"result": f"❌ Unable to generate {kind} report. Error: {e}", "cached": False, "error": True}
+            yield {
+                "event": "report",
+                "type": kind,
+                "result": report["result"],
+                "cached": report["cached"],
+                "stale": report.get("stale", False),
+                "error": report["error"],
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+    except TimeoutError:
+        for kind in kinds:
+            if kind not in finished:
+                yield {"event": "report", "type": kind, "result": "❌ Not finished before the request deadline.",
+                       "cached": False, "error": True, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+    finally:
+        for future in futures:
+            future.cancel()
+
+    yield {"event": "summary", "role": subcareer, "types": kinds,
+           "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
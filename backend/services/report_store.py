@@ -0,0 +1,199 @@
+import zlib
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+from backend.config import Config
+
+# Optional: zstd compresses better and faster than zlib and trains real dictionaries
+try:
+    import zstandard
+    HAVE_ZSTD = True
+except Exception:
+    HAVE_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+# zlib only looks back 32 KB, so a longer preset dictionary is wasted
+ZLIB_DICT_MAX = 32 * 1024
+
+def build_zdict(samples: List[bytes], size: int = ZLIB_DICT_MAX) -> bytes:
+    """
+    Preset dictionary from sample reports: lines that recur across samples
+    (headings, table headers, boilerplate), the most valuable placed last
+    where matches are cheapest, preceded by the most recent sample text to
+    fill the window.
+    """
+    counts = Counter()
+    for sample in samples:
+        counts.update({line for line in sample.splitlines(keepends=True) if len(line.strip()) > 8})
+    ranked = sorted((n * len(line), line) for line, n in counts.items() if n > 1)
+    picked, total = [], 0
+    for _, line in reversed(ranked):
+        if total + len(line) <= size:
+            picked.append(line)
+            total += len(line)
+    shared = b"".join(reversed(picked))
+    filler = b"".join(samples)[-(size - total):] if size > total else b""
+    return filler + shared
+
+class ReportStore:
+    """
+    Content-addressed store for generated text. Identical outputs are kept
+    once (by SHA-256, reference counted) and compressed with zstd when
+    installed, zlib otherwise. After the first REPORT_STORE_TRAIN_SAMPLES
+    texts a dictionary is trained on them and stored blobs are recompressed
+    with it. Recently read texts stay decompressed in a byte-bounded LRU.
+    """
+
+    def __init__(self, codec: str = "auto", level: int = 6, hot_bytes: int = 4 * 1024 * 1024,
+                 train_samples: int = 24, dict_bytes: int = ZLIB_DICT_MAX):
+        self.codec = "zstd" if HAVE_ZSTD and codec in ("auto", "zstd") else "zlib"
+        self.level = level
+        self.hot_bytes = hot_bytes
+        self.train_samples = train_samples
+        self.dict_bytes = dict_bytes if self.codec == "zstd" else min(dict_bytes, ZLIB_DICT_MAX)
+        self._blobs: Dict[str, list] = {}  # digest -> [codec, payload, raw size, references]
+        self._hot: "OrderedDict[str, str]" = OrderedDict()
+        self._hot_size = 0
+        self._samples: List[bytes] = []
+        self._dict: Optional[bytes] = None
+        self._zstd_dict = None
+        self._lock = threading.Lock()
+        self.hot_hits = 0
+        self.hot_misses = 0
+        self.dedup_hits = 0
+
+    def put(self, text: str) -> str:
+        """Store text (or add a reference to an identical stored copy); returns its digest."""
+        raw = text.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is not None:
+                blob[3] += 1
+                self.dedup_hits += 1
+                return digest
+            codec, payload = self._compress(raw)
+            self._blobs[digest] = [codec, payload, len(raw), 1]
+            self._remember(digest, text)
+            if self._dict is None and self.train_samples:
+                self._samples.append(raw)
+                if len(self._samples) >= self.train_samples:
+                    self._train()
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            text = self._hot.get(digest)
+            if text is not None:
+                self._hot.move_to_end(digest)
+                self.hot_hits += 1
+                return text
+            blob = self._blobs.get(digest)
+            if blob is None:
+                return None
+            self.hot_misses += 1
+            text = self._decompress(blob[0], blob[1]).decode("utf-8")
+            self._remember(digest, text)
+            return text
+
+    def release(self, digest: str) -> None:
+        """Drop one reference; the blob is freed with its last one."""
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is None:
+                return
+            blob[3] -= 1
+            if blob[3] <= 0:
+                del self._blobs[digest]
+                text = self._hot.pop(digest, None)
+                if text is not None:
+                    self._hot_size -= len(text)
+
+    def _remember(self, digest: str, text: str) -> None:
+        # Hot set is bounded by characters, a close enough proxy for bytes
+        if len(text) > self.hot_bytes:
+            return
+        if digest not in self._hot:
+            self._hot_size += len(text)
+        self._hot[digest] = text
+        self._hot.move_to_end(digest)
+        while self._hot_size > self.hot_bytes:
+            _, evicted = self._hot.popitem(last=False)
+            self._hot_size -= len(evicted)
+
+    def _compress(self, raw: bytes) -> tuple:
+        if self.codec == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self._zstd_dict)
+            return ("zstd+dict" if self._zstd_dict else "zstd"), compressor.compress(raw)
+        if self._dict:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, 15, 9, zlib.Z_DEFAULT_STRATEGY, zdict=self._dict)
+            return "zlib+dict", compressor.compress(raw) + compressor.flush()
+        return "zlib", zlib.compress(raw, self.level)
+
+    def _decompress(self, codec: str, payload: bytes) -> bytes:
+        if codec == "zlib":
+            return zlib.decompress(payload)
+        if codec == "zlib+dict":
+            decompressor = zlib.decompressobj(zdict=self._dict)
+            return decompressor.decompress(payload) + decompressor.flush()
+        return zstandard.ZstdDecompressor(dict_data=self._zstd_dict if codec == "zstd+dict" else None).decompress(payload)
+
+    def _train(self) -> None:
+        samples, self._samples = self._samples, []
+        if self.codec == "zstd":
+            try:
+                self._zstd_dict = zstandard.train_dictionary(self.dict_bytes, samples)
+            except Exception as e:
+                # Too few or too similar samples for zstd's trainer: use sample text as a raw-content dictionary
+                logger.info(f"zstd dictionary training failed ({e}); using a raw-content dictionary")
+                self._zstd_dict = zstandard.ZstdCompressionDict(build_zdict(samples, self.dict_bytes),
+                                                                dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            self._dict = self._zstd_dict.as_bytes()
+        else:
+            self._dict = build_zdict(samples, self.dict_bytes)
+        if not self._dict:
+            return
+
+        before = sum(len(blob[1]) for blob in self._blobs.values())
+        for blob in self._blobs.values():
+            raw = self._decompress(blob[0], blob[1])
+            blob[0], blob[1] = self._compress(raw)
+        after = sum(len(blob[1]) for blob in self._blobs.values())
+        logger.info(f"Trained a {len(self._dict)}-byte {self.codec} dictionary on {len(samples)} reports; "
+                    f"stored blobs {before} -> {after} bytes")
+
+    def stats(self) -> dict:
+        with self._lock:
+            raw = sum(blob[2] for blob in self._blobs.values())
+            logical = sum(blob[2] * blob[3] for blob in self._blobs.values())
+            stored = sum(len(blob[1]) for blob in self._blobs.values())
+            lookups = self.hot_hits + self.hot_misses
+            return {
+                "codec": self.codec,
+                "dictionary_bytes": len(self._dict or b""),
+                "blobs": len(self._blobs),
+                "references": sum(blob[3] for blob in self._blobs.values()),
+                "dedup_hits": self.dedup_hits,
+                "logical_bytes": logical,
+                "raw_bytes": raw,
+                "stored_bytes": stored,
+                "compression_ratio": round(raw / stored, 2) if stored else None,
+                "dedup_ratio": round(logical / raw, 2) if raw else None,
+                "hot": {
+                    "entries": len(self._hot),
+                    "chars": self._hot_size,
+                    "hits": self.hot_hits,
+                    "misses": self.hot_misses,
+                    "hit_rate": round(self.hot_hits / lookups, 3) if lookups else None,
+                },
+            }
+
+def create_report_store() -> Optional[ReportStore]:
+    if not Config.REPORT_STORE_ENABLED:
+        return None
+    return ReportStore(codec=Config.REPORT_STORE_CODEC, level=Config.REPORT_STORE_LEVEL,
+                       hot_bytes=Config.REPORT_STORE_HOT_BYTES, train_samples=Config.REPORT_STORE_TRAIN_SAMPLES,
+                       dict_bytes=Config.REPORT_STORE_DICT_BYTES)
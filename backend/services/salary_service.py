@@ -0,0 +1,343 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from backend.config import Config
+from backend.data.catalog import get_catalog
+
+logger = logging.getLogger(__name__)
+
+# Rupee multipliers for the units Indian postings use
+_UNITS = {"k": 1e3, "l": 1e5, "lpa": 1e5, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5,
+          "cr": 1e7, "crore": 1e7, "crores": 1e7}
+_LAKH_UNITS = {"l", "lpa", "lakh", "lakhs", "lac", "lacs", "cr", "crore", "crores"}
+
+def _amount(n: str) -> str:
+    return (rf"(?P<{n}cur>₹|rs\.?|inr)?\s*(?P<{n}num>\d{{1,3}}(?:,\d{{2,3}})+|\d+(?:\.\d+)?)\s*"
+            rf"(?P<{n}unit>lpa|lakhs?|lacs?|crores?|cr|k|l)?(?![a-z])")
+
+_SALARY_RE = re.compile(
+    _amount("a") + r"(?:\s*(?:-|–|—|to)\s*" + _amount("b") + r")?"
+    r"\s*(?P<period>(?:a|an|per|/)\s*(?:year|annum|month|hour|yr|mo|hr)|p\.?a\.?|p\.?m\.?|monthly|annually)?(?![a-z])",
+    re.IGNORECASE,
+)
+
+# Other currencies right before or after an amount: those figures are not rupees
+_FOREIGN_BEFORE = re.compile(r"(?:[$€£]|\b(?:usd|eur|gbp|aud|cad|sgd|aed))\s*$", re.IGNORECASE)
+_FOREIGN_AFTER = re.compile(r"\s*(?:usd|eur|gbp|aud|cad|sgd|aed|dollars?|euros?|pounds?)\b", re.IGNORECASE)
+
+# Yearly multipliers for the pay period
+_PERIODS = (("month", 12), ("mo", 12), ("p.m", 12), ("pm", 12), ("hour", 2080), ("hr", 2080))
+
+# Anything outside this range (in LPA) is a parsing accident, not a salary
+_MIN_LPA, _MAX_LPA = 0.5, 300.0
+
+CITY_ALIASES = {
+    "bengaluru": "Bangalore", "gurugram": "Gurgaon", "new delhi": "Delhi", "bombay": "Mumbai",
+    "madras": "Chennai", "calcutta": "Kolkata", "anywhere": "Remote", "work from home": "Remote",
+}
+
+def parse_salary(text: str, strict: bool = False) -> Optional[Tuple[float, float]]:
+    """
+    First salary in `text` as a (low, high) range in LPA (lakhs per annum).
+    Handles "₹25K–₹40K a month", "5-8 LPA", "INR 6,00,000 - 9,00,000 per annum", etc.
+    With strict=True (free description text) a currency sign or lakh/crore unit is
+    required, so "3-5 years" is not mistaken for pay. Amounts marked as another
+    currency ("$120,000", "USD 100k", "50,000 EUR") are skipped in both modes.
+    """
+    text = text or ""
+    for m in _SALARY_RE.finditer(text):
+        if _FOREIGN_BEFORE.search(text, 0, m.start()) or _FOREIGN_AFTER.match(text, m.end()):
+            continue
+        unit_a, unit_b = (m.group("aunit") or "").lower(), (m.group("bunit") or "").lower()
+        unit_a = unit_a or unit_b
+        has_currency = bool(m.group("acur") or m.group("bcur"))
+        if strict and not (has_currency or unit_a in _LAKH_UNITS):
+            continue
+        if not (has_currency or unit_a or m.group("period")):
+            continue
+
+        low = float(m.group("anum").replace(",", "")) * _UNITS.get(unit_a, 1)
+        high = float(m.group("bnum").replace(",", "")) * _UNITS.get(unit_b or unit_a, 1) if m.group("bnum") else low
+
+        period = (m.group("period") or "").lower().replace(" ", "")
+        per_year = next((factor for key, factor in _PERIODS if key in period), None)
+        if per_year is None:
+            # No period given: lakh figures are yearly, small rupee figures monthly
+            per_year = 1 if unit_a in _LAKH_UNITS or period or high >= 2e5 else 12
+        low, high = sorted((low * per_year / 1e5, high * per_year / 1e5))
+        if _MIN_LPA <= low and high <= _MAX_LPA:
+            return round(low, 2), round(high, 2)
+    return None
+
+def normalize_city(location: str) -> str:
+    city = (location or "").split(",")[0].strip()
+    if not city:
+        return "India"
+    return CITY_ALIASES.get(city.casefold(), city.title())
+
+def _role_name(role: str) -> str:
+    entry = get_catalog().get(role)
+    return entry["name"] if entry else " ".join((role or "").split())
+
+def _fingerprint(role: str, job: dict) -> int:
+    ident = "|".join((role.casefold(), job.get("title", ""), job.get("company_name", ""), job.get("location", "")))
+    # Signed so it fits an SQLite INTEGER
+    return int.from_bytes(hashlib.blake2b(ident.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+def posting_salary(job: dict) -> Optional[Tuple[float, float]]:
+    """Salary of one SerpAPI google_jobs result: detected extension first, then the description."""
+    extensions = job.get("detected_extensions") or {}
+    salary = extensions.get("salary") and parse_salary(extensions["salary"])
+    if not salary:
+        for ext in job.get("extensions") or []:
+            salary = parse_salary(ext) if "₹" in str(ext) else None
+            if salary:
+                break
+    return salary or parse_salary(job.get("description", ""), strict=True)
+
+def _read_legacy(path: str) -> List[tuple]:
+    """(role, city, lpa, added) rows of a NumPy archive written by earlier releases."""
+    import numpy as np
+
+    with np.load(path) as data:
+        roles = [str(r) for r in data["roles"]]
+        cities = [str(c) for c in data["cities"]]
+        added = float(data["updated_at"])
+        return [(roles[r], cities[c], float(lpa), added)
+                for r, c, lpa in zip(data["role"].tolist(), data["city"].tolist(), data["lpa"].tolist())]
+
+class SalaryStore:
+    """
+    Salary observations kept in SQLite, so every worker process on the host
+    adds to and reads the same data, and mirrored in memory as parallel
+    columns (role id, city id, LPA midpoint) in compact typed arrays with
+    NumPy views. Each read first pulls the rows added since the last one.
+    Postings are deduplicated by fingerprint so repeat searches don't skew
+    the numbers. Without a path the store lives in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path and path.endswith(".npz"):
+            path = path[:-len(".npz")] + ".sqlite3"
+        self.path = path
+        # Earlier releases rewrote a whole .npz archive per search; it is imported once, then renamed
+        self._legacy = os.path.splitext(path)[0] + ".npz" if path else None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._roles: List[str] = []
+        self._role_ids: Dict[str, int] = {}
+        self._cities: List[str] = []
+        self._city_ids: Dict[str, int] = {}
+        self._role_col = array("H")
+        self._city_col = array("H")
+        self._lpa_col = array("f")
+        self._seen = set()
+        self._synced = 0
+        self._views = None
+        self.updated_at = 0.0
+        self._sync()
+        if len(self):
+            logger.info(f"Loaded {len(self)} salary observations from {path}")
+
+    def __len__(self) -> int:
+        return len(self._lpa_col)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings (id INTEGER PRIMARY KEY, fingerprint INTEGER UNIQUE, "
+                "role TEXT NOT NULL, city TEXT NOT NULL, lpa REAL NOT NULL, added REAL NOT NULL)"
+            )
+            self._local.conn = conn
+            if os.path.exists(self._legacy):
+                self._import_legacy(conn)
+        return conn
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have imported it first
+            if os.path.exists(self._legacy):
+                rows = _read_legacy(self._legacy)
+                conn.executemany("INSERT INTO postings (role, city, lpa, added) VALUES (?, ?, ?, ?)", rows)
+                os.replace(self._legacy, f"{self._legacy}.imported")
+                logger.info(f"Imported {len(rows)} salary observations from {self._legacy}")
+            conn.execute("COMMIT")
+        except Exception as e:
+            conn.execute("ROLLBACK")
+            logger.warning(f"Could not import salary data from {self._legacy}: {e}")
+
+    def _intern(self, names: List[str], ids: Dict[str, int], name: str) -> int:
+        key = name.casefold()
+        if key not in ids:
+            ids[key] = len(names)
+            names.append(name)
+        return ids[key]
+
+    def _append(self, rows: Iterable[tuple]) -> None:
+        # Caller holds _lock; rows are (role, city, lpa, added)
+        for role, city, lpa, added in rows:
+            self._role_col.append(self._intern(self._roles, self._role_ids, role))
+            self._city_col.append(self._intern(self._cities, self._city_ids, city))
+            self._lpa_col.append(lpa)
+            self.updated_at = max(self.updated_at, added)
+        self._views = None
+
+    def _sync(self) -> None:
+        """Pull rows added since the last sync, by this or any other worker."""
+        if not self.path:
+            return
+        try:
+            rows = self._conn().execute(
+                "SELECT id, role, city, lpa, added FROM postings WHERE id > ? ORDER BY id", (self._synced,)
+            ).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Could not read salary data from {self.path}: {e}")
+            return
+        if not rows:
+            return
+        with self._lock:
+            # A concurrent sync may have taken some of them already
+            rows = [row for row in rows if row[0] > self._synced]
+            if rows:
+                self._append(row[1:] for row in rows)
+                self._synced = rows[-1][0]
+
+    def add_postings(self, role: str, jobs: Iterable[dict]) -> int:
+        """Parse and store the salaries of new postings for a role; returns how many were added."""
+        role = _role_name(role)
+        now = time.time()
+        rows = []
+        for job in jobs:
+            salary = posting_salary(job)
+            if salary:
+                rows.append((_fingerprint(role, job), role, normalize_city(job.get("location", "")), sum(salary) / 2, now))
+        if not rows:
+            return 0
+        if not self.path:
+            with self._lock:
+                fresh = []
+                for row in rows:
+                    if row[0] not in self._seen:
+                        self._seen.add(row[0])
+                        fresh.append(row[1:])
+                self._append(fresh)
+            return len(fresh)
+
+        # A few row inserts; INSERT OR IGNORE skips postings any worker has already stored
+        conn = self._conn()
+        before = conn.total_changes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO postings (fingerprint, role, city, lpa, added) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        added = conn.total_changes - before
+        if added:
+            self._sync()
+        return added
+
+    def _columns(self):
+        import numpy as np
+
+        with self._lock:
+            if self._views is None:
+                # Copy under the lock; the arrays may be reallocated by later appends
+                self._views = (np.array(self._role_col, dtype=np.uint16),
+                               np.array(self._city_col, dtype=np.uint16),
+                               np.array(self._lpa_col, dtype=np.float32))
+            return self._views
+
+    def stats(self, role: str, city: Optional[str] = None, bins: Optional[int] = None) -> Optional[dict]:
+        """Percentiles, histogram and per-city medians for a role (optionally one city); None without data."""
+        import numpy as np
+
+        self._sync()
+        name = _role_name(role)
+        role_id = self._role_ids.get(name.casefold())
+        if role_id is None:
+            return None
+        roles, cities, lpa = self._columns()
+        mask = roles == role_id
+        if city:
+            city_id = self._city_ids.get(normalize_city(city).casefold())
+            if city_id is None:
+                return None
+            mask &= cities == city_id
+        values, value_cities = lpa[mask], cities[mask]
+        if not values.size:
+            return None
+
+        p10, p25, p50, p75, p90 = np.percentile(values, [10, 25, 50, 75, 90])
+        counts, edges = np.histogram(values, bins=bins or Config.SALARY_HISTOGRAM_BINS)
+
+        # Per-city medians: sort by (city, salary) once, then split into runs
+        order = np.lexsort((values, value_cities))
+        sorted_cities, sorted_values = value_cities[order], values[order]
+        ids, starts, sizes = np.unique(sorted_cities, return_index=True, return_counts=True)
+        by_city = sorted(
+            ({"city": self._cities[c], "count": int(n), "median": round(float(np.median(sorted_values[s:s + n])), 1)}
+             for c, s, n in zip(ids, starts, sizes)),
+            key=lambda row: -row["count"],
+        )
+
+        return {
+            "role": name,
+            "city": normalize_city(city) if city else None,
+            "unit": "LPA",
+            "count": int(values.size),
+            "mean": round(float(values.mean()), 1),
+            "percentiles": {k: round(float(v), 1) for k, v in
+                            zip(("p10", "p25", "p50", "p75", "p90"), (p10, p25, p50, p75, p90))},
+            "histogram": {"edges": [round(float(e), 1) for e in edges], "counts": counts.tolist()},
+            "cities": by_city,
+            "updated_at": self.updated_at,
+        }
+
+_store: Optional[SalaryStore] = None
+_store_lock = threading.Lock()
+
+def get_salary_store() -> SalaryStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SalaryStore(Config.SALARY_DB_PATH)
+    return _store
+
+def record_postings(role: str, jobs: Iterable[dict]) -> int:
+    """Feed SerpAPI job results into the salary store."""
+    try:
+        return get_salary_store().add_postings(role, jobs)
+    except Exception as e:
+        logger.warning(f"Could not record salaries for {role}: {e}")
+        return 0
+
+def salary_stats(role: str, city: Optional[str] = None, bins: Optional[int] = None) -> Optional[dict]:
+    return get_salary_store().stats(role, city, bins)
+
+def salary_context(role: str) -> str:
+    """Observed salary numbers for a report prompt, or "" when there are too few postings."""
+    stats = salary_stats(role)
+    if not stats or stats["count"] < Config.SALARY_MIN_SAMPLES:
+        return ""
+    p = stats["percentiles"]
+    cities = ", ".join(f"{c['city']} {c['median']}" for c in stats["cities"][:5])
+    return (f"Observed salaries from {stats['count']} collected job postings (LPA): "
+            f"p10 {p['p10']}, p25 {p['p25']}, median {p['p50']}, p75 {p['p75']}, p90 {p['p90']}. "
+            f"Median by city: {cities}.")
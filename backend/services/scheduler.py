@@ -0,0 +1,138 @@
+import threading
+import contextvars
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from backend.config import Config
+from backend.utils import deadline
+
+# Shared pools: one bounded thread pool for batch and background upstream (LLM/search)
+# work so its concurrency stays within provider rate limits, a separate interactive lane
+# so requests never queue behind that work, and one process pool for CPU-bound parsing.
+_llm_executor = None
+_interactive_executor = None
+_io_executor = None
+_process_pool = None
+_lock = threading.Lock()
+
+# Speculative work (prefetch) runs marked as background and yields to interactive
+# requests; only interactive calls count towards the upstream load.
+_background: contextvars.ContextVar[bool] = contextvars.ContextVar("background", default=False)
+_interactive = 0
+_interactive_lock = threading.Lock()
+
+def _get_llm_executor() -> ThreadPoolExecutor:
+    global _llm_executor
+    if _llm_executor is None:
+        with _lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(
+                    max_workers=Config.LLM_MAX_CONCURRENCY, thread_name_prefix="llm"
+                )
+    return _llm_executor
+
+def _get_interactive_executor() -> ThreadPoolExecutor:
+    global _interactive_executor
+    if _interactive_executor is None:
+        with _lock:
+            if _interactive_executor is None:
+                _interactive_executor = ThreadPoolExecutor(
+                    max_workers=Config.INTERACTIVE_MAX_CONCURRENCY, thread_name_prefix="interactive"
+                )
+    return _interactive_executor
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    # Separate from the LLM pool: report generation running on that pool fans
+    # out searches here, and must never wait on its own pool's free slots
+    global _io_executor
+    if _io_executor is None:
+        with _lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=Config.SEARCH_MAX_CONCURRENCY, thread_name_prefix="search"
+                )
+    return _io_executor
+
+def _get_process_pool(reset: bool = False) -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None or reset:
+        with _lock:
+            if _process_pool is None or reset:
+                if _process_pool is not None:
+                    _process_pool.shutdown(wait=False, cancel_futures=True)
+                # spawn avoids forking a multi-threaded server process
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=Config.EXTRACT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _process_pool
+
+def submit_cpu(fn, *args) -> Future:
+    """Run a picklable, CPU-bound fn in the process pool, replacing the pool if a worker died."""
+    try:
+        return _get_process_pool().submit(fn, *args)
+    except BrokenProcessPool:
+        return _get_process_pool(reset=True).submit(fn, *args)
+
+def _track(future: Future) -> Future:
+    global _interactive
+    if not _background.get():
+        with _interactive_lock:
+            _interactive += 1
+        future.add_done_callback(_interactive_done)
+    return future
+
+def submit(fn, *args, **kwargs) -> Future:
+    """Run batch or background fn on the shared upstream pool, carrying the caller's context variables."""
+    ctx = contextvars.copy_context()
+    return _track(_get_llm_executor().submit(ctx.run, fn, *args, **kwargs))
+
+def submit_interactive(fn, *args, **kwargs) -> Future:
+    """Run fn for a waiting user on the interactive lane, carrying the caller's context variables."""
+    ctx = contextvars.copy_context()
+    return _track(_get_interactive_executor().submit(ctx.run, fn, *args, **kwargs))
+
+def _interactive_done(_future: Future) -> None:
+    global _interactive
+    with _interactive_lock:
+        _interactive -= 1
+
+def upstream_load() -> int:
+    """Interactive calls queued or running on the upstream pool or the interactive lane."""
+    return _interactive
+
+@contextmanager
+def background():
+    """Mark work in this block (and what it submits) as low-priority background work."""
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+def submit_io(fn, *args, **kwargs) -> Future:
+    """Run a short upstream I/O call (web search) on its own bounded pool, with the caller's context."""
+    ctx = contextvars.copy_context()
+    return _get_io_executor().submit(ctx.run, fn, *args, **kwargs)
+
+def in_upstream_pool() -> bool:
+    return threading.current_thread().name.startswith(("llm", "interactive"))
+
+def call_with_deadline(fn, *args, **kwargs):
+    """
+    Call fn, but stop waiting once the current deadline passes. The call runs
+    on the interactive lane so a hung SDK call (or its retries) can't hold the
+    request past its deadline; the worker sees the expired deadline and stops
+    at its next check. Inside a pool (or without a deadline) fn runs inline.
+    """
+    remaining = deadline.remaining()
+    if remaining is None or in_upstream_pool():
+        return fn(*args, **kwargs)
+    deadline.check()
+    future = submit_interactive(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=remaining)
+    except TimeoutError:
+        future.cancel()
+        raise deadline.DeadlineExceeded()
@@ -0,0 +1,139 @@
+import re
+import logging
+from concurrent.futures import wait
+from typing import Dict, List, Optional
+from backend.config import Config
+from backend.services import scheduler
+from backend.services.cache_service import report_cache, make_key
+from backend.utils import deadline
+from backend.utils.resume_utils import estimate_tokens
+from backend.utils.tracing import span, user_input
+
+logger = logging.getLogger(__name__)
+
+# Fixed retrieval plan for a market report: one query per aspect
+MARKET_QUERIES = {
+    "salary": "{role} salary in India per annum fresher experienced",
+    "companies": "top companies hiring {role} in India",
+    "cities": "{role} jobs demand Bangalore Hyderabad Pune Mumbai Delhi NCR",
+    "remote": "{role} remote work jobs India trend",
+    "skills": "{role} skills in demand India hiring trends",
+}
+
+MAX_SNIPPET_CHARS = 300
+
+def search_web(query: str, engine: str = "google", api_key: Optional[str] = None) -> dict:
+    """
+    One SerpAPI search, cached by (engine, query) for SEARCH_CACHE_TTL.
+    Errors return {} and are not cached.
+    """
+    key = make_key("serp", engine, query.strip().casefold())
+    cached = report_cache.get(key)
+    with span("serpapi.search", "CLIENT", **{"serpapi.engine": engine, **user_input(**{"serpapi.query": query}),
+                                            "cache.hit": cached is not None}) as s:
+        if cached is not None:
+            return cached
+        api_key = api_key or Config.SERPAPI_KEY
+        if not api_key:
+            logger.error("SerpAPI key is missing in search_web")
+            return {}
+        deadline.check()
+
+        from serpapi import GoogleSearch
+
+        search = GoogleSearch({"engine": engine, "q": query, "hl": "en", "gl": "in", "api_key": api_key})
+        remaining = deadline.remaining()
+        search.timeout = min(Config.SERPAPI_TIMEOUT, remaining) if remaining is not None else Config.SERPAPI_TIMEOUT
+        results = search.get_dict()
+        if "error" in results:
+            logger.error(f"SerpAPI error for '{query}': {results['error']}")
+            s.set_attribute("serpapi.error", results["error"])
+            return {}
+        report_cache.set(key, results, ttl=Config.SEARCH_CACHE_TTL)
+        return results
+
+def extract_snippets(results: dict) -> List[dict]:
+    """Title/snippet/link records from answer boxes and organic results, in rank order."""
+    snippets = []
+    answer = results.get("answer_box") or {}
+    if answer.get("snippet") or answer.get("answer"):
+        snippets.append({"title": answer.get("title", ""), "snippet": answer.get("snippet") or answer.get("answer"),
+                         "link": answer.get("link", "")})
+    for item in results.get("organic_results", []):
+        text = item.get("snippet") or ""
+        highlighted = item.get("rich_snippet", {}).get("top", {}).get("extensions") or []
+        if highlighted:
+            text = f"{text} ({'; '.join(map(str, highlighted))})"
+        if text:
+            snippets.append({"title": item.get("title", ""), "snippet": text, "link": item.get("link", "")})
+    return snippets
+
+def search_many(queries: Dict[str, str]) -> Dict[str, List[dict]]:
+    """Run the queries concurrently on the search pool; returns snippets per aspect."""
+    futures = {scheduler.submit_io(search_web, query): aspect for aspect, query in queries.items()}
+    done, not_done = wait(futures, timeout=deadline.remaining())
+    for future in not_done:
+        future.cancel()
+    snippets = {}
+    # Keep the caller's aspect order, not completion order, so prompts are stable
+    for future, aspect in futures.items():
+        if future not in done:
+            continue
+        try:
+            snippets[aspect] = extract_snippets(future.result())
+        except Exception as e:
+            logger.warning(f"Search for {aspect} failed: {e}")
+            snippets[aspect] = []
+    if not_done:
+        logger.warning(f"{len(not_done)} searches not finished before the deadline")
+    return snippets
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\W+", " ", text.casefold()).strip()
+
+def compress_context(snippets: Dict[str, List[dict]], token_budget: int, per_aspect: int) -> tuple:
+    """
+    Dedupe snippets, clip them, and interleave aspects round-robin until the
+    token budget is spent, so every aspect gets represented. Returns
+    (context text with [n] source markers, list of sources).
+    """
+    seen = set()
+    queues = {}
+    for aspect, items in snippets.items():
+        kept = []
+        for item in items:
+            fingerprint = _normalize(item["snippet"])[:120]
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            kept.append(item)
+            if len(kept) >= per_aspect:
+                break
+        queues[aspect] = kept
+
+    lines, sources, used = [], [], 0
+    for rank in range(per_aspect):
+        for aspect, items in queues.items():
+            if rank >= len(items):
+                continue
+            item = items[rank]
+            snippet = item["snippet"].strip()
+            if len(snippet) > MAX_SNIPPET_CHARS:
+                snippet = snippet[:MAX_SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+            line = f"[{len(sources) + 1}] ({aspect}) {item['title']}: {snippet}"
+            cost = estimate_tokens(line)
+            if used + cost > token_budget:
+                return "\n".join(lines), sources
+            used += cost
+            lines.append(line)
+            sources.append({"n": len(sources) + 1, "title": item["title"], "link": item["link"]})
+    return "\n".join(lines), sources
+
+def build_market_context(role: str) -> tuple:
+    """Retrieval phase for a market report: parallel searches, then a bounded context."""
+    queries = {aspect: template.format(role=role) for aspect, template in MARKET_QUERIES.items()}
+    with span("market.retrieval", **{"retrieval.queries": len(queries)}) as s:
+        snippets = search_many(queries)
+        context, sources = compress_context(snippets, Config.MARKET_CONTEXT_TOKENS, Config.MARKET_RESULTS_PER_QUERY)
+        s.set_attributes({"retrieval.sources": len(sources), "retrieval.context_tokens": estimate_tokens(context)})
+    return context, sources
@@ -0,0 +1,119 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional
+from backend.config import Config
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time (or was abandoned by the client)."""
+
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message)
+
+class Deadline:
+    """
+    Absolute point in time by which a request's work must finish. Shared by
+    reference with worker threads (contextvars are copied on submit), so
+    cancel() stops work everywhere the request fanned out to.
+    """
+
+    def __init__(self, seconds: float, parent: Optional["Deadline"] = None):
+        expires_at = time.monotonic() + seconds
+        self.expires_at = min(expires_at, parent.expires_at) if parent else expires_at
+        self.parent = parent
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> float:
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or (self.parent is not None and self.parent.cancelled)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded("Request cancelled" if self.cancelled else "Request deadline exceeded")
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None when no deadline is set."""
+    d = _current.get()
+    return d.remaining() if d else None
+
+def expired() -> bool:
+    d = _current.get()
+    return d is not None and d.expired()
+
+def check() -> None:
+    d = _current.get()
+    if d is not None:
+        d.check()
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Run a block under a deadline, never later than an enclosing one."""
+    d = Deadline(seconds, parent=_current.get())
+    token = _current.set(d)
+    try:
+        yield d
+    finally:
+        _current.reset(token)
+
+def _stream_within(d: Deadline, iterable):
+    """Iterate a streamed body under its request's deadline; cancel it if the client goes away."""
+    iterator = iter(iterable)
+    try:
+        while True:
+            token = _current.set(d)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _current.reset(token)
+            yield item
+    finally:
+        d.cancel()
+        close = getattr(iterator, "close", None)
+        if close:
+            close()
+
+def with_deadline(seconds: float):
+    """
+    Route decorator: give the request `seconds` to finish, or what the client
+    asks for in X-Request-Timeout (capped at MAX_REQUEST_TIMEOUT). Streamed
+    bodies keep the deadline while they are generated.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import make_response, request
+
+            budget = seconds
+            header = request.headers.get("X-Request-Timeout")
+            if header:
+                try:
+                    budget = min(max(float(header), 0.0), Config.MAX_REQUEST_TIMEOUT)
+                except ValueError:
+                    pass
+            with deadline_scope(budget) as d:
+                response = make_response(view(*args, **kwargs))
+            if response.is_streamed and not response.direct_passthrough:
+                response.response = _stream_within(d, response.response)
+            return response
+        return wrapper
+    return decorator
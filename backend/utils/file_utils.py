@@ -1,22 +1,78 @@
 import os
 import io
-import PyPDF2
-import docx
+import zipfile
+from backend.config import Config
+from backend.services.cache_service import report_cache, make_key
+from backend.utils.resume_utils import PAGE_BREAK
 
-def extract_text_from_file(file):
-    filename = file.filename.lower()
+SUPPORTED_EXTENSIONS = ('.txt', '.pdf', '.docx', '.doc')
+
+def extract_text_from_bytes(filename, data):
+    filename = filename.lower()
     content = ""
     
     if filename.endswith('.txt'):
-        content = file.read().decode('utf-8')
+        content = data.decode('utf-8')
     
     elif filename.endswith('.pdf'):
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
-        for page in pdf_reader.pages:
-            content += page.extract_text() + "\n"
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+        content = f"\n{PAGE_BREAK}".join(page.extract_text() for page in pdf_reader.pages)
     
     elif filename.endswith('.docx') or filename.endswith('.doc'):
-        doc = docx.Document(io.BytesIO(file.read()))
+        import docx
+        doc = docx.Document(io.BytesIO(data))
         content = "\n".join([paragraph.text for paragraph in doc.paragraphs])
     
     return content.strip()
+
+def text_cache_key(filename, data):
+    # Keyed by the raw bytes so a re-upload of the same file skips parsing
+    return make_key("resume_text", os.path.splitext(filename.lower())[1], data)
+
+def extract_text_from_file(file, use_cache=True):
+    data = file.read()
+    use_cache = use_cache and Config.RESUME_CACHE_ENABLED
+    cache_key = text_cache_key(file.filename, data)
+    
+    if use_cache:
+        cached = report_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    content = extract_text_from_bytes(file.filename, data)
+    if use_cache and content:
+        report_cache.set(cache_key, content, ttl=Config.RESUME_CACHE_TTL)
+    return content
+
+def read_batch_uploads(files):
+    """
+    Flatten uploaded files and zip archives into (filename, bytes) pairs.
+    Unsupported entries are skipped; limits come from Config.BATCH_*.
+    """
+    entries = []
+    for file in files:
+        if not file or file.filename == '':
+            continue
+        name = file.filename
+        if name.lower().endswith('.zip'):
+            with zipfile.ZipFile(io.BytesIO(file.read())) as archive:
+                for info in archive.infolist():
+                    base = os.path.basename(info.filename)
+                    if info.is_dir() or base.startswith('.') or '__MACOSX' in info.filename:
+                        continue
+                    if not base.lower().endswith(SUPPORTED_EXTENSIONS):
+                        continue
+                    if info.file_size > Config.BATCH_MAX_FILE_BYTES:
+                        raise ValueError(f"{info.filename} exceeds the per-file size limit")
+                    entries.append((info.filename, archive.read(info)))
+                    if len(entries) > Config.BATCH_MAX_FILES:
+                        raise ValueError(f"Batch exceeds {Config.BATCH_MAX_FILES} files")
+        elif name.lower().endswith(SUPPORTED_EXTENSIONS):
+            data = file.read()
+            if len(data) > Config.BATCH_MAX_FILE_BYTES:
+                raise ValueError(f"{name} exceeds the per-file size limit")
+            entries.append((name, data))
+            if len(entries) > Config.BATCH_MAX_FILES:
+                raise ValueError(f"Batch exceeds {Config.BATCH_MAX_FILES} files")
+    return entries
@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import logging
+from datetime import datetime, timezone
+from flask import Response, abort, jsonify, request
+from backend.config import Config
+
+# Optional: Brotli compresses markdown noticeably better than gzip
+try:
+    import brotli
+    HAVE_BROTLI = True
+except Exception:
+    HAVE_BROTLI = False
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/javascript", "text/html", "text/css",
+    "text/javascript", "text/plain", "text/markdown", "image/svg+xml",
+)
+
+def _pick_encoding(accept_encoding):
+    accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+    if HAVE_BROTLI and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def _compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=Config.BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=Config.GZIP_LEVEL)
+
+def _weaken_etag(response):
+    # The encoded bytes differ from the identity representation
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+def compress_response(response):
+    """after_request hook: gzip/brotli for buffered, compressible responses."""
+    response.vary.add("Accept-Encoding")
+    encoding = _pick_encoding(request.headers.get("Accept-Encoding", ""))
+    if not encoding or "Content-Encoding" in response.headers:
+        return response
+    if response.status_code == 304:
+        # Keep the validator identical to the compressed 200 it confirms
+        _weaken_etag(response)
+        return response
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or not 200 <= response.status_code < 300
+        or response.status_code == 204
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < Config.COMPRESS_MIN_BYTES:
+        return response
+
+    response.set_data(_compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    _weaken_etag(response)
+    return response
+
+def conditional_json(payload, last_modified=None):
+    """
+    JSON response with ETag and Last-Modified validators; GET/HEAD requests
+    that already hold this version get a 304.
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    if last_modified:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    # Cacheable per user, but always revalidated
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+class StaticAssets:
+    """
+    Content-hashed URLs for files under the static folder, with gzip/brotli
+    variants built once at startup and served with immutable cache headers.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._files = {}
+        for root, _, names in os.walk(folder):
+            for name in names:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, folder).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    raw = f.read()
+                mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                variants = {None: raw}
+                if mimetype in COMPRESSIBLE_TYPES and len(raw) >= Config.COMPRESS_MIN_BYTES:
+                    variants["gzip"] = gzip.compress(raw, compresslevel=9)
+                    if HAVE_BROTLI:
+                        variants["br"] = brotli.compress(raw, quality=11)
+                digest = hashlib.sha256(raw).hexdigest()[:12]
+                self._files[rel] = {"digest": digest, "mimetype": mimetype, "variants": variants}
+        logger.info(f"Fingerprinted {len(self._files)} static assets")
+
+    def url(self, filename):
+        entry = self._files.get(filename)
+        if entry is None:
+            return f"/static/{filename}"
+        return f"/assets/{entry['digest']}/{filename}"
+
+    def serve(self, digest, filename):
+        entry = self._files.get(filename)
+        if entry is None:
+            abort(404)
+        encoding = _pick_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding not in entry["variants"]:
+            encoding = None
+        response = Response(entry["variants"][encoding], mimetype=entry["mimetype"])
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if digest == entry["digest"]:
+            response.cache_control.public = True
+            response.cache_control.max_age = Config.STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # Stale fingerprint from an old page: serve current bytes, but don't pin them
+            response.cache_control.no_cache = True
+        return response
+
+def init_http_caching(app):
+    assets = StaticAssets(app.static_folder)
+    app.jinja_env.globals["asset_url"] = assets.url
+    app.add_url_rule("/assets/<digest>/<path:filename>", "assets", assets.serve)
+    app.after_request(compress_response)
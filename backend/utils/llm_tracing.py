@@ -0,0 +1,258 @@
+import threading
+from typing import Any, Dict, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from backend.utils import deadline
+from backend.utils.tracing import Span, current_span, start_span, user_input
+
+# Long prompts/inputs are clipped before they become span attributes
+MAX_ATTRIBUTE_CHARS = 300
+
+def _clip(text: Any) -> str:
+    text = str(text)
+    return text if len(text) <= MAX_ATTRIBUTE_CHARS else text[:MAX_ATTRIBUTE_CHARS] + "…"
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Turns LangChain callbacks into spans: one per agent run, per ReAct step,
+    per LLM call (with token usage) and per tool call. Spans hang off the
+    span that was current when the run started, so they land under the
+    Flask request and service spans.
+    """
+
+    def __init__(self):
+        self._spans: Dict[UUID, Span] = {}
+        self._parents: Dict[UUID, Optional[UUID]] = {}
+        # agent run id -> {"span", "steps", "step"}
+        self._agents: Dict[UUID, dict] = {}
+        self._lock = threading.Lock()
+
+    def _agent_for(self, run_id: Optional[UUID]) -> Optional[dict]:
+        while run_id is not None:
+            if run_id in self._agents:
+                return self._agents[run_id]
+            run_id = self._parents.get(run_id)
+        return None
+
+    def _parent_span(self, run_id: Optional[UUID]) -> Optional[Span]:
+        agent = self._agent_for(run_id)
+        if agent is not None:
+            if agent["step"] is None:
+                agent["steps"] += 1
+                agent["step"] = start_span("agent.step", parent=agent["span"], **{"agent.step": agent["steps"]})
+            return agent["step"]
+        while run_id is not None:
+            if run_id in self._spans:
+                return self._spans[run_id]
+            run_id = self._parents.get(run_id)
+        return current_span()
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, kind: str, **attributes) -> None:
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            self._spans[run_id] = start_span(name, kind, parent=self._parent_span(parent_run_id), **attributes)
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        with self._lock:
+            self._parents.pop(run_id, None)
+            s = self._spans.pop(run_id, None)
+        if s is not None:
+            if error is not None:
+                s.record_exception(error)
+            s.end()
+        return s
+
+    def _end_step(self, agent_run_id: UUID, **attributes) -> None:
+        with self._lock:
+            agent = self._agents.get(agent_run_id)
+            step = agent and agent["step"]
+            if step:
+                agent["step"] = None
+        if step:
+            step.set_attributes(attributes)
+            step.end()
+
+    # Chains: only agent executors get spans; others just link parents
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or ""
+        if name != "AgentExecutor":
+            with self._lock:
+                self._parents[run_id] = parent_run_id
+            return
+        self._start(run_id, parent_run_id, "agent", "INTERNAL", **user_input(**{"agent.input": _clip(inputs.get("input", ""))}))
+        with self._lock:
+            self._agents[run_id] = {"span": self._spans[run_id], "steps": 0, "step": None}
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        agent = self._agents.pop(run_id, None)
+        if agent is not None:
+            self._end_step(run_id)
+            agent["span"].set_attribute("agent.steps", agent["steps"])
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        agent = self._agents.get(run_id)
+        if agent is not None:
+            self._end_step(run_id)
+            self._agents.pop(run_id, None)
+        self._end(run_id, error)
+
+    # LLM calls
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start_llm(serialized, run_id, parent_run_id, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start_llm(serialized, run_id, parent_run_id, kwargs)
+
+    def _start_llm(self, serialized, run_id, parent_run_id, kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (serialized or {}).get("name", "llm")
+        self._start(run_id, parent_run_id, f"llm {model}", "CLIENT",
+                    **{"gen_ai.system": "gemini", "gen_ai.request.model": model})
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        s = self._spans.get(run_id)
+        if s is not None:
+            s.set_attributes(_usage(response))
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+    # Agent steps and tools
+    def on_agent_action(self, action, *, run_id, **kwargs):
+        with self._lock:
+            step = self._parent_span(run_id) if run_id in self._agents else None
+        if step is not None:
+            step.set_attributes({"agent.tool": action.tool, **user_input(**{"agent.tool_input": _clip(action.tool_input)})})
+
+    def on_agent_finish(self, finish, *, run_id, **kwargs):
+        self._end_step(run_id, **{"agent.final": True})
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, parent_run_id, f"tool {name}", "INTERNAL",
+                    **{"tool.name": name, **user_input(**{"tool.input": _clip(input_str)})})
+
+    def on_tool_end(self, output, *, run_id, parent_run_id=None, **kwargs):
+        s = self._spans.get(run_id)
+        if s is not None:
+            s.set_attribute("tool.output_chars", len(str(output)))
+        self._end(run_id)
+        if parent_run_id in self._agents:
+            self._end_step(parent_run_id)
+
+    def on_tool_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end(run_id, error)
+        if parent_run_id in self._agents:
+            self._end_step(parent_run_id)
+
+def _usage(response) -> dict:
+    """Token counts from an LLMResult (message usage_metadata, else llm_output)."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+    if not (input_tokens or output_tokens):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    if not (input_tokens or output_tokens):
+        return {}
+    return {"gen_ai.usage.input_tokens": input_tokens, "gen_ai.usage.output_tokens": output_tokens}
+
+class DeadlineGuard(BaseCallbackHandler):
+    """
+    Per-call handler that aborts an agent run between steps once the request
+    deadline passes, keeping the tool observations gathered so far.
+    """
+
+    raise_error = True
+
+    def __init__(self):
+        self.observations = []
+        self._pending = {}
+
+    def _check(self, *args, **kwargs):
+        deadline.check()
+
+    on_chain_start = on_llm_start = on_chat_model_start = _check
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        deadline.check()
+        self._pending[run_id] = ((serialized or {}).get("name", "tool"), input_str)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        tool, tool_input = self._pending.pop(run_id, ("tool", ""))
+        self.observations.append((tool, tool_input, str(output)))
+        deadline.check()
+
+class AgentEventStreamer(BaseCallbackHandler):
+    """
+    Per-call handler that reports a ReAct agent's progress through
+    emit(kind, payload): a "step" per tool call, an "observation" per tool
+    result, and "token" events for the text after "Final Answer:". Tokens
+    are relayed as they arrive when the model streams; otherwise the answer
+    is emitted in one piece when its LLM call ends. Thoughts and tool
+    syntax are never emitted as tokens.
+    """
+
+    MARKER = "Final Answer:"
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.answered = False
+        self._tails: Dict[UUID, str] = {}
+        self._answering = set()
+
+    def on_agent_action(self, action, *, run_id, **kwargs):
+        self.emit("step", {"tool": action.tool, "input": _clip(action.tool_input)})
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self.emit("observation", {"chars": len(str(output)), "preview": _clip(output)})
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if run_id in self._answering:
+            self.emit("token", token)
+            return
+        buf = self._tails.get(run_id, "") + token
+        idx = buf.find(self.MARKER)
+        if idx < 0:
+            # Keep just enough to spot a marker split across tokens
+            self._tails[run_id] = buf[-len(self.MARKER):]
+            return
+        self._tails.pop(run_id, None)
+        self._answering.add(run_id)
+        self.answered = True
+        rest = buf[idx + len(self.MARKER):].lstrip()
+        if rest:
+            self.emit("token", rest)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        streamed = run_id in self._answering or run_id in self._tails
+        self._tails.pop(run_id, None)
+        self._answering.discard(run_id)
+        if streamed:
+            return
+        # Not streamed token by token: emit the final answer now
+        text = "".join(g.text for generations in response.generations for g in generations)
+        idx = text.find(self.MARKER)
+        if idx >= 0:
+            self.answered = True
+            rest = text[idx + len(self.MARKER):].strip()
+            if rest:
+                self.emit("token", rest)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._tails.pop(run_id, None)
+        self._answering.discard(run_id)
+
+_handler: Optional[TracingCallbackHandler] = None
+
+def get_callback_handler() -> TracingCallbackHandler:
+    global _handler
+    if _handler is None:
+        _handler = TracingCallbackHandler()
+    return _handler
@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+import hmac
+import pstats
+import random
+import logging
+import cProfile
+import threading
+from typing import Optional
+from backend.config import Config
+from backend.utils.tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+# cProfile hooks are process-wide on newer Pythons, and the overhead should
+# stay bounded anyway: at most one request is profiled at a time.
+_profile_lock = threading.Lock()
+_last_sampled = 0.0
+
+def _requested_by_admin(header_value: Optional[str]) -> bool:
+    token = Config.PROFILE_ADMIN_TOKEN
+    return bool(token and header_value and hmac.compare_digest(header_value, token))
+
+def _should_sample() -> bool:
+    global _last_sampled
+    if Config.PROFILE_SAMPLE_RATE <= 0 or random.random() >= Config.PROFILE_SAMPLE_RATE:
+        return False
+    now = time.monotonic()
+    if now - _last_sampled < Config.PROFILE_MIN_INTERVAL:
+        return False
+    _last_sampled = now
+    return True
+
+def _prune(folder: str) -> None:
+    files = sorted(
+        (os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".prof")),
+        key=os.path.getmtime,
+    )
+    for path in files[:-Config.PROFILE_MAX_FILES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _save(profiler: cProfile.Profile, path: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+        _prune(os.path.dirname(path))
+    except Exception as e:
+        logger.warning(f"Could not save profile {path}: {e}")
+
+def init_profiling(app):
+    """
+    cProfile individual requests: on demand when the admin token is sent in
+    the X-Profile header, or for a sampled fraction of traffic
+    (PROFILE_SAMPLE_RATE, at most one per PROFILE_MIN_INTERVAL seconds).
+    Profiles are written to PROFILE_DIR as .prof files for pstats/snakeviz.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_profile():
+        forced = _requested_by_admin(request.headers.get("X-Profile"))
+        if not (forced or _should_sample()):
+            return
+        if not _profile_lock.acquire(blocking=False):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) already owns the hook
+            _profile_lock.release()
+            return
+        route = request.url_rule.rule if request.url_rule else request.path
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method}{route.replace('/', '_')}-{os.getpid()}-{random.randrange(16 ** 6):06x}.prof"
+        g.profile = (profiler, name, forced, time.perf_counter())
+
+    @app.after_request
+    def _tag_profile(response):
+        profile = g.get("profile")
+        if profile is not None and profile[2]:
+            response.headers["X-Profile-Id"] = profile[1]
+        return response
+
+    @app.teardown_request
+    def _stop_profile(exc):
+        profile = g.pop("profile", None)
+        if profile is None:
+            return
+        profiler, name, forced, started = profile
+        try:
+            profiler.disable()
+        finally:
+            _profile_lock.release()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        span = current_span()
+        if span is not None:
+            span.set_attribute("profile.file", name)
+        logger.info(f"Profiled {request.method} {request.path} ({'admin' if forced else 'sampled'}, {elapsed_ms:.0f} ms) -> {name}")
+        # Serialize off the request thread
+        threading.Thread(target=_save, args=(profiler, os.path.join(Config.PROFILE_DIR, name)), daemon=True).start()
+
+if __name__ == "__main__":
+    # python -m backend.utils.profiling [file.prof] [limit] -- defaults to the newest profile
+    folder = Config.PROFILE_DIR
+    path = sys.argv[1] if len(sys.argv) > 1 else max(
+        (os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".prof")),
+        key=os.path.getmtime,
+    )
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    print(path)
+    pstats.Stats(path).strip_dirs().sort_stats("cumulative").print_stats(limit)
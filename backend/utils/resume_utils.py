@@ -0,0 +1,148 @@
+import re
+import logging
+from collections import Counter
+from backend.utils.text_utils import normalize_whitespace
+
+logger = logging.getLogger(__name__)
+
+# Canonical section -> headings seen in real resumes
+SECTION_ALIASES = {
+    "summary": ["summary", "professional summary", "career summary", "objective", "career objective",
+                "profile", "professional profile", "about me"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "internships", "internship", "internship experience"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "skills & tools",
+               "tools & technologies", "technologies", "competencies"],
+    "education": ["education", "academic background", "academics", "academic qualifications",
+                  "educational qualifications", "qualifications"],
+    "projects": ["projects", "academic projects", "key projects", "personal projects"],
+    "certifications": ["certifications", "certificates", "courses", "licenses & certifications",
+                       "trainings", "training"],
+    "achievements": ["achievements", "awards", "honors", "honours", "accomplishments",
+                     "awards & achievements"],
+    "other": ["hobbies", "interests", "languages", "extracurricular activities", "activities",
+              "volunteering", "declaration", "references", "personal details", "personal information"],
+}
+
+# Sections are kept in this order of importance when trimming to the budget
+SECTION_PRIORITY = ["header", "summary", "experience", "skills", "projects", "education",
+                    "certifications", "achievements", "other"]
+
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+_HEADING_STRIP_RE = re.compile(r"^[\W_]+|[\W_]+$")
+_PAGE_MARKER_RE = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s*(of|/)\s*\d+)$", re.IGNORECASE)
+
+# Extractors separate PDF pages with a form feed, so running headers and footers can be told from content
+PAGE_BREAK = "\f"
+
+# Lines at the top and bottom of each page checked for running headers/footers
+PAGE_EDGE_LINES = 2
+
+def estimate_tokens(text):
+    # ~4 characters per token is close enough for Gemini-style tokenizers
+    return (len(text) + 3) // 4
+
+def _detect_heading(line):
+    if len(line) > 40:
+        return None
+    key = _HEADING_STRIP_RE.sub("", line).lower()
+    return _HEADING_LOOKUP.get(key)
+
+def split_sections(lines):
+    """
+    Group lines under detected headings. Lines before the first heading
+    (name, contact details) form the "header" section.
+    """
+    sections = [["header", []]]
+    for line in lines:
+        section = _detect_heading(line)
+        if section:
+            sections.append([section, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+def _page_furniture(pages):
+    """
+    Running headers and footers: lines (casefolded) among the first lines of
+    two or more pages, and lines among the last lines of two or more pages.
+    """
+    tops, bottoms = Counter(), Counter()
+    for page in pages:
+        tops.update({line.casefold() for line in page[:PAGE_EDGE_LINES]})
+        bottoms.update({line.casefold() for line in page[-PAGE_EDGE_LINES:]})
+    return ({line for line, n in tops.items() if n > 1},
+            {line for line, n in bottoms.items() if n > 1})
+
+def _dedupe_lines(pages):
+    """
+    Drop page markers ("Page 2", "2 of 3", "2/3") and repeats of running
+    headers/footers at page edges, keeping their first occurrence. Content
+    lines are never deduplicated: two jobs may share a bullet or a year.
+    """
+    headers, footers = _page_furniture(pages) if len(pages) > 1 else (set(), set())
+    seen = set()
+    kept = []
+    for page in pages:
+        for i, line in enumerate(page):
+            if _PAGE_MARKER_RE.match(line):
+                continue
+            key = line.casefold()
+            if (key in headers and i < PAGE_EDGE_LINES) or (key in footers and i >= len(page) - PAGE_EDGE_LINES):
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+    return kept
+
+def _trim_to_budget(sections, token_budget):
+    order = sorted(range(len(sections)), key=lambda i: SECTION_PRIORITY.index(sections[i][0]))
+    kept = {}
+    remaining = token_budget
+    for idx in order:
+        name, body = sections[idx]
+        taken = []
+        spent = 0
+        for line in body:
+            cost = estimate_tokens(line) + 1
+            if spent + cost > remaining:
+                break
+            taken.append(line)
+            spent += cost
+        # A heading with none of its content is just noise
+        if name != "header" and len(taken) == 1 and len(body) > 1:
+            continue
+        if taken:
+            kept[idx] = taken
+            remaining -= spent
+        if remaining <= 0:
+            break
+    # Emit in the original reading order
+    return [(sections[i][0], kept[i]) for i in sorted(kept)]
+
+def preprocess_resume(text, token_budget=1500):
+    """
+    Deterministically compact extracted resume text before it goes into a prompt.
+    Returns (compacted_text, stats).
+    """
+    original = text or ""
+    pages = [normalize_whitespace(page).split("\n") for page in original.split(PAGE_BREAK)]
+    lines = _dedupe_lines([[line for line in page if line] for page in pages])
+    sections = split_sections(lines)
+    if token_budget and token_budget > 0:
+        sections = _trim_to_budget(sections, token_budget)
+    compacted = "\n\n".join("\n".join(body) for _, body in sections)
+
+    stats = {
+        "original_chars": len(original),
+        "compacted_chars": len(compacted),
+        "original_tokens": estimate_tokens(original),
+        "compacted_tokens": estimate_tokens(compacted),
+        "sections": [name for name, _ in sections],
+        "compression_ratio": round(len(compacted) / len(original), 3) if original else 1.0,
+    }
+    logger.info(
+        f"Resume pre-processing: {stats['original_tokens']} -> {stats['compacted_tokens']} tokens "
+        f"(ratio {stats['compression_ratio']}, sections={','.join(stats['sections'])})"
+    )
+    return compacted, stats
@@ -1,3 +1,33 @@
+import re
+import unicodedata
+
+_INLINE_WS_RE = re.compile(r"[ \t\f\v\u00a0]+")
+
+def normalize_whitespace(text):
+    """
+    Canonical form of extracted text: NFKC, collapsed inline whitespace,
+    stripped lines and no blank lines. Used for content hashing.
+    """
+    text = unicodedata.normalize("NFKC", text or "").replace("\r", "")
+    lines = (_INLINE_WS_RE.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+_BLANK_RUN_RE = re.compile(r"\n\n\n+")
+
+def _collapse(text):
+    # Each step is one linear, C-level pass; the old version looped over the whole string
+    if "\\n" in text:
+        text = text.replace("\\n", "\n")
+    if "\r" in text:
+        text = text.replace("\r", "")
+    return _BLANK_RUN_RE.sub("\n\n", text)
+
+def normalize_markdown(text):
+    """
+    Unescape literal "\\n", drop "\\r", cap blank lines at one and strip.
+    """
+    return _collapse(text).strip()
+
 def as_markdown(output):
     """
     Output cleaning helper for all model/agent outputs.
@@ -10,14 +40,51 @@ def as_markdown(output):
         val = val[start:]
         if val.endswith("'") or val.endswith('"'):
             val = val[:-1]
-    val = val.replace("\\n", "\n").replace("\r", "")
-    while "\n\n\n" in val:
-        val = val.replace("\n\n\n", "\n\n")
-    return val.strip()
-
-# Optional callback for streamed UI (depends on LangChain version)
-try:
-    from langchain_community.callbacks import StreamlitCallbackHandler
-    HAVE_STREAMLIT_CALLBACK = True
-except Exception:
-    HAVE_STREAMLIT_CALLBACK = False
+    return normalize_markdown(val)
+
+class MarkdownNormalizer:
+    """
+    Incremental normalize_markdown for streamed output. Joining every feed()
+    result and close() gives the same text as normalizing the whole stream,
+    regardless of where chunk boundaries fall.
+    """
+
+    def __init__(self):
+        self._tail = ""
+        self._started = False
+
+    def feed(self, chunk):
+        buf = self._tail + chunk
+        cut = _pending_tail_start(buf)
+        tail = buf[cut:]
+        # Pre-collapse what is held back so a long whitespace run is never rescanned
+        if tail.endswith("\\"):
+            self._tail = _collapse(tail[:-1]) + "\\"
+        else:
+            self._tail = _collapse(tail)
+        return self._emit(buf[:cut])
+
+    def close(self):
+        out = self._emit(self._tail, final=True)
+        self._tail = ""
+        return out
+
+    def _emit(self, text, final=False):
+        text = _collapse(text)
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        if final:
+            text = text.rstrip()
+        return text
+
+def _pending_tail_start(buf):
+    """
+    Index where the trailing run of whitespace and "\\n" escapes begins,
+    including a final backslash that the next chunk may turn into "\\n".
+    """
+    end = len(buf) - 1 if buf.endswith("\\") else len(buf)
+    cut = len(buf[:end].rstrip())
+    while buf.endswith("\\n", 0, cut):
+        cut = len(buf[:cut - 2].rstrip())
+    return cut
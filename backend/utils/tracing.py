@@ -0,0 +1,315 @@
+import os
+import sys
+import json
+import time
+import queue
+import random
+import logging
+import secrets
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, List, Optional
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds and status codes
+SPAN_KINDS = {"INTERNAL": 1, "SERVER": 2, "CLIENT": 3}
+STATUS_OK, STATUS_ERROR = 1, 2
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    """
+    One timed operation in a trace, shaped like an OpenTelemetry span.
+    Unsampled spans still propagate ids but record and export nothing.
+    """
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 kind: str = "INTERNAL", sampled: bool = True, attributes: Optional[dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.sampled = sampled
+        self.attributes: Dict[str, Any] = dict(attributes or {}) if sampled else {}
+        self.events: List[dict] = []
+        self.status = (0, "")
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled and value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def add_event(self, name: str, **attributes) -> None:
+        if self.sampled:
+            self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.add_event("exception", **{"exception.type": type(exc).__name__, "exception.message": str(exc)})
+        self.set_status(STATUS_ERROR, str(exc))
+
+    def set_status(self, code: int, message: str = "") -> None:
+        self.status = (code, message)
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.sampled:
+            _exporter().export(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": [
+                {"name": e["name"], "timeUnixNano": str(e["time_ns"]), "attributes": _otlp_attributes(e["attributes"])}
+                for e in self.events
+            ],
+            "status": {"code": self.status[0], "message": self.status[1]},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_attributes(attributes: dict) -> list:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+def parse_traceparent(header: Optional[str]):
+    """W3C traceparent -> (trace_id, parent_span_id, sampled), or None if malformed."""
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16), int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(int(parts[3], 16) & 1)
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+def start_span(name: str, kind: str = "INTERNAL", parent: Optional[Span] = None,
+               traceparent: Optional[str] = None, **attributes) -> Span:
+    """
+    Start a span under `parent` (default: the current span). Does not make it
+    current; use span() for that. A new trace is sampled at TRACE_SAMPLE_RATE.
+    """
+    parent = parent or current_span()
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, kind, parent.sampled, attributes)
+    remote = parse_traceparent(traceparent)
+    if remote:
+        trace_id, parent_id, sampled = remote
+        return Span(name, trace_id, parent_id, kind, sampled and Config.TRACING_ENABLED, attributes)
+    sampled = Config.TRACING_ENABLED and random.random() < Config.TRACE_SAMPLE_RATE
+    return Span(name, secrets.token_hex(16), None, kind, sampled, attributes)
+
+def user_input(**attributes) -> Dict[str, Any]:
+    """Span attributes carrying user text: kept only when TRACE_CAPTURE_INPUT is on."""
+    return attributes if Config.TRACE_CAPTURE_INPUT else {}
+
+@contextmanager
+def span(name: str, kind: str = "INTERNAL", **attributes):
+    """Run a block inside a new child span of the current one."""
+    s = start_span(name, kind, **attributes)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.record_exception(e)
+        raise
+    finally:
+        _current.reset(token)
+        s.end()
+
+def traced(name: Optional[str] = None, kind: str = "INTERNAL"):
+    """Decorator: wrap each call of a function in a span."""
+    def decorator(fn):
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def llm_config(*handlers, **config) -> dict:
+    """RunnableConfig that reports LLM, agent and tool runs as child spans (plus any extra handlers)."""
+    from backend.utils.llm_tracing import get_callback_handler
+    return {**config, "callbacks": [get_callback_handler(), *handlers]}
+
+class SpanExporter:
+    """
+    Batches finished spans on a background thread and writes them as OTLP JSON:
+    one span per line to TRACE_EXPORT_PATH and/or POSTed to TRACE_OTLP_ENDPOINT.
+    """
+
+    def __init__(self, path: Optional[str], endpoint: Optional[str]):
+        self.path = path
+        self.endpoint = endpoint
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=10000)
+        self._dropped = 0
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, s: Span) -> None:
+        try:
+            self._queue.put_nowait(s)
+        except queue.Full:
+            self._dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get(timeout=0.5))
+                except queue.Empty:
+                    break
+            try:
+                self._write([s.to_otlp() for s in batch])
+            except Exception as e:
+                logger.warning(f"Could not export {len(batch)} spans: {e}")
+
+    def _write(self, spans: List[dict]) -> None:
+        resource = {"attributes": _otlp_attributes({"service.name": Config.SERVICE_NAME})}
+        if self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) > Config.TRACE_MAX_BYTES:
+                os.replace(self.path, f"{self.path}.1")
+            with open(self.path, "a", encoding="utf-8") as f:
+                for s in spans:
+                    f.write(json.dumps(s, separators=(",", ":")) + "\n")
+        if self.endpoint:
+            import requests
+            payload = {"resourceSpans": [{
+                "resource": resource,
+                "scopeSpans": [{"scope": {"name": "backend.utils.tracing"}, "spans": spans}],
+            }]}
+            requests.post(self.endpoint, json=payload, timeout=5).raise_for_status()
+
+_span_exporter: Optional[SpanExporter] = None
+_exporter_lock = threading.Lock()
+
+def _exporter() -> SpanExporter:
+    global _span_exporter
+    if _span_exporter is None:
+        with _exporter_lock:
+            if _span_exporter is None:
+                _span_exporter = SpanExporter(Config.TRACE_EXPORT_PATH, Config.TRACE_OTLP_ENDPOINT)
+    return _span_exporter
+
+def init_tracing(app):
+    """Open a SERVER span per request, continuing an incoming W3C traceparent."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_span():
+        route = request.url_rule.rule if request.url_rule else request.path
+        s = start_span(
+            f"{request.method} {route}", "SERVER", traceparent=request.headers.get("traceparent"),
+            **{"http.request.method": request.method, "http.route": route, "url.path": request.path},
+        )
+        g.trace_span = s
+        g.trace_token = _current.set(s)
+
+    @app.after_request
+    def _tag_response(response):
+        s = g.get("trace_span")
+        if s is not None:
+            s.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                s.set_status(STATUS_ERROR)
+            response.headers["traceparent"] = s.traceparent
+        return response
+
+    @app.teardown_request
+    def _end_request_span(exc):
+        s = g.pop("trace_span", None)
+        if s is None:
+            return
+        if exc is not None:
+            s.record_exception(exc)
+        s.end()
+        try:
+            _current.reset(g.pop("trace_token"))
+        except (KeyError, ValueError):
+            # Streamed responses tear down in another context
+            pass
+
+def load_traces(path: str) -> Dict[str, List[dict]]:
+    traces: Dict[str, List[dict]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            s = json.loads(line)
+            traces.setdefault(s["traceId"], []).append(s)
+    return traces
+
+def format_trace(spans: List[dict]) -> str:
+    """Indented span tree with durations, for reading a slow request."""
+    by_parent: Dict[Optional[str], List[dict]] = {}
+    ids = {s["spanId"] for s in spans}
+    for s in spans:
+        parent = s.get("parentSpanId") if s.get("parentSpanId") in ids else None
+        by_parent.setdefault(parent, []).append(s)
+    lines = []
+
+    def walk(parent, depth):
+        for s in sorted(by_parent.get(parent, []), key=lambda s: int(s["startTimeUnixNano"])):
+            ms = (int(s["endTimeUnixNano"]) - int(s["startTimeUnixNano"])) / 1e6
+            attrs = {a["key"]: next(iter(a["value"].values())) for a in s.get("attributes", [])}
+            shown = ", ".join(f"{k}={v}" for k, v in attrs.items() if not k.startswith(("url.", "http.request")))
+            error = " !ERROR" if s.get("status", {}).get("code") == STATUS_ERROR else ""
+            lines.append(f"{'  ' * depth}{s['name']}  {ms:.1f} ms{error}  {shown}".rstrip())
+            walk(s["spanId"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    # python -m backend.utils.tracing [trace_id | --slowest N]
+    traces = load_traces(Config.TRACE_EXPORT_PATH)
+    args = sys.argv[1:]
+    if args and args[0] != "--slowest":
+        print(format_trace(traces.get(args[0], [])))
+    else:
+        count = int(args[1]) if len(args) > 1 else 5
+
+        def root_duration(spans):
+            return max(int(s["endTimeUnixNano"]) for s in spans) - min(int(s["startTimeUnixNano"]) for s in spans)
+
+        for trace_id, spans in sorted(traces.items(), key=lambda t: -root_duration(t[1]))[:count]:
+            print(f"trace {trace_id}\n{format_trace(spans)}\n")
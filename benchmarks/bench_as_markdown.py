@@ -0,0 +1,66 @@
+"""
+Micro-benchmark for the markdown normalizer on large synthetic model outputs.
+
+    python -m benchmarks.bench_as_markdown
+"""
+import random
+import timeit
+from backend.utils.text_utils import as_markdown, normalize_markdown, MarkdownNormalizer
+
+def legacy_as_markdown(val):
+    # The original loop-based implementation, kept here as the reference
+    val = val.replace("\\n", "\n").replace("\r", "")
+    while "\n\n\n" in val:
+        val = val.replace("\n\n\n", "\n\n")
+    return val.strip()
+
+def synthetic_report(size, seed=0):
+    rng = random.Random(seed)
+    pieces = ["\n"]
+    separators = ["\n", "\n\n", "\n\n\n\n", "\r\n", "\\n", "\\n\\n\\n", "\r\n\r\n\r\n", "  \n"]
+    words = ["## Career Overview", "- **Skill**: Python", "| Level | LPA |", "₹12 LPA", "Data", "roadmap"]
+    length = 0
+    while length < size:
+        piece = rng.choice(words) + " " + rng.choice(words) + rng.choice(separators)
+        pieces.append(piece)
+        length += len(piece)
+    return "".join(pieces) + "\n\n\n"
+
+def chunked(text, rng):
+    pos = 0
+    while pos < len(text):
+        step = rng.randint(1, 64)
+        yield text[pos:pos + step]
+        pos += step
+
+def check_equivalence():
+    rng = random.Random(42)
+    alphabet = ["a", " ", "\n", "\r", "\\", "n", "\\n", "\t"]
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = legacy_as_markdown(text)
+        assert normalize_markdown(text) == expected, repr(text)
+        normalizer = MarkdownNormalizer()
+        streamed = "".join(normalizer.feed(c) for c in chunked(text, rng)) + normalizer.close()
+        assert streamed == expected, repr(text)
+    print("equivalence: ok (5000 random inputs, random chunking)")
+
+def bench(label, text, number):
+    legacy = timeit.timeit(lambda: legacy_as_markdown(text), number=number) / number
+    current = timeit.timeit(lambda: as_markdown(text), number=number) / number
+
+    def streamed():
+        normalizer = MarkdownNormalizer()
+        for i in range(0, len(text), 256):
+            normalizer.feed(text[i:i + 256])
+        normalizer.close()
+
+    incremental = timeit.timeit(streamed, number=number) / number
+    print(f"{label:<28} legacy {legacy * 1000:8.2f} ms | as_markdown {current * 1000:8.2f} ms"
+          f" | incremental (256-char chunks) {incremental * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    check_equivalence()
+    for size in (20_000, 200_000, 2_000_000):
+        bench(f"report {size // 1000} KB", synthetic_report(size), number=20 if size < 1_000_000 else 3)
+    bench("newline flood 1 MB", "x" + "\n" * 1_000_000 + "y", number=3)
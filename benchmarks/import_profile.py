@@ -0,0 +1,58 @@
+"""
+Import-time profile for application startup.
+
+    python -m benchmarks.import_profile [--top 20]
+
+Runs `python -X importtime` on create_app() in a fresh interpreter, prints the
+slowest modules by cumulative time, and flags heavy SDKs that were loaded
+eagerly (they should only load on first use or warmup).
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = (
+    "langchain", "langchain_core", "langchain_community", "langchain_google_genai",
+    "google.generativeai", "serpapi", "PyPDF2", "docx", "numpy",
+)
+
+BOOT = (
+    "import sys, time; t = time.perf_counter(); "
+    "import backend.app as a; a.create_app(); "
+    "print('BOOT_MS', (time.perf_counter() - t) * 1000); "
+    f"print('LOADED', ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+def run(top):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT],
+        capture_output=True, text=True,
+    )
+    wall = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        print(proc.stderr)
+        sys.exit(proc.returncode)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    boot_ms = next(float(l.split()[1]) for l in proc.stdout.splitlines() if l.startswith("BOOT_MS"))
+    loaded = next(l.split(" ", 1)[1] if " " in l else "" for l in proc.stdout.splitlines() if l.startswith("LOADED"))
+
+    print(f"create_app() import+init: {boot_ms:.0f} ms (process wall {wall:.0f} ms, importtime overhead included)")
+    print(f"\nTop {top} modules by cumulative import time:")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, own, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:14.1f} {own / 1000:9.1f}  {name}")
+    print(f"\nHeavy SDKs loaded at startup: {loaded or 'none'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=20)
+    run(parser.parse_args().top)
@@ -71,6 +71,25 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
+    // Role autocomplete backed by /api/careers/search
+    let suggestTimer = null;
+    const suggestRoles = (query) => {
+        clearTimeout(suggestTimer);
+        const list = document.getElementById('role-suggestions');
+        if (!list || query.trim().length < 2) return;
+        suggestTimer = setTimeout(async () => {
+            try {
+                const response = await fetch(`/api/careers/search?q=${encodeURIComponent(query)}&limit=8`);
+                const data = await response.json();
+                list.innerHTML = (data.results || []).map(r =>
+                    `<option value="${r.role}">${r.category}</option>`
+                ).join('');
+            } catch (e) {
+                console.error('Role search failed:', e);
+            }
+        }, 120);
+    };
+
     const generateInsight = async (type) => {
         let payload = {};
         let endpoint = '';
@@ -108,10 +127,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
         setLoading(btnId, true);
         try {
-            const response = await fetch(endpoint, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(payload)
+            // GET lets the browser revalidate cached reports with If-None-Match
+            const response = await fetch(`${endpoint}?${new URLSearchParams(payload)}`, {
+                cache: 'no-cache'
             });
             const data = await response.json();
             console.log(`Response from ${endpoint}:`, data);
@@ -307,51 +325,134 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     };
 
+    // Streaming chat: one EventSource per page conversation; messages are posted
+    // alongside and the answer arrives as step and token events
+    const chat = { id: null, source: null, pending: null, renderQueued: false };
+
+    const renderMarkdown = (text) => {
+        try {
+            if (typeof marked.parse === 'function') return marked.parse(text);
+            if (typeof marked === 'function') return marked(text);
+        } catch (e) {
+            console.warn('Markdown render failed:', e);
+        }
+        return text;
+    };
+
+    const escapeHtml = (text) => String(text).replace(/[&<>"']/g, (c) => `&#${c.charCodeAt(0)};`);
+
+    const setChatStatus = (label) => {
+        const pending = chat.pending;
+        if (!pending || pending.text) return;
+        updateMessageInChat(pending.id, `<div class="flex items-center gap-2 text-slate-400"><div class="spinner-small"></div><span>${escapeHtml(label)}</span></div>`);
+    };
+
+    const renderPendingAnswer = () => {
+        chat.renderQueued = false;
+        if (chat.pending) updateMessageInChat(chat.pending.id, renderMarkdown(chat.pending.text));
+    };
+
+    const finishChatMessage = (answer, error) => {
+        const pending = chat.pending;
+        if (!pending) return;
+        chat.pending = null;
+        if (error) {
+            updateMessageInChat(pending.id, `<span class="text-red-500">Error: ${escapeHtml(error)}</span>`);
+            return;
+        }
+        updateMessageInChat(pending.id, renderMarkdown(answer));
+        state.chatHistory.push({ role: 'user', content: pending.message });
+        state.chatHistory.push({ role: 'ai', content: answer });
+    };
+
+    const closeChatStream = () => {
+        if (chat.source) chat.source.close();
+        chat.id = null;
+        chat.source = null;
+    };
+
+    const openChatStream = async () => {
+        if (chat.id) return chat.id;
+        // The visible turns go along, so a conversation the server lost continues with its context
+        const response = await fetch('/api/chat/conversations', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ history: state.chatHistory.slice(-12) })
+        });
+        const data = await response.json();
+        if (data.error) throw new Error(data.error);
+
+        chat.id = data.conversation_id;
+        const source = new EventSource(`/api/chat/conversations/${chat.id}/events`);
+        const on = (event, handler) => source.addEventListener(event, (e) => {
+            if (chat.pending && e.data) handler(JSON.parse(e.data));
+        });
+        on('status', () => setChatStatus('Thinking…'));
+        on('step', (step) => setChatStatus(step.tool === 'web_search' ? `Searching "${step.input}"…` : `Using ${step.tool}…`));
+        on('observation', () => setChatStatus('Search done'));
+        on('token', (token) => {
+            chat.pending.text += token.text;
+            if (!chat.renderQueued) {
+                chat.renderQueued = true;
+                requestAnimationFrame(renderPendingAnswer);
+            }
+        });
+        on('done', (done) => finishChatMessage(done.answer));
+        // Server "error" events carry data; connection errors don't (the browser reconnects)
+        on('error', (failure) => finishChatMessage(null, failure.error));
+        source.addEventListener('error', () => {
+            if (source.readyState === EventSource.CLOSED) {
+                // Conversation expired on the server: start a new one (with the history) on the next message
+                finishChatMessage(null, 'Connection to the advisor was lost');
+                closeChatStream();
+            }
+        });
+        chat.source = source;
+        return chat.id;
+    };
+
     const sendMessage = async () => {
         const message = chatInput.value.trim();
         if (!message) return;
+        if (chat.pending) {
+            showNotification('Please wait for the current answer', 'warning');
+            return;
+        }
 
         // Add user message to UI
         addMessageToChat('user', message);
         chatInput.value = '';
 
-        // Typing indicator
+        // Typing indicator, replaced by step labels and then the streamed answer
         const typingId = addMessageToChat('ai', '<div class="spinner-small"></div>', true);
+        chat.pending = { id: typingId, message, text: '' };
 
         try {
-            const response = await fetch('/api/chat', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ message, history: state.chatHistory })
-            });
-            const data = await response.json();
-
-            if (data.error) throw new Error(data.error);
-            if (!data.answer) throw new Error("No response from advisor");
-
-            // Replace typing indicator with response
-            let finalHtml = '';
-            try {
-                if (typeof marked.parse === 'function') {
-                    finalHtml = marked.parse(data.answer);
-                } else if (typeof marked === 'function') {
-                    finalHtml = marked(data.answer);
-                } else {
-                    finalHtml = data.answer;
-                }
-            } catch (e) {
-                finalHtml = data.answer;
+            let response;
+            for (let attempt = 0; attempt < 2; attempt++) {
+                const conversationId = await openChatStream();
+                response = await fetch(`/api/chat/conversations/${conversationId}/messages`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ message })
+                });
+                if (response.status !== 404) break;
+                closeChatStream();
+            }
+            if (!response.ok) {
+                const data = await response.json();
+                throw new Error(data.error || `Request failed (${response.status})`);
             }
-
-            updateMessageInChat(typingId, finalHtml);
-            state.chatHistory.push({ role: 'user', content: message });
-            state.chatHistory.push({ role: 'ai', content: data.answer });
         } catch (error) {
             console.error('Chat error:', error);
-            updateMessageInChat(typingId, `<span class="text-red-500">Error: ${error.message}</span>`);
+            finishChatMessage(null, error.message);
         }
     };
 
+    window.addEventListener('pagehide', () => {
+        if (chat.id) fetch(`/api/chat/conversations/${chat.id}`, { method: 'DELETE', keepalive: true });
+    });
+
     const findJobs = async () => {
         const role = jobsRoleSelect.value;
         const btnId = 'btn-jobs';
@@ -445,6 +546,23 @@ document.addEventListener('DOMContentLoaded', () => {
         if (collegeRoleInput) collegeRoleInput.value = role;
     };
 
+    // Warm the report cache in the background as soon as a role is picked,
+    // so "Generate" is usually served from cache. Best effort, once per role.
+    const prefetchedRoles = new Set();
+    let prefetchTimer = null;
+    const prefetchRole = (role, category) => {
+        if (!role || prefetchedRoles.has(role)) return;
+        clearTimeout(prefetchTimer);
+        prefetchTimer = setTimeout(() => {
+            prefetchedRoles.add(role);
+            fetch('/api/prefetch', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ role, category })
+            }).catch(() => {});
+        }, 800);
+    };
+
     const setLoading = (btnId, isLoading) => {
         const btn = document.getElementById(btnId);
         if (btn) {
@@ -458,8 +576,10 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
+    let messageCounter = 0;
     const addMessageToChat = (role, content, isHtml = false) => {
-        const id = Date.now();
+        // Unique even when the question and the typing bubble land in the same millisecond
+        const id = `${Date.now()}-${++messageCounter}`;
         const div = document.createElement('div');
         div.className = `flex items-start gap-4 chat-bubble ${role === 'user' ? 'flex-row-reverse' : ''}`;
         div.id = `msg-${id}`;
@@ -516,9 +636,15 @@ document.addEventListener('DOMContentLoaded', () => {
         if (insightsRoleSelect) {
             insightsRoleSelect.addEventListener('change', (e) => {
                 syncRoleState(e.target.value);
+                prefetchRole(e.target.value, insightsCategorySelect ? insightsCategorySelect.value : '');
             });
         }
 
+        // Market Tab: Role autocomplete
+        if (marketRoleInput) {
+            marketRoleInput.addEventListener('input', (e) => suggestRoles(e.target.value));
+        }
+
         // Jobs Tab: Category change
         if (jobsCategorySelect) {
             jobsCategorySelect.addEventListener('change', (e) => {
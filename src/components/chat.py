@@ -1,26 +1,26 @@
 import streamlit as st
-from src.utils.text_utils import as_markdown, HAVE_STREAMLIT_CALLBACK
+from backend.services.ai_service import run_agent, stream_call
+from src.components.live import write_live
+from src.utils.text_utils import as_markdown
 
-# Optional callback for streamed UI
-if HAVE_STREAMLIT_CALLBACK:
-    from langchain_community.callbacks import StreamlitCallbackHandler
+# Messages kept per session, as (role, markdown) string pairs
+CHAT_HISTORY_LIMIT = 40
 
 def create_chat_interface(agent_executor):
     st.subheader("💬 AI Career Assistant")
     st.markdown("Ask anything about careers, skills, pathways, colleges, resumes, or the job market.")
 
-    for message in st.session_state.chat_messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    for role, content in st.session_state.chat_messages:
+        with st.chat_message(role):
+            st.markdown(content)
 
     if prompt := st.chat_input("Ask your career question here..."):
-        st.session_state.chat_messages.append({"role": "user", "content": prompt})
+        messages = st.session_state.chat_messages
+        messages.append(("user", prompt))
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        context_preview = "\n".join(
-            f"{m['role']}: {m['content']}" for m in st.session_state.chat_messages[-8:]
-        )
+        context_preview = "\n".join(f"{role}: {content}" for role, content in messages[-8:])
         chat_prompt = f"""You are a helpful AI career advisor with expertise in:
 - Career guidance and job market trends (especially in India)
 - Indian colleges and universities
@@ -37,16 +37,26 @@ When discussing education, focus on Indian institutions. When discussing salarie
 """
 
         with st.chat_message("assistant"):
+            # Tool steps go into a collapsible status box; the final answer streams below it
+            status = st.status("Thinking...", expanded=False)
+
+            def show_step(kind, payload):
+                if kind == "step":
+                    status.update(label=f"🔎 Using {payload['tool']}...")
+                    status.markdown(f"**{payload['tool']}**: `{payload['input']}`")
+                elif kind == "observation":
+                    status.caption(payload["preview"])
+
             try:
-                if HAVE_STREAMLIT_CALLBACK:
-                    container = st.container()
-                    cb = StreamlitCallbackHandler(parent_container=container)
-                    response = agent_executor.run(chat_prompt, callbacks=[cb])
-                else:
-                    response = agent_executor.run(chat_prompt)
-                st.markdown(as_markdown(response))
-                st.session_state.chat_messages.append({"role": "assistant", "content": as_markdown(response)})
+                placeholder, streamed, response = write_live(stream_call(run_agent, agent_executor, chat_prompt), show_step)
+                response = as_markdown(response)
+                if response != streamed:
+                    placeholder.markdown(response)
+                status.update(label="Done", state="complete")
+                messages.append(("assistant", response))
             except Exception as e:
                 err = f"❌ Error while answering: {e}"
+                status.update(label="Failed", state="error")
                 st.error(err)
-                st.session_state.chat_messages.append({"role": "assistant", "content": err})
+                messages.append(("assistant", err))
+        del messages[:-CHAT_HISTORY_LIMIT]
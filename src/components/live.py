@@ -0,0 +1,32 @@
+import streamlit as st
+from src.utils.text_utils import MarkdownNormalizer
+
+def write_live(events, on_event=None):
+    """
+    Render the ("token", text) events of a backend stream_call() as they
+    arrive, via st.write_stream, and return (placeholder, streamed text,
+    result). Other events (agent steps) are passed to on_event. Callers
+    replace the placeholder when the final result differs from the stream,
+    e.g. a cache hit or appended sources.
+    """
+    outcome = {}
+
+    def tokens():
+        normalizer = MarkdownNormalizer()
+        for kind, payload in events:
+            if kind == "token":
+                text = normalizer.feed(payload)
+                if text:
+                    yield text
+            elif kind == "result":
+                outcome["result"] = payload
+            elif on_event is not None:
+                on_event(kind, payload)
+        tail = normalizer.close()
+        if tail:
+            yield tail
+
+    placeholder = st.empty()
+    with placeholder.container():
+        streamed = st.write_stream(tokens())
+    return placeholder, streamed if isinstance(streamed, str) else "", outcome.get("result")
@@ -1,19 +1,18 @@
 import streamlit as st
 from dotenv import load_dotenv
 
-# Import modular components
-from src.data.career_data import CAREER_CATEGORIES
+# The Streamlit UI runs on the same service layer as the Flask API: shared
+# LLM/agent, cross-session report cache, single-flight generation
+from backend.config import Config
+from backend.data.catalog import get_catalog
+from backend.services.ai_service import initialize_llm_and_tools, create_agent_with_tools, generate_resume_feedback, stream_call
+from backend.services.components import get_ai_components
+from backend.services.report_service import get_report
+from backend.utils.file_utils import extract_text_from_bytes
 from src.utils.text_utils import as_markdown
 from src.config import load_api_keys
-from src.services.ai_service import (
-    initialize_llm_and_tools,
-    create_agent_with_tools,
-    generate_career_insights,
-    generate_market_analysis,
-    generate_college_recommendations,
-    generate_resume_feedback
-)
 from src.components.chat import create_chat_interface
+from src.components.live import write_live
 
 # Load environment variables
 load_dotenv()
@@ -26,22 +25,55 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+@st.cache_resource(show_spinner="Loading AI models...")
+def load_ai_components(google_key: str, serpapi_key: str):
+    """
+    LLM and agent, built once per process for a key pair and shared by every
+    session and rerun. Failures raise, so they are retried rather than cached.
+    """
+    if google_key == Config.GOOGLE_API_KEY and serpapi_key == Config.SERPAPI_KEY:
+        llm, agent = get_ai_components()
+    else:
+        llm, tools = initialize_llm_and_tools(google_key, serpapi_key)
+        agent = create_agent_with_tools(llm, tools) if llm and tools else None
+    if not llm or agent is None:
+        raise RuntimeError("Could not initialize the LLM/agent")
+    return llm, agent
+
 def initialize_session_state():
+    # Only short strings live per session; models and reports are shared
     defaults = {
-        "chat_history": [],
         "chat_messages": [],
-        "career_insights": None,
-        "market_analysis": None,
-        "college_recommendations": None,
+        "report_insights": None,
+        "report_market": None,
+        "report_colleges": None,
         "resume_feedback": None,
-        "selected_career": None,
         "api_keys_validated": False,
-        "active_tab": "career_insights",
     }
     for k, v in defaults.items():
         if k not in st.session_state:
             st.session_state[k] = v
 
+def render_report(kind: str, button_label: str, llm, category: str, subcareer: str):
+    """Generate button plus the last result; another session's report is served from the shared cache."""
+    state_key = f"report_{kind}"
+    if st.button(button_label, key=f"btn_{kind}", use_container_width=True):
+        # Tokens render as they arrive; the finished report is cached by get_report
+        try:
+            placeholder, streamed, report = write_live(stream_call(get_report, kind, llm, subcareer, category))
+        except Exception as e:
+            st.error(f"❌ Unable to generate the report. Error: {e}")
+            return
+        st.session_state[state_key] = (f"{category} → {subcareer}", report["result"])
+        if report["result"] != streamed:
+            placeholder.markdown(report["result"])
+        if report["cached"]:
+            st.caption("⚡ Served from the shared report cache")
+    elif st.session_state[state_key]:
+        career, result = st.session_state[state_key]
+        st.info(f"📋 Showing cached results for: **{career}**")
+        st.markdown(result)
+
 def main():
     initialize_session_state()
 
@@ -105,59 +137,35 @@ def main():
         )
         return
 
-    llm, tools = initialize_llm_and_tools(google_key, serpapi_key)
-    if not llm or not tools:
+    try:
+        llm, agent_executor = load_ai_components(google_key, serpapi_key)
+    except Exception:
         st.error("❌ Failed to initialize AI components. Check your API keys and network.")
         return
 
-    agent_executor = create_agent_with_tools(llm, tools)
-    if agent_executor is None:
-        st.error("❌ Agent initialization failed.")
-        return
-
+    categories = get_catalog().categories
     st.subheader("🎯 Select Your Career Interest")
     col1, col2 = st.columns([1, 1])
     with col1:
-        selected_category = st.selectbox("📁 Choose a career category:", list(CAREER_CATEGORIES.keys()))
+        selected_category = st.selectbox("📁 Choose a career category:", list(categories.keys()))
     with col2:
-        selected_subcareer = st.selectbox("🎯 Choose specific career:", CAREER_CATEGORIES[selected_category])
+        selected_subcareer = st.selectbox("🎯 Choose specific career:", categories[selected_category])
 
     # Tab interface for different features
     tab1, tab2, tab3, tab4 = st.tabs(["🧭 Career Insights", "📊 Market Analysis", "🎓 College Advisor", "📝 Resume Coach"])
 
     with tab1:
         st.markdown("### 🧭 Career Insights & Learning Roadmap")
-        if st.button("🚀 Generate Career Insights", key="btn_career_insights", use_container_width=True):
-            st.session_state.selected_career = f"{selected_category} → {selected_subcareer}"
-            career_insights = generate_career_insights(selected_category, selected_subcareer, llm)
-            st.session_state.career_insights = career_insights
-            st.markdown(as_markdown(career_insights))
-        elif st.session_state.career_insights:
-            st.info(f"📋 Showing cached results for: **{st.session_state.selected_career}**")
-            st.markdown(as_markdown(st.session_state.career_insights))
+        render_report("insights", "🚀 Generate Career Insights", llm, selected_category, selected_subcareer)
 
     with tab2:
         st.markdown("### 📊 Live Market Analysis")
-        if st.button("📈 Fetch Market Data", key="btn_market_analysis", use_container_width=True):
-            st.session_state.selected_career = f"{selected_category} → {selected_subcareer}"
-            market_analysis = generate_market_analysis(selected_subcareer, llm)
-            st.session_state.market_analysis = market_analysis
-            st.markdown(as_markdown(market_analysis))
-        elif st.session_state.market_analysis:
-            st.info(f"📋 Showing cached results for: **{st.session_state.selected_career}**")
-            st.markdown(as_markdown(st.session_state.market_analysis))
+        render_report("market", "📈 Fetch Market Data", llm, selected_category, selected_subcareer)
 
     with tab3:
         st.markdown("### 🎓 College & University Recommendations")
         st.markdown("*Get personalized recommendations for Indian colleges and universities*")
-        if st.button("🏛️ Get College Recommendations", key="btn_college_recs", use_container_width=True):
-            st.session_state.selected_career = f"{selected_category} → {selected_subcareer}"
-            college_recommendations = generate_college_recommendations(selected_subcareer, llm)
-            st.session_state.college_recommendations = college_recommendations
-            st.markdown(as_markdown(college_recommendations))
-        elif st.session_state.college_recommendations:
-            st.info(f"📋 Showing cached results for: **{st.session_state.selected_career}**")
-            st.markdown(as_markdown(st.session_state.college_recommendations))
+        render_report("colleges", "🏛️ Get College Recommendations", llm, selected_category, selected_subcareer)
 
     with tab4:
         st.markdown("### 📝 Resume Coach & Feedback")
@@ -183,45 +191,15 @@ def main():
             
             if uploaded_file is not None:
                 try:
-                    file_extension = uploaded_file.name.split('.')[-1].lower()
-                    
-                    if file_extension == 'txt':
-                        resume_text = uploaded_file.read().decode('utf-8')
-                        st.success(f"✅ Loaded {len(resume_text)} characters from {uploaded_file.name}")
-                    
-                    elif file_extension == 'pdf':
-                        try:
-                            import PyPDF2
-                            from io import BytesIO
-                            
-                            pdf_reader = PyPDF2.PdfReader(BytesIO(uploaded_file.read()))
-                            resume_text = ""
-                            for page in pdf_reader.pages:
-                                resume_text += page.extract_text() + "\n"
-                            st.success(f"✅ Extracted {len(resume_text)} characters from PDF")
-                        except ImportError:
-                            st.error("❌ PyPDF2 not installed. Install it with: pip install PyPDF2")
-                        except Exception as e:
-                            st.error(f"❌ Error reading PDF: {e}")
-                    
-                    elif file_extension in ['docx', 'doc']:
-                        try:
-                            import docx
-                            from io import BytesIO
-                            
-                            doc = docx.Document(BytesIO(uploaded_file.read()))
-                            resume_text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-                            st.success(f"✅ Extracted {len(resume_text)} characters from Word document")
-                        except ImportError:
-                            st.error("❌ python-docx not installed. Install it with: pip install python-docx")
-                        except Exception as e:
-                            st.error(f"❌ Error reading Word document: {e}")
-                    
-                    # Show preview
+                    resume_text = extract_text_from_bytes(uploaded_file.name, uploaded_file.getvalue())
                     if resume_text:
+                        st.success(f"✅ Extracted {len(resume_text)} characters from {uploaded_file.name}")
                         with st.expander("📄 Preview extracted text"):
                             st.text_area("Resume content:", resume_text[:1000] + "..." if len(resume_text) > 1000 else resume_text, height=200, disabled=True)
-                            
+                    else:
+                        st.warning("⚠️ No text could be extracted from this file")
+                except ImportError as e:
+                    st.error(f"❌ Missing file parser ({e.name}). Install it with: pip install -r requirements.txt")
                 except Exception as e:
                     st.error(f"❌ Error processing file: {e}")
         
@@ -244,12 +222,16 @@ def main():
                 st.warning("⚠️ Please provide your resume content (at least 100 characters)")
             else:
                 target_role = target_role_input if target_role_input else selected_subcareer
-                resume_feedback = generate_resume_feedback(resume_text, target_role, llm)
+                placeholder, streamed, resume_feedback = write_live(
+                    stream_call(generate_resume_feedback, resume_text, target_role, llm)
+                )
+                resume_feedback = as_markdown(resume_feedback)
                 st.session_state.resume_feedback = resume_feedback
-                st.markdown(as_markdown(resume_feedback))
+                if resume_feedback != streamed:
+                    placeholder.markdown(resume_feedback)
         elif st.session_state.resume_feedback:
             st.info("📋 Showing previous resume analysis")
-            st.markdown(as_markdown(st.session_state.resume_feedback))
+            st.markdown(st.session_state.resume_feedback)
 
     st.markdown("---")
     create_chat_interface(agent_executor)
@@ -0,0 +1,105 @@
+import pytest
+from backend.config import Config
+from backend.services import ai_service, model_router
+from backend.services.model_router import Decision, ModelRouter, parse_tiers
+from backend.utils.deadline import deadline_scope
+
+TIERS = "lite=0.10/0.40,flash=0.30/2.50,pro=1.25/10.00"
+
+@pytest.fixture
+def router():
+    # Variants are cached by client id, which a new fake client may reuse
+    model_router._variants.clear()
+    return ModelRouter(parse_tiers(TIERS), {"colleges": "flash", "chat": "flash"}, "flash")
+
+def test_parse_tiers():
+    tiers = parse_tiers(" lite=0.10/0.40, flash=0.30/2.50,,bad ")
+    assert [t.model for t in tiers] == ["lite", "flash", "bad"]
+    assert (tiers[1].input_price, tiers[1].output_price) == (0.30, 2.50)
+    assert (tiers[2].input_price, tiers[2].output_price) == (0.0, 0.0)
+    assert tiers[1].cost(1_000_000, 1_000_000) == pytest.approx(2.80)
+
+def test_choose_follows_route(router):
+    decision = router.choose("colleges", "x" * 4000)
+    assert (decision.model, decision.reason) == ("flash", "route")
+    assert decision.fallbacks == ["lite"]
+
+def test_choose_small_request_uses_cheapest_tier(router):
+    decision = router.choose("compare", "short prompt")
+    assert (decision.model, decision.reason) == ("lite", "small")
+
+def test_chat_is_not_small(router):
+    assert router.choose("chat", "What should I learn?").model == "flash"
+
+def test_deadline_ignored_until_observed(router):
+    with deadline_scope(45):
+        decision = router.choose("colleges", "x" * 4000)
+    assert (decision.model, decision.reason) == ("flash", "route")
+
+def test_deadline_downgrades_observed_slow_model(router):
+    probe = router.choose("colleges", "x" * 4000)
+    for _ in range(10):
+        router.record(probe, "flash", 0, True, 100.0, 2.0, 2200)
+    with deadline_scope(45):
+        decision = router.choose("colleges", "x" * 4000)
+    assert (decision.model, decision.reason) == ("lite", "deadline")
+
+def test_failed_model_cools_down(router):
+    probe = router.choose("colleges", "x" * 4000)
+    router.record(probe, "flash", 0, False, 1.0, None, 0, "boom")
+    decision = router.choose("colleges", "x" * 4000)
+    assert (decision.model, decision.reason) == ("lite", "cooldown")
+    assert router.stats()["models"]["flash"]["errors"] == 1
+
+def test_agent_runs_stay_out_of_latency_model(router):
+    decision = Decision("chat", "flash", "route", 300, 1200, 0.0, None)
+    before = router.estimate("flash", 1200)
+    router.record(decision, "flash", 0, True, 20.0, None, 300, single_call=False)
+    assert router.estimate("flash", 1200) == before
+    assert router.stats()["models"]["flash"]["calls"] == 1
+
+class _Message:
+    def __init__(self, content):
+        self.content = content
+
+class FakeLLM:
+    """Model-agnostic client stand-in: fails on the models in `broken`."""
+
+    def __init__(self, broken=()):
+        self.model = "models/flash"
+        self.broken = broken
+        self.calls = []
+
+    def copy(self):
+        return self
+
+    def invoke(self, prompt, **kwargs):
+        name = self.model.split("/")[-1]
+        self.calls.append(name)
+        if name in self.broken:
+            raise RuntimeError(f"{name} unavailable")
+        return _Message(f"answer from {name}")
+
+def test_invoke_llm_falls_back_to_neighbour_tier(router, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_ROUTING_ENABLED", True)
+    monkeypatch.setattr(ai_service, "get_router", lambda: router)
+    llm = FakeLLM(broken=("flash",))
+    assert ai_service.invoke_llm(llm, "x" * 4000, task="colleges") == "answer from lite"
+    stats = router.stats()["models"]
+    assert (stats["flash"]["errors"], stats["lite"]["fallbacks"]) == (1, 1)
+
+def test_invoke_llm_raises_when_every_attempt_fails(router, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_ROUTING_ENABLED", True)
+    monkeypatch.setattr(ai_service, "get_router", lambda: router)
+    with pytest.raises(RuntimeError):
+        ai_service.invoke_llm(FakeLLM(broken=("flash", "lite")), "x" * 4000, task="colleges")
+
+def test_routing_log_rotates_past_size_limit(router, tmp_path, monkeypatch):
+    log = tmp_path / "routing.jsonl"
+    router.log_path = str(log)
+    monkeypatch.setattr(Config, "LLM_ROUTING_LOG_MAX_BYTES", 200)
+    decision = router.choose("colleges", "x" * 4000)
+    for _ in range(5):
+        router.record(decision, decision.model, 0, True, 1.0, 0.5, 100)
+    assert (tmp_path / "routing.jsonl.1").exists()
+    assert log.stat().st_size < 2 * 200
@@ -0,0 +1,40 @@
+from backend.utils.resume_utils import PAGE_BREAK, preprocess_resume
+
+def lines(text):
+    compacted, _ = preprocess_resume(text, token_budget=0)
+    return compacted.replace("\n\n", "\n").split("\n")
+
+def test_keeps_years_and_numbers():
+    out = lines("Jane Doe\nExperience\nAcme Corp\n2021\n- Led 12 engineers\n12\nEducation\nB.Tech\n2019")
+    assert "2021" in out
+    assert "12" in out
+    assert "2019" in out
+
+def test_keeps_bullets_repeated_across_jobs():
+    text = "Experience\nAcme Corp\n2021\n- Built APIs\nGlobex\n2019\n- Built APIs\n- Wrote tests"
+    out = lines(text)
+    assert out.count("- Built APIs") == 2
+    assert out.count("2021") == 1 and out.count("2019") == 1
+
+def test_strips_page_markers():
+    out = lines("Jane Doe\nSkills\nPython\nPage 1\n1 of 2\n1/2\nSQL")
+    assert out == ["Jane Doe", "Skills", "Python", "SQL"]
+
+def test_dedupes_running_headers_and_footers():
+    page1 = "Jane Doe | jane@example.com\nExperience\n- Built APIs\nConfidential"
+    page2 = "Jane Doe | jane@example.com\n- Built APIs\nEducation\nB.Tech\nConfidential"
+    out = lines(page1 + PAGE_BREAK + page2)
+    assert out.count("Jane Doe | jane@example.com") == 1
+    assert out.count("Confidential") == 1
+    assert out.count("- Built APIs") == 2
+
+def test_single_page_never_dedupes():
+    out = lines("Summary\nGood at SQL\nSkills\nGood at SQL")
+    assert out.count("Good at SQL") == 2
+
+def test_trims_low_priority_sections_first():
+    text = "Jane Doe\nExperience\n" + "\n".join(f"- Shipped feature {i}" for i in range(40)) + "\nHobbies\nChess"
+    compacted, stats = preprocess_resume(text, token_budget=60)
+    assert "Chess" not in compacted
+    assert stats["compacted_tokens"] <= 60
+    assert stats["sections"][0] == "header"
@@ -0,0 +1,27 @@
+import pytest
+from backend.services.salary_service import parse_salary
+
+@pytest.mark.parametrize("text, expected", [
+    ("₹25K–₹40K a month", (3.0, 4.8)),
+    ("5-8 LPA", (5.0, 8.0)),
+    ("INR 6,00,000 - 9,00,000 per annum", (6.0, 9.0)),
+    ("Rs 50,000 per month ($600)", (6.0, 6.0)),
+])
+def test_parses_rupee_salaries(text, expected):
+    assert parse_salary(text) == expected
+
+@pytest.mark.parametrize("text", [
+    "$120,000 a year",
+    "USD 100k",
+    "€50,000",
+    "£40k",
+    "100k USD per year",
+    "$100k - $150k",
+])
+@pytest.mark.parametrize("strict", [False, True])
+def test_rejects_other_currencies(text, strict):
+    assert parse_salary(text, strict=strict) is None
+
+def test_strict_ignores_experience_ranges():
+    assert parse_salary("3-5 years experience", strict=True) is None
+    assert parse_salary("3-5 years experience, ₹12-18 LPA", strict=True) == (12.0, 18.0)